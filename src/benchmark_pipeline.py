@@ -0,0 +1,324 @@
+# benchmark_pipeline.py
+"""
+Benchmark suite of the log pipeline: ingest -> CEP -> export, one stage at a time.
+
+Synthetic NMEA logs of a configurable size and sentence mix are generated (reproducibly, from a fixed
+seed) and every stage of the pipeline is timed on its own:
+
+    read             read_log_lines (file -> list of raw lines)
+    checksum         SentenceValidator pre-validation (framing and checksum)
+    parse            pynmea2.parse of the valid lines
+    add_sentence     NMEAData.add_sentence_data / add_coordinates / add_motion
+    ingest           parse_nmea_lines end to end (the three stages above plus per-sentence messages)
+    cep              NMEAData.calculate_cep
+    satellite_stats  NMEAData.calculate_satellite_statistics
+    excel_export     NMEAData.write_excel
+    parquet_export   parsed sentences as a DataFrame to Parquet (only if pyarrow or fastparquet is installed)
+
+Every log runs in a fresh process, so its peak RSS is its own. Results (seconds, lines/s and MB/s of the
+log, peak RSS) are written as JSON; with --baseline, a previous result file is compared against.
+
+Usage (from the src folder):
+    python benchmark_pipeline.py [--lines 10000 100000] [--mix gga full] [--repeat 3] [--baseline old.json]
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Sentence mixes of the synthetic logs: GGA only, or a full receiver output with satellites and proprietary data
+MIXES = ('gga', 'full')
+STAGES = ('read', 'checksum', 'parse', 'add_sentence', 'ingest', 'cep', 'satellite_stats', 'excel_export',
+          'parquet_export')
+REFERENCE_POINT = (31.2304, 121.4737)
+
+
+def _sentence(body):
+    # Complete sentence with checksum and CRLF
+    checksum = 0
+    for char in body.encode('ascii'):
+        checksum ^= char
+    return f"${body}*{checksum:02X}\r\n"
+
+
+def _degrees_minutes(value, digits):
+    # NMEA ddmm.mmmmm / dddmm.mmmmm field and hemisphere of a coordinate
+    degrees = int(abs(value))
+    minutes = (abs(value) - degrees) * 60
+    return f"{degrees:0{digits}d}{minutes:08.5f}"
+
+
+def _satellites(rng, talker, count, first_prn):
+    # GSV sentences (4 satellites each) of one constellation
+    satellites = [(first_prn + i, rng.randint(5, 85), rng.randint(0, 359), rng.randint(20, 48)) for i in range(count)]
+    total = (count + 3) // 4
+    lines = []
+    for number in range(total):
+        group = satellites[number * 4:number * 4 + 4]
+        fields = ",".join(f"{prn:02d},{elevation:02d},{azimuth:03d},{cnr:02d}" for prn, elevation, azimuth, cnr in group)
+        lines.append(_sentence(f"{talker}GSV,{total},{number + 1},{count:02d},{fields}"))
+    return lines
+
+
+def generate_log(path, lines, mix='full', rate_hz=10, seed=0):
+    """
+    Write a synthetic NMEA log: a receiver standing around REFERENCE_POINT with a metre of noise.
+
+    Args:
+        path (str): Log to write.
+        lines (int): Approximate number of lines (whole epochs are written).
+        mix (str): 'gga' (one GGA per epoch) or 'full' (RMC, GGA, 2 GSA, 5 GSV, PQTMEPE per epoch).
+        rate_hz (int): Epoch rate.
+        seed (int): Random seed; the same arguments always give the same log.
+
+    Returns:
+        int: Number of lines written.
+    """
+    rng = random.Random(seed)
+    written = 0
+    epoch = 0
+    with open(path, 'w', encoding='ascii', newline='') as f:
+        while written < lines:
+            seconds = 10 * 3600 + epoch / rate_hz
+            utc = (f"{int(seconds // 3600) % 24:02d}{int(seconds % 3600 // 60):02d}"
+                   f"{seconds % 60:06.3f}")
+            lat = REFERENCE_POINT[0] + rng.gauss(0, 1e-5)
+            lon = REFERENCE_POINT[1] + rng.gauss(0, 1e-5)
+            position = f"{_degrees_minutes(lat, 2)},N,{_degrees_minutes(lon, 3)},E"
+            epoch_lines = [_sentence(f"GNGGA,{utc},{position},1,{rng.randint(12, 30)},{rng.uniform(0.5, 1.5):.2f},"
+                                     f"{20 + rng.gauss(0, 1):.3f},M,8.123,M,,")]
+            if mix == 'full':
+                epoch_lines.insert(0, _sentence(f"GNRMC,{utc},A,{position},{abs(rng.gauss(0, 0.05)):.3f},,"
+                                                f"150324,,,A,V"))
+                epoch_lines += [_sentence(f"GNGSA,A,3,{','.join(f'{prn:02d}' for prn in range(first, first + 12))},"
+                                          f"1.20,0.70,0.90,{system}")
+                                for first, system in ((1, 1), (65, 2))]
+                epoch_lines += _satellites(rng, 'GP', 12, 1) + _satellites(rng, 'GL', 8, 65)
+                epoch_lines.append(_sentence(f"PQTMEPE,2,{rng.uniform(0.5, 2):.3f},{rng.uniform(0.5, 2):.3f},"
+                                             f"{rng.uniform(1, 3):.3f},{rng.uniform(0.7, 2.8):.3f},"
+                                             f"{rng.uniform(1.2, 4):.3f}"))
+            f.writelines(epoch_lines)
+            written += len(epoch_lines)
+            epoch += 1
+    return written
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (None where the resource module is missing, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024  # Bytes on macOS, KiB on Linux
+
+
+def _parquet_engine():
+    # Parquet writer available to pandas, if any
+    for engine in ('pyarrow', 'fastparquet'):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def run_case(path, output_folder, repeat=1, log_level=logging.WARNING):
+    """
+    Time every stage of the pipeline on one log (meant to run in a fresh process, see run_benchmark).
+
+    Args:
+        path (str): Log to process.
+        output_folder (str): Folder of the exported files (deleted again after timing).
+        repeat (int): Runs of every stage; the fastest is reported.
+        log_level (int): Logging level while the stages run.
+
+    Returns:
+        dict: Log size and lines, and per stage: seconds, items processed, lines/s and MB/s of the log,
+        and the peak RSS of the process so far. Stages that could not run have 'skipped' instead.
+    """
+    import pynmea2
+    import pandas as pd
+
+    from gnss_engine import NMEAData, SentenceValidator, parse_nmea_lines, read_log_lines
+
+    logging.basicConfig(level=log_level, format='%(asctime)s [%(levelname)s] %(message)s',
+                        handlers=[logging.FileHandler(os.path.join(output_folder, "benchmark_console.txt"),
+                                                      encoding='utf-8')])
+    size_mb = os.path.getsize(path) / (1 << 20)
+    best = {}
+    rss = {}
+    items = {}
+    skipped = {}
+
+    def timed(stage, function):
+        # Run one stage, keep its fastest time and return its result. The peak RSS is taken after the first run,
+        # so the growth from stage to stage shows where the memory goes
+        start = time.perf_counter()
+        result = function()
+        best[stage] = min(best.get(stage, math.inf), time.perf_counter() - start)
+        rss.setdefault(stage, peak_rss_mb())
+        return result
+
+    def parse_all(sentences):
+        messages = []
+        for sentence in sentences:
+            try:
+                message = pynmea2.parse(sentence)
+            except pynmea2.ParseError:
+                continue
+            if getattr(message, 'sentence_type', None):
+                messages.append(message)
+        return messages
+
+    def add_all(messages):
+        nmea_data = NMEAData(None, None, [])
+        for message in messages:
+            nmea_data.sentence_type = message.sentence_type
+            nmea_data.data = message
+            nmea_data.add_sentence_data()
+            nmea_data.add_coordinates()
+            nmea_data.add_motion()
+        return nmea_data
+
+    excel_path = os.path.join(output_folder, f"benchmark_{os.getpid()}.xlsx")
+    parquet_path = os.path.join(output_folder, f"benchmark_{os.getpid()}.parquet")
+    parquet_engine = _parquet_engine()
+    for _ in range(max(repeat, 1)):
+        lines = timed('read', lambda: list(read_log_lines(path)))
+        validator = SentenceValidator(os.path.basename(path))
+        valid = timed('checksum', lambda: [line.strip() for line in lines if validator.check(line)])
+        messages = timed('parse', lambda: parse_all(valid))
+        nmea_data = timed('add_sentence', lambda: add_all(messages))
+        timed('ingest', lambda: parse_nmea_lines(lines, path))
+        cep_value = timed('cep', lambda: nmea_data.calculate_cep(REFERENCE_POINT))
+        timed('satellite_stats', nmea_data.calculate_satellite_statistics)
+
+        if cep_value:
+            summary = {'Reference Point': NMEAData.format_reference_point(REFERENCE_POINT),
+                       **NMEAData.cep_summary(cep_value)}
+            timed('excel_export', lambda: nmea_data.write_excel(excel_path, summary, cep_value))
+        else:
+            skipped['excel_export'] = "too few fixes for CEP"
+
+        if parquet_engine is None:
+            skipped['parquet_export'] = "no Parquet engine installed (pyarrow or fastparquet)"
+        else:
+            try:
+                timed('parquet_export', lambda: pd.DataFrame(nmea_data.parsed_sentences).astype(str).to_parquet(
+                    parquet_path, engine=parquet_engine, index=False))
+            except (ImportError, ValueError, TypeError) as e:
+                skipped['parquet_export'] = f"failed: {e}"
+
+        items = {'read': len(lines), 'checksum': len(lines), 'parse': len(valid), 'add_sentence': len(messages),
+                 'ingest': len(lines), 'cep': len(nmea_data.fixes.latitude),
+                 'satellite_stats': len(nmea_data.gsv_satellite_info),
+                 'excel_export': len(nmea_data.parsed_sentences), 'parquet_export': len(nmea_data.parsed_sentences)}
+
+    for export in (excel_path, parquet_path):
+        if os.path.exists(export):
+            os.remove(export)
+
+    stages = {}
+    for stage in STAGES:
+        if stage not in best:
+            stages[stage] = {'skipped': skipped.get(stage, "not run")}
+            continue
+        seconds = best[stage]
+        stages[stage] = {'seconds': seconds, 'items': items[stage],
+                         'lines_per_s': items['read'] / seconds if seconds else None,
+                         'mb_per_s': size_mb / seconds if seconds else None,
+                         'peak_rss_mb': rss.get(stage)}
+    return {'log_mb': size_mb, 'lines': items['read'], 'peak_rss_mb': peak_rss_mb(), 'stages': stages}
+
+
+def environment():
+    """Interpreter, platform and library versions the results were measured with."""
+    versions = {}
+    for package in ('numpy', 'pandas', 'pynmea2', 'openpyxl', 'pyarrow', 'fastparquet'):
+        try:
+            module = __import__(package)
+        except ImportError:
+            continue
+        versions[package] = getattr(module, '__version__', 'unknown')
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+            'packages': versions}
+
+
+def run_benchmark(line_counts, mixes, output_folder, repeat=1, log_level=logging.WARNING):
+    """
+    Generate the synthetic logs and benchmark every (size, mix) case in its own process.
+
+    Returns:
+        dict: Environment and one entry per case ("<mix>_<lines>") with its stage results.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    results = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'environment': environment(),
+               'repeat': repeat, 'cases': {}}
+    # A fresh (spawned, not forked) process per case: the peak RSS is the case's own, not left over from earlier ones
+    context = multiprocessing.get_context('spawn')
+    for mix in mixes:
+        for lines in line_counts:
+            case = f"{mix}_{lines}"
+            path = os.path.join(output_folder, f"synthetic_{case}.txt")
+            written = generate_log(path, lines, mix)
+            print(f"{case}: {written} lines, {os.path.getsize(path) / (1 << 20):.1f} MB", flush=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results['cases'][case] = pool.submit(run_case, path, output_folder, repeat, log_level).result()
+            os.remove(path)
+    return results
+
+
+def print_results(results, baseline=None):
+    """Print a table of every case, with the speed-up against a baseline result file if one is given."""
+    for case, result in results['cases'].items():
+        print(f"\n{case}: {result['lines']} lines, {result['log_mb']:.1f} MB, peak RSS "
+              f"{result['peak_rss_mb'] or 0:.0f} MB")
+        base = (baseline or {}).get('cases', {}).get(case, {}).get('stages', {})
+        for stage, timing in result['stages'].items():
+            if 'skipped' in timing:
+                print(f"  {stage:<16} skipped: {timing['skipped']}")
+                continue
+            line = (f"  {stage:<16} {timing['seconds']:9.3f} s {timing['lines_per_s'] or 0:12,.0f} lines/s "
+                    f"{timing['mb_per_s'] or 0:8.1f} MB/s")
+            if base.get(stage, {}).get('seconds'):
+                line += f"  x{base[stage]['seconds'] / timing['seconds']:.2f} vs baseline"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ingest -> CEP -> export pipeline on synthetic logs.")
+    parser.add_argument("--lines", type=int, nargs="+", default=[10000, 100000], metavar="N",
+                        help="Log sizes in lines (default: 10000 100000)")
+    parser.add_argument("--mix", nargs="+", choices=MIXES, default=list(MIXES),
+                        help="Sentence mixes: gga (GGA only) or full (RMC, GGA, GSA, GSV, PQTMEPE)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of every stage; the fastest is reported")
+    parser.add_argument("--output", metavar="JSON", help="Result file (default: logs/NMEA_<timestamp>/benchmark_"
+                                                         "<timestamp>.json)")
+    parser.add_argument("--baseline", metavar="JSON", help="Earlier result file to compare against")
+    parser.add_argument("--log-sentences", action="store_true",
+                        help="Log every sentence at INFO level during the ingest stage, as a live run does")
+    args = parser.parse_args()
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S%f')
+    output_folder = f"logs/NMEA_{timestamp}"
+    results = run_benchmark(args.lines, args.mix, output_folder, args.repeat,
+                            logging.INFO if args.log_sentences else logging.WARNING)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(output_folder, f"benchmark_{timestamp}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
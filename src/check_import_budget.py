@@ -0,0 +1,99 @@
+# check_import_budget.py
+"""
+Import-time budget check for the application entry points.
+
+Startup of the CLI and the GUI must not pay for the heavy analysis libraries: pandas, matplotlib and
+openpyxl are imported on first use only. This script imports each entry point in a fresh interpreter
+with ``-X importtime``, fails if any deferred module was loaded, and fails if the total import time is
+over budget.
+
+Usage (from the src folder):
+    python check_import_budget.py [--budget-ms 500] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules that must only be imported when an analysis, plot or export needs them
+DEFERRED_MODULES = ('pandas', 'matplotlib', 'openpyxl')
+
+# Entry points checked by default, with their import budget in milliseconds
+DEFAULT_BUDGETS_MS = {
+    'main': 500,
+    'main_gui': 500,
+}
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter and collect its -X importtime report.
+
+    Args:
+        module (str): Module to import (must be importable from the src folder).
+
+    Returns:
+        tuple: (total cumulative import time in milliseconds, set of imported top-level package names)
+    """
+    src_folder = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=src_folder, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    imported = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, field = line[len('import time:'):].split('|')
+        name = field.strip()
+        imported.add(name.split('.')[0])
+        # Nested imports are indented by two spaces per level; only top-level entries add up to the total
+        if not field.startswith('  '):
+            total_us += int(cumulative)
+
+    return total_us / 1000, imported
+
+
+def check_import_budget(budgets_ms):
+    """
+    Check every module against its import budget and the deferred-module list.
+
+    Args:
+        budgets_ms (dict): Module name -> budget in milliseconds.
+
+    Returns:
+        list[str]: Violations found (empty if everything is within budget).
+    """
+    violations = []
+    for module, budget_ms in budgets_ms.items():
+        total_ms, imported = measure_import(module)
+        eager = sorted(imported.intersection(DEFERRED_MODULES))
+
+        print(f"{module}: {total_ms:.0f} ms (budget {budget_ms} ms)"
+              f"{', eager: ' + ', '.join(eager) if eager else ''}")
+
+        if eager:
+            violations.append(f"{module} imports {', '.join(eager)} at startup")
+        if total_ms > budget_ms:
+            violations.append(f"{module} import takes {total_ms:.0f} ms, over the {budget_ms} ms budget")
+
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the startup import time of the application entry points.")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: main main_gui)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Override the import budget of every module")
+    args = parser.parse_args()
+
+    budgets = {module: DEFAULT_BUDGETS_MS.get(module, 500) for module in (args.modules or DEFAULT_BUDGETS_MS)}
+    if args.budget_ms is not None:
+        budgets = {module: args.budget_ms for module in budgets}
+
+    problems = check_import_budget(budgets)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
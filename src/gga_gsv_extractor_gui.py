@@ -1,38 +1,32 @@
-import os
 import tkinter as tk
+from datetime import time
 from tkinter import filedialog, messagebox
-from datetime import datetime
-
-def extract_gga_gsv_lines(file_path, output_path, gga=False, gsv=False):
-    # Get the original file name without extension
-    base_name = os.path.basename(file_path)
-    file_name, file_extension = os.path.splitext(base_name)
-
-    # Determine mode for the output file name
-    mode = ""
-    if gga and gsv:
-        mode = "gga_gsv"
-    elif gga:
-        mode = "gga"
-    elif gsv:
-        mode = "gsv"
-
-    # Add timestamp to the output file name
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = os.path.join(output_path, f"{mode}_{file_name}_{timestamp}.txt")
 
+from gnss_engine.extract import extract_file
+from gnss_engine.log_index import get_log_index
+
+def extract_gga_gsv_lines(file_path, output_path, gga=False, gsv=False, other_types=(), start=None, end=None):
+    # GGA and GSV from any talker ($GPGGA, $GNGGA, $GBGGA, ...), plus any other talker+type filters
+    types = (["GGA"] if gga else []) + (["GSV"] if gsv else []) + list(other_types)
+
+    try:
+        # With a time window, an index built with "Build Index" lets the extractor read only that part of the log
+        output_file, count = extract_file(file_path, output_path, types, start, end)
+        messagebox.showinfo("Success", f"{count} sentences extracted to {output_file}")
+    except FileNotFoundError:
+        messagebox.showerror("Error", f"The file {file_path} does not exist.")
+    except Exception as e:
+        messagebox.showerror("Error", f"An error occurred: {e}")
+
+def build_index(file_path):
     try:
-        # Open the input file and output file
-        with open(file_path, 'r') as infile, open(output_file, 'w') as outfile:
-            # Read the file line by line
-            for line in infile:
-                # Check if the line starts with "$GNGGA" or any "$**GSV" pattern
-                if gga and line.startswith("$GNGGA"):
-                    outfile.write(line)
-                if gsv and "$G" in line[:5] and "GSV" in line:
-                    outfile.write(line)
-
-        messagebox.showinfo("Success", f"{mode} lines extracted to {output_file}")
+        index = get_log_index(file_path)
+        if index is None:
+            messagebox.showwarning("Warning", "Compressed logs cannot be indexed. Decompress the log first.")
+            return
+        sentences = sum(index.types.values())
+        messagebox.showinfo("Success", f"Indexed {sentences} sentences of {len(index.types)} types; "
+                                       f"time windows now only read the part of the log they cover.")
     except FileNotFoundError:
         messagebox.showerror("Error", f"The file {file_path} does not exist.")
     except Exception as e:
@@ -40,7 +34,9 @@ def extract_gga_gsv_lines(file_path, output_path, gga=False, gsv=False):
 
 def create_gui():
     def browse_file():
-        file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"),
+                                                     ("Compressed Logs", "*.gz *.zst *.xz *.bz2"),
+                                                     ("All Files", "*.*")])
         if file:
             file_path_var.set(file)
 
@@ -54,6 +50,13 @@ def create_gui():
         output_path = output_path_var.get()
         extract_gga = gga_var.get()
         extract_gsv = gsv_var.get()
+        other_types = [spec for spec in other_types_var.get().replace(',', ' ').split() if spec]
+        try:
+            start = time.fromisoformat(start_var.get().strip()) if start_var.get().strip() else None
+            end = time.fromisoformat(end_var.get().strip()) if end_var.get().strip() else None
+        except ValueError:
+            messagebox.showwarning("Warning", "Please enter the time window as HH:MM:SS (UTC).")
+            return
 
         if not file_path:
             messagebox.showwarning("Warning", "Please select a file.")
@@ -63,11 +66,19 @@ def create_gui():
             messagebox.showwarning("Warning", "Please select an output folder.")
             return
 
-        if not (extract_gga or extract_gsv):
-            messagebox.showwarning("Warning", "Please select at least one extraction option (GGA or GSV).")
+        if not (extract_gga or extract_gsv or other_types):
+            messagebox.showwarning("Warning", "Please select at least one extraction option (GGA, GSV or other types).")
             return
 
-        extract_gga_gsv_lines(file_path, output_path, gga=extract_gga, gsv=extract_gsv)
+        extract_gga_gsv_lines(file_path, output_path, gga=extract_gga, gsv=extract_gsv, other_types=other_types,
+                              start=start, end=end)
+
+    def index():
+        file_path = file_path_var.get()
+        if not file_path:
+            messagebox.showwarning("Warning", "Please select a file.")
+            return
+        build_index(file_path)
 
     # Main window
     root = tk.Tk()
@@ -91,8 +102,24 @@ def create_gui():
     tk.Checkbutton(root, text="Extract GGA", variable=gga_var).grid(row=2, column=0, padx=10, pady=5, sticky="w")
     tk.Checkbutton(root, text="Extract GSV", variable=gsv_var).grid(row=2, column=1, padx=10, pady=5, sticky="w")
 
+    # Other sentence filters, e.g. "RMC, GNGST, PQTMEPE, PQTM*"
+    tk.Label(root, text="Other Types:").grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    other_types_var = tk.StringVar()
+    tk.Entry(root, textvariable=other_types_var, width=50).grid(row=3, column=1, padx=10, pady=5)
+
+    # Optional UTC time window (HH:MM:SS); may wrap past midnight
+    tk.Label(root, text="Time Window (UTC):").grid(row=4, column=0, padx=10, pady=5, sticky="w")
+    window_frame = tk.Frame(root)
+    window_frame.grid(row=4, column=1, padx=10, pady=5, sticky="w")
+    start_var = tk.StringVar()
+    end_var = tk.StringVar()
+    tk.Entry(window_frame, textvariable=start_var, width=10).pack(side="left")
+    tk.Label(window_frame, text="to").pack(side="left", padx=5)
+    tk.Entry(window_frame, textvariable=end_var, width=10).pack(side="left")
+    tk.Button(root, text="Build Index", command=index).grid(row=4, column=2, padx=10, pady=5)
+
     # Extract button
-    tk.Button(root, text="Extract", command=extract, width=15).grid(row=3, column=0, columnspan=3, pady=20)
+    tk.Button(root, text="Extract", command=extract, width=15).grid(row=5, column=0, columnspan=3, pady=20)
 
     root.mainloop()
 
@@ -0,0 +1,27 @@
+# gnss_engine
+"""
+Core GNSS test engine shared by the headless CLI (main.py) and the Tk GUI (main_gui.py).
+
+The front-ends only gather configuration and display results; ingest, the fix store, CEP and the
+Excel export all live here: ingest -> fix store -> CEP -> export.
+"""
+from .capture import RawCaptureWriter, capture_from_environment, compress_file
+from .extract import extract_file, extract_files, scan_sentences, sentence_pattern
+from .fix_events import FIX_STATES, detect_fix_events, fix_states
+from .fix_store import DAY_NS, EpochClock, FixStore, MotionStore, aligned_epochs
+from .ingest import (log_name, notify, open_log_file, parse_nmea_from_log, parse_nmea_lines, parse_sentence,
+                     read_log_lines, report_line_integrity)
+from .live import read_serial_nmea
+from .live_dynamic import StreamingCEP, StreamingDynamicCEP, load_live_config, run_dynamic_live
+from .log_index import LogIndex, get_log_index
+from .metrics import LiveMetrics, metrics_from_environment
+from .nmea_data import NMEAData
+from .pipeline import (analyze_dynamic, analyze_fix_events, analyze_rolling_cep, analyze_static, load_nmea_log,
+                       process_nmea_log, report_cep, report_satellite_statistics, run_live_capture)
+from .profiling import profile_run, stage
+from .projection import distance_between, geodetic_to_ecef, geodetic_to_enu, horizontal_error
+from .query import HDOP_BUCKETS, FixQuery
+from .replay import SerialReplayer, find_max_rate, load_replay_epochs, run_replay
+from .rolling import SlidingQuantile, rolling_cep, rolling_stability
+from .validate import (SentenceFilter, SentenceValidator, check_sentence, nmea_checksum,
+                       sentence_filter_from_environment)
@@ -0,0 +1,231 @@
+# batch.py
+import datetime
+import glob
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .ingest import SUPPORTED_LOG_EXTENSIONS, log_name
+from .nmea_data import NMEAData
+from .pipeline import analyze_dynamic, analyze_fix_events, analyze_rolling_cep, load_nmea_log
+from .profiling import collect_instrumentation, is_enabled, merge_instrumentation, stage, start_instrumentation
+from .query import FixQuery
+
+BATCH_OUTPUT_FORMATS = ('xlsx', 'csv')
+
+# Reference fixes and motion data of a dynamic batch, installed once per worker process by _init_worker
+_reference_fixes = None
+_reference_motion = None
+
+
+def collect_log_files(patterns):
+    """
+    Expand glob patterns, directories and plain paths into a sorted list of supported log files.
+
+    Args:
+        patterns (list[str]): Globs (e.g. "logs/**/*.txt"), directories (searched recursively) or file paths.
+
+    Returns:
+        list[str]: Unique log file paths, in sorted order.
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '**', '*'), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+            if not matches:
+                logging.warning(f"No files match: {pattern}")
+
+        files.update(os.path.abspath(path) for path in matches
+                     if os.path.isfile(path) and path.lower().endswith(SUPPORTED_LOG_EXTENSIONS))
+
+    return sorted(files)
+
+
+def _init_worker(reference_fixes, reference_motion, instrumented=False):
+    # Workers only report problems; per-sentence INFO logging from every process would swamp the console log
+    logging.getLogger().setLevel(logging.WARNING)
+    if instrumented:  # The parent's timing report covers the work done in the workers
+        start_instrumentation()
+
+    global _reference_fixes, _reference_motion
+    _reference_fixes = reference_fixes
+    _reference_motion = reference_motion
+
+
+def _index_window(fix_filter):
+    # (start, end) of a fix filter that a log index can narrow the parsing to: times of day only, and not with
+    # skip_first_s (it counts from the first fix of the whole log)
+    if not fix_filter or fix_filter.get('skip_first_s') is not None:
+        return None
+    window = fix_filter.get('start'), fix_filter.get('end')
+    if window == (None, None) or not all(bound is None or isinstance(bound, datetime.time) for bound in window):
+        return None
+    return window
+
+
+def analyze_log_file(file_path, timestamp, reference_point=None, export_each=False, latency_correction=False,
+                     fix_filter=None, rolling_window=None, extract=None, sentence_filter=None):
+    """
+    Parse one log file and return its summary row. Runs inside a batch worker process.
+
+    Args:
+        file_path (str): Path to the NMEA log file.
+        timestamp (str): Timestamp of the batch run, selects the logs/NMEA_<timestamp> output folder.
+        reference_point (tuple, optional): Static (latitude, longitude) reference. Ignored for dynamic batches.
+        export_each (bool): Also write the usual per-file Excel workbook.
+        latency_correction (bool): Dynamic batches only: also re-score CEP with the estimated latency removed.
+        fix_filter (dict, optional): Keyword filters of FixQuery.mask (time window, quality, satellites, HDOP).
+            A time window only parses the part of the log around it if the log is indexed (see log_index).
+        rolling_window (dict, optional): Trailing window of the rolling CEP (see analyze_rolling_cep).
+        extract (dict, optional): Parse only the sentences selected by the extractor (see load_nmea_log).
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip (see load_nmea_log).
+
+    Returns:
+        dict: Summary row for the consolidated table.
+    """
+    filename = log_name(file_path)
+    row = {'File': file_path, 'Status': 'OK'}
+
+    try:
+        nmea_data = load_nmea_log(file_path,
+                                  quarantine_path=f"logs/NMEA_{timestamp}/{filename}_quarantine_{timestamp}.txt",
+                                  extract=extract, sentence_filter=sentence_filter,
+                                  window=_index_window(fix_filter))
+        if nmea_data is None:
+            row['Status'] = 'No valid NMEA sentences'
+            return row
+
+        if fix_filter:
+            nmea_data = FixQuery(nmea_data).select(**fix_filter)
+
+        if _reference_fixes is not None:
+            cep_value = analyze_dynamic(nmea_data, _reference_fixes, f"CEP statistics for logfile {filename}:",
+                                        f"log {file_path}", reference_motion=_reference_motion,
+                                        latency_correction=latency_correction, rolling_window=rolling_window)
+        else:
+            cep_value = nmea_data.calculate_cep(reference_point)
+            if cep_value:
+                analyze_fix_events(nmea_data, cep_value, f"log {file_path}")
+                analyze_rolling_cep(cep_value, f"log {file_path}", rolling_window)
+
+        if cep_value:
+            row.update(NMEAData.cep_summary(cep_value))
+            # Dynamic batches also report the P95 of every track and motion error, and the latency
+            for table in cep_value.get('tables', {}).values():
+                if "P95 |Error|" in table:
+                    row.update({f"P95 {metric}": value
+                                for metric, value in zip(table["Metric"], table["P95 |Error|"])})
+            if 'latency' in cep_value:
+                row["Estimated Latency (s)"] = cep_value['latency']['latency_s']
+            for key, value in cep_value.get('latency_corrected_cep', {}).items():
+                row[f"Latency-Corrected {key} (m)"] = value
+            row.update(cep_value.get('convergence', {}))
+            row.update(cep_value.get('rolling_stability', {}))
+        else:
+            row['Status'] = 'No coordinates available'
+
+        if nmea_data.line_integrity:
+            integrity = dict(zip(nmea_data.line_integrity["Metric"], nmea_data.line_integrity["Value"]))
+            row.update({key: integrity[key] for key in ("Corrupt Lines", "Corruption Rate (%)")})
+
+        satellite_stats = nmea_data.calculate_satellite_statistics()
+        if not satellite_stats.empty:
+            row.update(satellite_stats.iloc[0].to_dict())
+
+        if export_each and cep_value:
+            if _reference_fixes is not None:
+                nmea_data.write_to_excel_mode_2_dynamic(timestamp, cep_value, filename)
+            else:
+                nmea_data.write_to_excel_mode_2(timestamp, cep_value, filename)
+
+    except Exception as e:
+        logging.error(f"Error analysing log file {file_path}: {e}")
+        row['Status'] = f"Error: {e}"
+
+    return row
+
+
+def _analyze_instrumented(*args):
+    # analyze_log_file with the stage timers of this file, for the parent to merge into its timing report
+    with stage('analyze_log_file'):
+        row = analyze_log_file(*args)
+    return row, collect_instrumentation()
+
+
+def run_batch(files, timestamp, reference_point=None, reference_log=None, output_format='xlsx', workers=None,
+              export_each=False, latency_correction=False, fix_filter=None, rolling_window=None, extract=None,
+              sentence_filter=None):
+    """
+    Analyse many log files in parallel and write one consolidated CEP/satellite summary table.
+
+    Args:
+        files (list[str]): Log files to analyse.
+        timestamp (str): Timestamp of the run, selects the logs/NMEA_<timestamp> output folder.
+        reference_point (tuple, optional): Static (latitude, longitude) reference for every file.
+        reference_log (str, optional): Log of a reference receiver; files are scored against it epoch by epoch.
+        output_format (str): 'xlsx' or 'csv' for the consolidated summary.
+        workers (int, optional): Number of worker processes. Defaults to all cores.
+        export_each (bool): Also write the usual per-file Excel workbook.
+        latency_correction (bool): With reference_log, also re-score CEP with each file's estimated latency removed.
+        fix_filter (dict, optional): Keyword filters of FixQuery.mask applied to every file (not the reference).
+        rolling_window (dict, optional): Trailing window of the rolling CEP (see analyze_rolling_cep).
+        extract (dict, optional): Parse only the sentences selected by the extractor (see load_nmea_log). The
+            reference log is always parsed in full.
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip in every file (see
+            load_nmea_log). The reference log is always parsed in full.
+
+    Returns:
+        pd.DataFrame: The consolidated summary, one row per file.
+    """
+    import pandas as pd  # Deferred: keeps CLI startup and worker spawn light
+
+    if output_format not in BATCH_OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}. Supported formats: xlsx, csv")
+
+    log_folder = f"logs/NMEA_{timestamp}"
+    os.makedirs(log_folder, exist_ok=True)
+
+    # The reference log is parsed once here and shipped to each worker, rather than once per file
+    reference_fixes = reference_motion = None
+    if reference_log:
+        reference_data = load_nmea_log(reference_log)
+        if reference_data is None:
+            logging.error(f"Could not load reference log: {reference_log}")
+            return None
+        reference_fixes = reference_data.fixes
+        reference_motion = reference_data.motion
+        files = [path for path in files if os.path.abspath(path) != os.path.abspath(reference_log)]
+
+    logging.info(f"Batch analysis of {len(files)} log files with {workers or os.cpu_count()} workers.")
+
+    rows = []
+    instrumentation = is_enabled()  # With the timing instrumentation on (see profiling), workers time their stages too
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(reference_fixes, reference_motion, instrumentation)) as pool:
+        futures = {pool.submit(_analyze_instrumented if instrumentation else analyze_log_file, path, timestamp,
+                               reference_point, export_each, latency_correction, fix_filter, rolling_window,
+                               extract, sentence_filter): path
+                   for path in files}
+        for done, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            if instrumentation:
+                row, timings = row
+                merge_instrumentation(timings)
+            rows.append(row)
+            logging.info(f"[{done}/{len(files)}] {row['File']}: {row['Status']}")
+
+    df_summary = pd.DataFrame(rows)
+    if not df_summary.empty:
+        df_summary = df_summary.sort_values('File').reset_index(drop=True)
+
+    summary_path = os.path.join(log_folder, f"batch_summary_{timestamp}.{output_format}")
+    with stage('write batch summary'):
+        if output_format == 'csv':
+            df_summary.to_csv(summary_path, index=False)
+        else:
+            df_summary.to_excel(summary_path, index=False, sheet_name="Batch Summary", engine='openpyxl')
+
+    logging.info(f"Batch summary written to {summary_path}")
+    return df_summary
@@ -0,0 +1,211 @@
+# capture.py
+import gzip
+import importlib.util
+import logging
+import os
+import shutil
+import threading
+import time
+
+CAPTURE_COMPRESSIONS = (None, 'gzip', 'zstd')
+DEFAULT_BUFFER_BYTES = 1 << 20  # Received bytes are written in chunks of up to 1 MiB
+DEFAULT_FLUSH_INTERVAL_S = 1.0  # ... or at least once a second (checked on every read, timeouts included)
+ROTATE_MB_ENV = 'GNSS_CAPTURE_ROTATE_MB'  # Start a new capture segment every N MB
+ROTATE_MINUTES_ENV = 'GNSS_CAPTURE_ROTATE_MINUTES'  # ... or every N minutes
+COMPRESSION_ENV = 'GNSS_CAPTURE_COMPRESSION'  # Compress finished segments: "gzip" or "zstd"
+
+
+class RawCaptureWriter:
+    """
+    Lossless raw capture of a serial stream, with receive timestamps, batched writes and rotation.
+
+    The bytes read from the port are stored exactly as received (no decoding, no stripping, line endings
+    kept), so a capture segment is a byte-exact copy of the stream and can be replayed or re-parsed like
+    any .txt log. The receive time of every line goes to a sidecar "<segment>_rx_times.tsv" as
+    "<byte offset>\\t<receive time in ns since 1970>" rows.
+
+    Lines are collected in memory and written in large chunks (buffer_bytes, or every flush_interval_s).
+    The interval is checked on every read the capture is given, empty ones (read timeouts) included, so a
+    crash loses at most flush_interval_s plus one read timeout of data, even when the port goes quiet.
+    A new segment is started when the current one reaches rotate_bytes or rotate_seconds; finished
+    segments are compressed (gzip, or zstd if the zstandard package is installed) in a background
+    thread, and only deleted once their compressed copy is complete.
+
+    Args:
+        path (str): Path of the first segment (e.g. "logs/NMEA_x/nmea_raw_log_mode_1_COM3_115200_x.txt").
+            Later segments get a "_partNNN" suffix.
+        rotate_bytes (int, optional): Start a new segment after this many bytes.
+        rotate_seconds (float, optional): Start a new segment after this many seconds.
+        compression (str, optional): None, 'gzip' or 'zstd' for finished segments.
+        buffer_bytes (int): Size of the write batches.
+        flush_interval_s (float): Longest time received data stays in memory.
+    """
+
+    def __init__(self, path, rotate_bytes=None, rotate_seconds=None, compression=None,
+                 buffer_bytes=DEFAULT_BUFFER_BYTES, flush_interval_s=DEFAULT_FLUSH_INTERVAL_S):
+        if compression not in CAPTURE_COMPRESSIONS:
+            raise ValueError(f"Unsupported capture compression: {compression}. Supported: gzip, zstd")
+        if compression == 'zstd' and importlib.util.find_spec('zstandard') is None:
+            raise ValueError("zstd capture compression needs the 'zstandard' package; use gzip instead.")
+
+        self.base_path = path
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval_s = flush_interval_s
+
+        self.segment = 0
+        self.segments = []  # Paths of all segments written (before compression)
+        self.bytes_written = 0  # Over all segments
+        self.lines_written = 0
+        self._compressors = []
+        self._open_segment()
+
+    def _segment_path(self, segment):
+        if segment == 0:
+            return self.base_path
+        stem, extension = os.path.splitext(self.base_path)
+        return f"{stem}_part{segment + 1:03d}{extension}"
+
+    def _open_segment(self):
+        self.path = self._segment_path(self.segment)
+        stem = os.path.splitext(self.path)[0]
+        self._data = open(self.path, 'wb')
+        self._times = open(f"{stem}_rx_times.tsv", 'wb')
+        self.segments.append(self.path)
+        self._segment_bytes = 0
+        self._segment_start = time.monotonic()
+        self._last_flush = self._segment_start
+        self._data_buffer = bytearray()
+        self._times_buffer = bytearray()
+
+    def write(self, raw_line, receive_time_ns=None):
+        """
+        Add one line exactly as received.
+
+        Args:
+            raw_line (bytes): Bytes returned by the port read, including the line ending. Empty reads (timeouts)
+                add nothing, but flush data that has waited flush_interval_s.
+            receive_time_ns (int, optional): Receive time in ns since 1970. Defaults to now.
+        """
+        if not raw_line:
+            if self._data_buffer and time.monotonic() - self._last_flush >= self.flush_interval_s:
+                self.flush()
+            return
+        if receive_time_ns is None:
+            receive_time_ns = time.time_ns()
+
+        self._times_buffer += b'%d\t%d\n' % (self._segment_bytes, receive_time_ns)
+        self._data_buffer += raw_line
+        self._segment_bytes += len(raw_line)
+        self.bytes_written += len(raw_line)
+        self.lines_written += 1
+
+        now = time.monotonic()
+        if len(self._data_buffer) >= self.buffer_bytes or now - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+        if ((self.rotate_bytes and self._segment_bytes >= self.rotate_bytes)
+                or (self.rotate_seconds and now - self._segment_start >= self.rotate_seconds)):
+            self.rotate()
+
+    def flush(self):
+        """Write the buffered data and timestamps to the current segment."""
+        self._data.write(self._data_buffer)
+        self._times.write(self._times_buffer)
+        self._data.flush()
+        self._times.flush()
+        self._data_buffer.clear()
+        self._times_buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def rotate(self):
+        """Close the current segment (compressing it in the background if configured) and start the next one."""
+        self._close_segment()
+        self.segment += 1
+        self._open_segment()
+
+    def _close_segment(self):
+        self.flush()
+        self._data.close()
+        self._times.close()
+        if self.compression:
+            worker = threading.Thread(target=compress_file, args=(self.path, self.compression),
+                                      name=f"compress {os.path.basename(self.path)}", daemon=True)
+            worker.start()
+            self._compressors.append(worker)
+
+    def close(self):
+        """Write everything still buffered, close the last segment and wait for pending compressions."""
+        if self._data.closed:
+            return
+        self._close_segment()
+        for worker in self._compressors:
+            worker.join()
+        self._compressors.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def compress_file(path, compression='gzip'):
+    """
+    Compress a finished capture segment next to itself, then delete the original.
+
+    The compressed copy is written under a temporary name and renamed once complete, so an interrupted
+    compression never leaves a truncated archive that looks valid, and the original is only removed after.
+
+    Returns:
+        str: Path of the compressed file, or None if compression failed (the original is kept).
+    """
+    target = f"{path}.{'zst' if compression == 'zstd' else 'gz'}"
+    partial = f"{target}.partial"
+    try:
+        with open(path, 'rb') as source:
+            if compression == 'zstd':
+                import zstandard  # Optional dependency, checked when the writer was created
+                with open(partial, 'wb') as destination:
+                    zstandard.ZstdCompressor(threads=-1).copy_stream(source, destination)
+            else:
+                with gzip.open(partial, 'wb', compresslevel=6) as destination:
+                    shutil.copyfileobj(source, destination, 1 << 20)
+        os.replace(partial, target)
+        os.remove(path)
+        return target
+    except OSError as e:
+        logging.error(f"Error compressing capture segment {path}: {e}")
+        return None
+
+
+def capture_from_environment():
+    """
+    RawCaptureWriter options requested through the environment, for the front-ends without a config file
+    (GUI, interactive menu): GNSS_CAPTURE_ROTATE_MB and/or GNSS_CAPTURE_ROTATE_MINUTES rotate the raw capture,
+    GNSS_CAPTURE_COMPRESSION ("gzip" or "zstd") compresses the finished segments.
+
+    Returns:
+        dict: Options for RawCaptureWriter, or None if none is set or a value is invalid (logged; the capture
+        then keeps a single uncompressed file).
+    """
+    rotate_mb, rotate_minutes, compression = (os.environ.get(name, '').strip()
+                                              for name in (ROTATE_MB_ENV, ROTATE_MINUTES_ENV, COMPRESSION_ENV))
+    if not rotate_mb and not rotate_minutes and not compression:
+        return None
+    try:
+        options = {'rotate_bytes': int(float(rotate_mb) * 1e6) if rotate_mb else None,
+                   'rotate_seconds': float(rotate_minutes) * 60 if rotate_minutes else None,
+                   'compression': compression.lower() or None}
+        if min(options['rotate_bytes'] or 1, options['rotate_seconds'] or 1) <= 0:
+            raise ValueError("rotation sizes and intervals must be positive")
+        if options['compression'] not in CAPTURE_COMPRESSIONS:
+            raise ValueError(f"unsupported compression {compression} (gzip or zstd)")
+        if options['compression'] == 'zstd' and importlib.util.find_spec('zstandard') is None:
+            raise ValueError("zstd compression needs the 'zstandard' package")
+    except ValueError as e:
+        logging.error(f"Ignoring the capture options of {ROTATE_MB_ENV}/{ROTATE_MINUTES_ENV}/{COMPRESSION_ENV}: {e}")
+        return None
+    return options
@@ -0,0 +1,306 @@
+# dynamic.py
+import numpy as np
+
+from .fix_store import aligned_epochs
+from .projection import geodetic_to_enu
+
+ERROR_PERCENTILES = [50, 68, 90, 95, 99]
+MIN_COURSE_SPEED = 0.5  # m/s. Course over ground is noise below walking speed, so those epochs are not scored
+
+
+def match_epochs(times_ns, reference_times_ns):
+    """
+    Pair epochs of a device with the reference epochs carrying the same time.
+
+    Args:
+        times_ns (np.ndarray): Epoch times of the device in nanoseconds, on the same timeline as the reference
+            (see fix_store.aligned_epochs).
+        reference_times_ns (np.ndarray): Epoch times of the reference in nanoseconds.
+
+    Returns:
+        tuple: (device indices, reference indices) of the matched epochs, in time order.
+    """
+    common, idx, ref_idx = np.intersect1d(times_ns, reference_times_ns, assume_unique=False, return_indices=True)
+    known = common >= 0  # Epochs without a time (-1) must not pair with each other
+    return idx[known], ref_idx[known]
+
+
+def wrap_angle(degrees):
+    """Wrap angle differences into [-180, 180) degrees so 359° vs 1° is a 2° error, not 358°."""
+    return (np.asarray(degrees) + 180.0) % 360.0 - 180.0
+
+
+def error_percentile_table(errors):
+    """
+    Summarise signed per-epoch errors of several metrics in one table.
+
+    All metrics are stacked into one NaN-padded matrix so the percentiles of every metric come out of a
+    single np.nanpercentile call.
+
+    Args:
+        errors (dict): Metric name -> array of signed per-epoch errors (NaN where not available).
+
+    Returns:
+        dict: Equal-length columns (Metric, Epochs, Mean, P50 ... P99 of the absolute error), ready for pd.DataFrame.
+    """
+    names = list(errors)
+    width = max((len(values) for values in errors.values()), default=0)
+    stacked = np.full((len(names), width), np.nan)
+    for row, name in enumerate(names):
+        stacked[row, :len(errors[name])] = errors[name]
+
+    counts = np.count_nonzero(~np.isnan(stacked), axis=1)
+    populated = counts > 0
+
+    means = np.full(len(names), np.nan)
+    percentiles = np.full((len(ERROR_PERCENTILES), len(names)), np.nan)
+    if populated.any():
+        means[populated] = np.nanmean(stacked[populated], axis=1)
+        percentiles[:, populated] = np.nanpercentile(np.abs(stacked[populated]), ERROR_PERCENTILES, axis=1)
+
+    table = {"Metric": names, "Epochs": counts, "Mean Error": means}
+    for p, values in zip(ERROR_PERCENTILES, percentiles):
+        table[f"P{p} |Error|"] = values
+    return table
+
+
+def calculate_motion_errors(fixes, motion, reference_fixes, reference_motion):
+    """
+    Score speed, course, heading and altitude of a device against the reference, epoch by epoch.
+
+    Args:
+        fixes (FixStore): GGA fixes of the device under test.
+        motion (MotionStore): Motion data of the device under test.
+        reference_fixes (FixStore): GGA fixes of the reference device.
+        reference_motion (MotionStore): Motion data of the reference device.
+
+    Returns:
+        dict: 'errors' (metric -> signed per-epoch errors) and 'table' (percentile table of error_percentile_table).
+    """
+    errors = {}
+
+    # Speed, course and heading come from the motion stores, aligned on epoch time
+    idx, ref_idx = match_epochs(*aligned_epochs(motion, reference_motion))
+    ref_speed = reference_motion.speed[ref_idx]
+    errors["Speed Error (m/s)"] = motion.speed[idx] - ref_speed
+
+    course_error = wrap_angle(motion.course[idx] - reference_motion.course[ref_idx])
+    course_error[~(ref_speed >= MIN_COURSE_SPEED)] = np.nan
+    errors["Course Error (deg)"] = course_error
+
+    errors["Heading Error (deg)"] = wrap_angle(motion.heading[idx] - reference_motion.heading[ref_idx])
+
+    # Altitude comes from the GGA fixes
+    idx, ref_idx = match_epochs(*aligned_epochs(fixes, reference_fixes))
+    errors["Altitude Error (m)"] = fixes.altitude[idx] - reference_fixes.altitude[ref_idx]
+
+    return {'errors': errors, 'table': error_percentile_table(errors)}
+
+
+def reference_track_tangent(reference_fixes):
+    """
+    Unit tangent of the reference trajectory at every reference epoch.
+
+    The usable reference fixes (with a position and a fix time, see _reference_track) are projected into one
+    local ENU frame and differentiated against fix time in time order with central differences, so a no-fix
+    row or an out-of-order epoch never bends the tangent of its neighbours. Unusable epochs, and epochs where
+    the reference moves slower than MIN_COURSE_SPEED, have no usable direction and get NaN.
+
+    Args:
+        reference_fixes (FixStore): GGA fixes of the reference device.
+
+    Returns:
+        tuple: (tangent east, tangent north) unit-vector components, one per reference epoch.
+    """
+    epochs_ns = reference_fixes.timeline_ns(absolute=False)
+    tangent_east = np.full(len(epochs_ns), np.nan)
+    tangent_north = tangent_east.copy()
+    usable = np.flatnonzero(_usable(reference_fixes, epochs_ns))
+    if len(usable) < 2:
+        return tangent_east, tangent_north
+
+    rows = usable[np.argsort(epochs_ns[usable], kind='stable')]
+    latitudes, longitudes = reference_fixes.latitude[rows], reference_fixes.longitude[rows]
+    east, north, _ = geodetic_to_enu(latitudes, longitudes, 0.0, latitudes[0], longitudes[0], 0.0)
+    seconds = (epochs_ns[rows] - epochs_ns[rows[0]]) / 1e9
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        velocity_east = np.gradient(east, seconds)
+        velocity_north = np.gradient(north, seconds)
+        speed = np.hypot(velocity_east, velocity_north)
+        moving = speed >= MIN_COURSE_SPEED  # False for NaN/inf speeds as well
+        tangent_east[rows] = np.where(moving, velocity_east / speed, np.nan)
+        tangent_north[rows] = np.where(moving, velocity_north / speed, np.nan)
+
+    return tangent_east, tangent_north
+
+
+def calculate_track_errors(cep_value, reference_fixes):
+    """
+    Split the horizontal error of every matched fix into along-track and cross-track components.
+
+    Along-track error is positive when the device is ahead of the reference along its direction of travel
+    (a lagging receiver shows a negative bias that grows with speed). Cross-track error is positive to the
+    right of the direction of travel and shows lateral position bias.
+
+    Args:
+        cep_value (dict): Result of NMEAData.calculate_dynamic_cep (east/north offsets and reference indices).
+        reference_fixes (FixStore): GGA fixes of the reference device.
+
+    Returns:
+        dict: 'errors' (metric -> signed per-fix errors) and 'table' (percentile table of error_percentile_table).
+    """
+    tangent_east, tangent_north = reference_track_tangent(reference_fixes)
+    ref_idx = cep_value['reference_indices']
+    tangent_east, tangent_north = tangent_east[ref_idx], tangent_north[ref_idx]
+
+    east, north = cep_value['east'], cep_value['north']
+    errors = {
+        "Along-Track Error (m)": east * tangent_east + north * tangent_north,
+        "Cross-Track Error (m)": east * tangent_north - north * tangent_east,
+    }
+    return {'errors': errors, 'table': error_percentile_table(errors)}
+
+
+def _usable(fixes, epochs_ns):
+    # Fixes with a position and a fix time
+    return fixes.valid_mask() & (epochs_ns >= 0)
+
+
+def _reference_track(reference_fixes, epochs_ns):
+    # Reference track in one local ENU frame, sorted by time, with its speed at every epoch.
+    # Times are seconds since the first reference epoch, which keeps full float precision on absolute epochs.
+    usable = _usable(reference_fixes, epochs_ns)
+    times_ns = epochs_ns[usable]
+    order = np.argsort(times_ns, kind='stable')
+    latitudes = reference_fixes.latitude[usable][order]
+    longitudes = reference_fixes.longitude[usable][order]
+    start_ns = times_ns[order[0]]
+    seconds = (times_ns[order] - start_ns) / 1e9
+    east, north, _ = geodetic_to_enu(latitudes, longitudes, 0.0, latitudes[0], longitudes[0], 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.hypot(np.gradient(east, seconds), np.gradient(north, seconds))
+
+    # Interpolation is only trusted across gaps up to 2.5 nominal reference intervals
+    max_gap_s = 2.5 * np.median(np.diff(seconds))
+    return {'seconds': seconds, 'east': east, 'north': north, 'speed': speed, 'start_ns': start_ns,
+            'origin': (latitudes[0], longitudes[0]), 'max_gap_s': max_gap_s}
+
+
+def _fixes_in_frame(fixes, epochs_ns, track):
+    # Usable fixes of a device in the ENU frame and time base of the reference track
+    usable = _usable(fixes, epochs_ns)
+    east, north, _ = geodetic_to_enu(fixes.latitude[usable], fixes.longitude[usable], 0.0,
+                                     track['origin'][0], track['origin'][1], 0.0)
+    return (epochs_ns[usable] - track['start_ns']) / 1e9, east, north
+
+
+def _shifted_errors(seconds, east, north, track, shifts):
+    """
+    Horizontal error of every fix against the reference interpolated at (fix time - shift), for many shifts.
+
+    Returns a (len(shifts), len(seconds)) array; fixes whose shifted time falls outside the reference track
+    or inside a reference data gap are NaN.
+    """
+    ref_seconds = track['seconds']
+    query = (seconds[None, :] - shifts[:, None]).ravel()
+
+    interp_east = np.interp(query, ref_seconds, track['east'])
+    interp_north = np.interp(query, ref_seconds, track['north'])
+
+    # Only interpolate between reference epochs that are close enough to describe the motion in between
+    after = np.searchsorted(ref_seconds, query)
+    inside = (after > 0) & (after < len(ref_seconds))
+    gap = np.full(query.shape, np.inf)
+    gap[inside] = ref_seconds[after[inside]] - ref_seconds[after[inside] - 1]
+    exact = np.isin(query, ref_seconds)
+
+    errors = np.hypot(np.tile(east, len(shifts)) - interp_east, np.tile(north, len(shifts)) - interp_north)
+    errors[~((gap <= track['max_gap_s']) | exact)] = np.nan
+    return errors.reshape(len(shifts), len(seconds))
+
+
+def estimate_latency(fixes, reference_fixes, max_latency_s=2.0, resolution_s=0.001, min_moving_epochs=10):
+    """
+    Estimate the output latency of a device relative to the reference by a time-shift search.
+
+    A device with latency L reports at time t the position the reference had at t - L. The search
+    evaluates the RMS horizontal error of all moving fixes against the reference track interpolated at
+    (t - shift) for a whole grid of shifts at once, then refines around the best shift with grids twenty
+    times finer until the requested resolution is reached (coarse-to-fine). Stationary epochs carry no
+    latency information and are left out.
+
+    Args:
+        fixes (FixStore): GGA fixes of the device under test.
+        reference_fixes (FixStore): GGA fixes of the reference device.
+        max_latency_s (float): Largest latency (either sign) searched, in seconds.
+        resolution_s (float): Resolution of the final estimate, in seconds.
+        min_moving_epochs (int): Minimum number of moving epochs needed for an estimate.
+
+    Returns:
+        dict: 'latency_s', 'rms_error_m' (at the estimated latency), 'rms_error_unshifted_m' and
+        'moving_epochs', or None if the reference is not moving enough for latency to be observable.
+    """
+    epochs_ns, ref_epochs_ns = aligned_epochs(fixes, reference_fixes)
+    if (_usable(fixes, epochs_ns).sum() < min_moving_epochs
+            or _usable(reference_fixes, ref_epochs_ns).sum() < 2):
+        return None
+
+    track = _reference_track(reference_fixes, ref_epochs_ns)
+    seconds, east, north = _fixes_in_frame(fixes, epochs_ns, track)
+
+    # Keep the fixes taken while the reference was moving
+    moving = np.interp(seconds, track['seconds'], np.nan_to_num(track['speed'])) >= MIN_COURSE_SPEED
+    if moving.sum() < min_moving_epochs:
+        return None
+    seconds, east, north = seconds[moving], east[moving], north[moving]
+
+    def rms(shifts):
+        errors = _shifted_errors(seconds, east, north, track, shifts)
+        counts = np.count_nonzero(~np.isnan(errors), axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cost = np.sqrt(np.nansum(errors ** 2, axis=1) / counts)
+        cost[counts < min_moving_epochs] = np.inf
+        return cost
+
+    # Coarse-to-fine: 41-point grids, each spanning one spacing of the previous grid around its best shift
+    center, half_width = 0.0, max_latency_s
+    while True:
+        shifts = center + np.linspace(-half_width, half_width, 41)
+        center = shifts[np.argmin(rms(shifts))]
+        spacing = half_width / 20
+        if spacing <= resolution_s:
+            break
+        half_width = spacing
+
+    latency_s = round(center / resolution_s) * resolution_s
+    best_cost, unshifted_cost = rms(np.array([latency_s, 0.0]))
+    if not np.isfinite(best_cost):
+        return None
+
+    return {
+        'latency_s': float(latency_s),
+        'rms_error_m': float(best_cost),
+        'rms_error_unshifted_m': float(unshifted_cost),
+        'moving_epochs': int(moving.sum()),
+    }
+
+
+def latency_corrected_distances(fixes, reference_fixes, latency_s):
+    """
+    Horizontal error of every fix against the reference position at (fix time - latency).
+
+    Args:
+        fixes (FixStore): GGA fixes of the device under test.
+        reference_fixes (FixStore): GGA fixes of the reference device.
+        latency_s (float): Latency to remove, as returned by estimate_latency.
+
+    Returns:
+        np.ndarray: Distances in meters for the fixes covered by the reference track.
+    """
+    epochs_ns, ref_epochs_ns = aligned_epochs(fixes, reference_fixes)
+    track = _reference_track(reference_fixes, ref_epochs_ns)
+    seconds, east, north = _fixes_in_frame(fixes, epochs_ns, track)
+    errors = _shifted_errors(seconds, east, north, track, np.array([latency_s]))[0]
+    return errors[~np.isnan(errors)]
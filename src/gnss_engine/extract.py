@@ -0,0 +1,284 @@
+# extract.py
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from .ingest import log_name, open_log_file, split_compression
+from .log_index import LogIndex, time_field_ns, time_of_day_ns
+from .validate import address_alternatives
+
+SCAN_BLOCK_BYTES = 8 << 20  # Compressed logs are scanned in blocks of 8 MiB of decompressed data
+OUTPUT_BUFFER_BYTES = 1 << 20
+
+# Sentence types carrying the UTC time of their epoch, with the field index of the time
+TIME_FIELDS = {b'GGA': 1, b'RMC': 1, b'GNS': 1, b'ZDA': 1, b'GST': 1, b'GLL': 5}
+_TIME_TYPES = b'|'.join(TIME_FIELDS)
+
+
+def _line_pattern(alternatives):
+    # One whole sentence at the start of a line. The address must end at the first field separator, so "GSV"
+    # does not match "$GPGSVX,..."
+    return re.compile(rb'\$(?:' + alternatives + rb')(?=[,*\r\n])[^\n]*\n?')
+
+
+def _scan_pattern(alternatives):
+    # The same sentences found anywhere in a buffer. Anchoring on the literal "\n$" lets the regex engine skip
+    # ahead with a fast substring search instead of trying every position as a MULTILINE '^' would, so
+    # unselected lines cost almost nothing. The leading '\n' belongs to the line before and the line's own
+    # '\n' is left out of the match (see _scan).
+    return re.compile(rb'\n\$(?:' + alternatives + rb')(?=[,*\r\n])[^\n]*')
+
+
+def sentence_pattern(types):
+    """
+    Compile a set of talker+type filters into one byte pattern matching a whole sentence (line ending kept).
+
+    Filters are written without the '$':
+        "GGA"      -- the type from any talker ($GPGGA, $GNGGA, $GBGGA, ...)
+        "GNGGA"    -- exactly this talker and type
+        "PQTMEPE"  -- a proprietary sentence
+        "PQTM*"    -- every sentence whose address starts with the prefix ("*" alone: every sentence)
+
+    Args:
+        types (iterable[str]): Filters, case-insensitive.
+
+    Returns:
+        re.Pattern: Pattern to match against one raw line (bytes).
+    """
+    return _line_pattern(address_alternatives(types))
+
+
+def _scan(buffer, alternatives, pos=0, endpos=None):
+    # Selected lines of buffer[pos:endpos] (pos at a line start), as bytes exactly as stored
+    endpos = len(buffer) if endpos is None else endpos
+    first = _line_pattern(alternatives).match(buffer, pos, endpos)
+    if first:  # The first line has no '\n' before it for the scan pattern to anchor on
+        yield first.group()
+    for match in _scan_pattern(alternatives).finditer(buffer, pos, endpos):
+        yield buffer[match.start() + 1:min(match.end() + 1, endpos)]
+
+
+class _EpochSelector:
+    """
+    Time window and decimation over the epochs of a raw log.
+
+    An epoch starts at every time-bearing sentence (TIME_FIELDS) with a new time of day; the sentences that
+    follow belong to it until the next one. Sentences before the first time are kept only without a window.
+    """
+
+    def __init__(self, start=None, end=None, decimate=1, epoch=0):
+        self.start_ns = None if start is None else time_of_day_ns(start)
+        self.end_ns = None if end is None else time_of_day_ns(end)
+        self.decimate = max(int(decimate or 1), 1)
+        self.time_ns = None
+        self.epoch = epoch
+        self.keep = self.start_ns is None and self.end_ns is None
+
+    def _in_window(self, time_ns):
+        start, end = self.start_ns, self.end_ns
+        if start is not None and end is not None and end < start:  # Window across midnight
+            return time_ns >= start or time_ns < end
+        return (start is None or time_ns >= start) and (end is None or time_ns < end)
+
+    def update(self, line):
+        """Advance the epoch on a time-bearing sentence. Returns whether the current epoch is kept."""
+        address = line[1:line.find(b',')]
+        field = TIME_FIELDS.get(address[-3:]) if not address.startswith(b'P') else None
+        if field is not None:
+            try:
+                time_ns = time_field_ns(line.split(b',', field + 1)[field])
+            except (ValueError, IndexError):
+                return self.keep
+            if time_ns != self.time_ns:
+                if self.time_ns is not None:
+                    self.epoch += 1
+                self.time_ns = time_ns
+                self.keep = self.epoch % self.decimate == 0 and self._in_window(time_ns)
+        return self.keep
+
+
+def _log_buffers(file_path, index=None, start=None, end=None):
+    # (buffer, first byte, end byte, number of the epoch at the first byte) slices to scan. Plain logs are mapped
+    # into memory in one piece, and with an index only the slices around the time window are scanned; compressed
+    # logs are decompressed in blocks cut at line ends.
+    if split_compression(file_path)[1] is None:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if index is None:
+                    if hasattr(mapped, 'madvise'):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    yield mapped, 0, len(mapped), 0
+                    return
+                for first, last, epoch in index.time_of_day_ranges(start, end):
+                    yield mapped, first, last, epoch
+        return
+
+    with open_log_file(file_path) as f:
+        tail = b''
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                tail += block
+                continue
+            data, tail = tail + block[:cut], block[cut:]
+            yield data, 0, len(data), None
+        if tail:
+            yield tail, 0, len(tail), None
+
+
+def scan_sentences(file_path, types, start=None, end=None, decimate=1):
+    """
+    Yield the raw sentences of a log that pass the type filters, time window and decimation.
+
+    The log is scanned as bytes (memory-mapped, or decompressed block by block) with one compiled
+    pattern, so lines that are not selected never become Python objects. With a time window or
+    decimation, time-bearing sentences are also matched to track the epoch, but only yielded if selected.
+    If the log has an up-to-date sidecar index (see log_index), a time window only scans the slices of
+    the log around it.
+
+    Args:
+        file_path (str): Raw log (.txt/.log/.nmea, optionally compressed).
+        types (iterable[str]): Sentence filters (see sentence_pattern).
+        start (datetime.time, optional): First UTC time of day included.
+        end (datetime.time, optional): First UTC time of day excluded. A window may wrap past midnight.
+        decimate (int): Keep every N-th epoch only.
+
+    Yields:
+        bytes: Sentences exactly as stored in the log, including their line ending.
+    """
+    alternatives = address_alternatives(types)
+    if start is None and end is None and (decimate or 1) <= 1:
+        for buffer, pos, endpos, _ in _log_buffers(file_path):
+            yield from _scan(buffer, alternatives, pos, endpos)
+        return
+
+    # With a time window, an up-to-date sidecar index (see log_index) limits the scan to the slices around it
+    index = LogIndex.load(file_path) if start is not None or end is not None else None
+
+    # Time-bearing sentences are matched too (to follow the epochs); the selection is re-checked per line
+    selected = _line_pattern(alternatives)
+    tracked = rb'[A-Z]{2}(?:' + _TIME_TYPES + rb')|' + alternatives
+    selector = _EpochSelector(start, end, decimate)
+    for buffer, pos, endpos, epoch in _log_buffers(file_path, index, start, end):
+        if epoch is not None:  # A slice starts at an indexed epoch: decimation continues from its number
+            selector = _EpochSelector(start, end, decimate, epoch)
+        for line in _scan(buffer, tracked, pos, endpos):
+            if selector.update(line) and selected.match(line):
+                yield line
+
+
+def scan_window(file_path, start=None, end=None):
+    """
+    Raw lines of the part of a log covering the time window of a fix filter, read through its sidecar index.
+
+    Only plain text logs with an up-to-date index (see log_index) can be read this way, and only windows
+    that LogIndex.window_range can narrow. The slice starts and ends up to N indexed epochs outside the
+    window, so the fixes still have to be trimmed to it exactly (FixQuery does that).
+
+    Args:
+        file_path (str): Raw log.
+        start (datetime.time, optional): First UTC time of day of the window (first occurrence in the log).
+        end (datetime.time, optional): End of the window (first occurrence at or after start).
+
+    Returns:
+        tuple: (iterator over the lines exactly as stored (bytes), day count of the first line in the log),
+        or None if the log has to be read in full.
+    """
+    inner_path, compression = split_compression(file_path)
+    if compression is not None or not inner_path.endswith(('.txt', '.log', '.nmea')):
+        return None
+    index = LogIndex.load(file_path)
+    byte_range = index.window_range(start, end) if index is not None else None
+    if byte_range is None:
+        return None
+    first, last, day = byte_range
+    return _read_lines(file_path, first, last), day
+
+
+def _read_lines(file_path, first, last):
+    # Lines of the bytes [first, last) of a log (both at line starts), read lazily
+    with open(file_path, 'rb') as f:
+        f.seek(first)
+        remaining = last - first
+        while remaining > 0:
+            line = f.readline(remaining)
+            if not line:
+                return
+            remaining -= len(line)
+            yield line
+
+
+def extract_file(file_path, output_folder, types, start=None, end=None, decimate=1, timestamp=None):
+    """
+    Write the selected sentences of one log to "<types>_<log name>_<timestamp>.txt" in output_folder.
+
+    Args:
+        file_path (str): Raw log to extract from.
+        output_folder (str): Folder of the extracted file.
+        types (iterable[str]): Sentence filters (see sentence_pattern).
+        start, end, decimate: Time window and decimation (see scan_sentences).
+        timestamp (str, optional): Timestamp in the file name. Defaults to now.
+
+    Returns:
+        tuple: (path of the extracted file, number of sentences written)
+    """
+    types = list(types)
+    mode = "_".join(spec.strip().lower().lstrip('$').rstrip('*') or 'all' for spec in types)
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(output_folder, f"{mode}_{log_name(file_path)}_{timestamp}.txt")
+
+    count = 0
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_BYTES) as outfile:
+        for count, line in enumerate(scan_sentences(file_path, types, start, end, decimate), start=1):
+            outfile.write(line)
+
+    logging.info(f"Extracted {count} sentences from {file_path} to {output_file}")
+    return output_file, count
+
+
+def extract_files(files, output_folder, types, start=None, end=None, decimate=1, workers=None):
+    """
+    Extract from many logs concurrently, one worker process per log.
+
+    Args:
+        files (list[str]): Raw logs to extract from.
+        output_folder (str): Folder of the extracted files.
+        types, start, end, decimate: As for extract_file.
+        workers (int, optional): Number of worker processes. Defaults to all cores.
+
+    Returns:
+        dict: Log path -> (extracted file, sentence count), or None for logs that failed.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    types = list(types)
+    sentence_pattern(types)  # Reject bad filters here rather than once per worker
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Logs with the same name (e.g. "a/dut.txt" and "b/dut.txt.gz") get numbered outputs instead of sharing one
+    seen = {}
+    stamps = {}
+    for path in files:
+        seen[log_name(path)] = seen.get(log_name(path), 0) + 1
+        stamps[path] = timestamp if seen[log_name(path)] == 1 else f"{timestamp}_{seen[log_name(path)]}"
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(extract_file, path, output_folder, types, start, end, decimate, stamps[path]): path
+                   for path in files}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+                logging.info(f"[{done}/{len(files)}] {path}: {results[path][1]} sentences")
+            except (OSError, ValueError) as e:
+                results[path] = None
+                logging.error(f"[{done}/{len(files)}] {path}: extraction failed: {e}")
+    return results
@@ -0,0 +1,105 @@
+# fix_events.py
+import numpy as np
+
+from .fix_store import EpochClock
+
+# Fix states in convergence order, with the GGA quality indicators that map to each
+FIX_STATES = ("No Fix", "Dead Reckoning", "Standalone", "DGPS", "RTK Float", "RTK Fixed")
+NO_FIX, DEAD_RECKONING, STANDALONE, DGPS, RTK_FLOAT, RTK_FIXED = range(len(FIX_STATES))
+_GGA_QUALITY_STATES = {0: NO_FIX, 1: STANDALONE, 2: DGPS, 3: STANDALONE, 4: RTK_FIXED, 5: RTK_FLOAT,
+                       6: DEAD_RECKONING, 7: NO_FIX, 8: NO_FIX}  # 7 = manual input, 8 = simulator
+
+
+def fix_states(gps_qual):
+    """Map GGA quality indicators to FIX_STATES indices (unknown indicators count as no fix)."""
+    lookup = np.full(max(_GGA_QUALITY_STATES) + 1, NO_FIX, dtype=np.int8)
+    for quality, state in _GGA_QUALITY_STATES.items():
+        lookup[quality] = state
+    gps_qual = np.asarray(gps_qual)
+    known = (gps_qual >= 0) & (gps_qual < len(lookup))
+    return np.where(known, lookup[np.clip(gps_qual, 0, len(lookup) - 1)], NO_FIX).astype(np.int8)
+
+
+def _losses(epochs_s, reached):
+    # Epoch indices where a level is lost after having been reached, and the time until it is regained
+    change = np.diff(reached.astype(np.int8))
+    lost = np.flatnonzero(change == -1) + 1
+    regained = np.flatnonzero(change == 1) + 1
+    # Every loss is followed by the next regain, if there is one before the end of the log
+    next_regain = np.searchsorted(regained, lost)
+    durations = np.full(len(lost), np.nan)
+    resolved = next_regain < len(regained)
+    durations[resolved] = epochs_s[regained[next_regain[resolved]]] - epochs_s[lost[resolved]]
+    return lost, durations
+
+
+def detect_fix_events(fixes):
+    """
+    Find time to first fix, convergence times, fix dropouts and re-acquisitions of one device.
+
+    Everything comes out of one vectorised pass over the GGA quality column: the quality is mapped to an
+    ordered fix state (no fix < dead reckoning < standalone < DGPS < RTK float < RTK fixed), state changes
+    are found with np.diff, and dropouts are the falling edges of "state >= level" for the fix and RTK
+    fixed levels. Times are measured from the first epoch of the log, which is the power-on (or
+    cold-start command) in an acceptance test capture.
+
+    Args:
+        fixes (FixStore): GGA fixes of the device, in time order.
+
+    Returns:
+        dict: 'summary' (Metric/Value table of TTFF, convergence and dropout statistics) and 'events'
+        (table of every state transition), or None if no fix has a time.
+    """
+    epochs_ns = fixes.epoch_ns
+    timed = epochs_ns >= 0
+    if not timed.any():
+        return None
+
+    epochs_ns = epochs_ns[timed]
+    states = fix_states(fixes.gps_qual[timed])
+    epochs_s = (epochs_ns - epochs_ns[0]) / 1e9
+
+    # State transitions: every epoch whose state differs from the one before
+    changes = np.flatnonzero(np.diff(states)) + 1
+    if fixes.clock.dated:
+        event_times = EpochClock.to_datetimes(epochs_ns[changes])
+    else:  # Without a date the calendar part would be made up, so only the time of day is shown
+        event_times = [fixes.times[index].replace(tzinfo=None) for index in np.flatnonzero(timed)[changes]]
+    events = {
+        "Time (UTC)": event_times,
+        "Elapsed (s)": epochs_s[changes],
+        "From": [FIX_STATES[state] for state in states[changes - 1]],
+        "To": [FIX_STATES[state] for state in states[changes]],
+    }
+
+    def time_to(level):
+        reached = np.flatnonzero(states >= level)
+        return epochs_s[reached[0]] if len(reached) else np.nan
+
+    has_fix = states >= STANDALONE
+    is_fixed = states == RTK_FIXED
+    fix_lost, reacquisition_s = _losses(epochs_s, has_fix)
+    fixed_lost, refix_s = _losses(epochs_s, is_fixed)
+
+    def stat(values, reducer):
+        values = values[~np.isnan(values)]
+        return reducer(values) if len(values) else np.nan
+
+    rows = {
+        "Time to First Fix (s)": time_to(STANDALONE),
+        "Time to DGPS (s)": time_to(DGPS),
+        "Time to RTK Float (s)": time_to(RTK_FLOAT),
+        "Time to RTK Fixed (s)": time_to(RTK_FIXED),
+        "Fix Dropouts": len(fix_lost),
+        "Mean Re-acquisition Time (s)": stat(reacquisition_s, np.mean),
+        "Max Re-acquisition Time (s)": stat(reacquisition_s, np.max),
+        "RTK Fixed Losses": len(fixed_lost),
+        "Mean RTK Re-fix Time (s)": stat(refix_s, np.mean),
+        "Max RTK Re-fix Time (s)": stat(refix_s, np.max),
+        "Fix Availability (%)": 100.0 * has_fix.mean(),
+        "RTK Fixed Availability (%)": 100.0 * is_fixed.mean(),
+        "State Transitions": len(changes),
+    }
+
+    return {'summary': {"Metric": list(rows), "Value": [float(value) for value in rows.values()]},
+            'events': events}
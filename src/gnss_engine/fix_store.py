@@ -0,0 +1,359 @@
+# fix_store.py
+from array import array
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+DAY_NS = 86_400_000_000_000  # Nanoseconds per day
+_ROLLOVER_NS = DAY_NS // 2  # A time of day this far behind the previous one means midnight was crossed
+_UNIX_EPOCH = date(1970, 1, 1)
+
+
+class EpochClock:
+    """
+    Turns the time of day carried by NMEA sentences into a monotonic epoch timeline.
+
+    GGA and most proprietary sentences only carry the time since UTC midnight, so a 48-72 hour soak
+    test would fold onto a single day. The clock counts midnight rollovers (the time of day jumping
+    back by more than half a day) and, once a sentence with a date is seen (RMC, ZDA), anchors the
+    day count to the calendar. Epochs are int64 nanoseconds: since 1970-01-01 UTC once the date is
+    known, or since midnight of the first day of the log otherwise.
+
+    One clock is shared by the fix and motion stores of a device so both agree on the day count.
+    """
+
+    def __init__(self):
+        self.base_date = None  # UTC date of day 0, once a dated sentence has been seen
+        self.day = 0  # Days since the first epoch of the log
+        self._last_time_ns = None
+
+    def day_of(self, time_ns):
+        """
+        Day index of a time of day, advancing the day count on midnight rollover.
+
+        Args:
+            time_ns (int): Time in nanoseconds since UTC midnight. Negative (unknown) times do not move the clock.
+
+        Returns:
+            int: Days since the first epoch of the log.
+        """
+        if time_ns < 0:
+            return self.day
+        if self._last_time_ns is not None and time_ns < self._last_time_ns - _ROLLOVER_NS:
+            self.day += 1
+        self._last_time_ns = time_ns
+        return self.day
+
+    def set_date(self, utc_date, time_ns=-1):
+        """
+        Anchor the clock to the UTC date of a dated sentence (RMC, ZDA).
+
+        The first date fixes the calendar date of day 0; later dates resynchronise the day count, which
+        also covers sentences logged across midnight before the next GGA.
+
+        Args:
+            utc_date (datetime.date): UTC date of the sentence.
+            time_ns (int): Time of day of the same sentence in nanoseconds, or -1 if unknown.
+        """
+        if utc_date is None:
+            return
+        if self.base_date is None:
+            self.base_date = date.fromordinal(utc_date.toordinal() - self.day)
+        else:
+            self.day = utc_date.toordinal() - self.base_date.toordinal()
+        if time_ns >= 0:
+            self._last_time_ns = time_ns
+
+    def epoch_of(self, time_ns):
+        """Epoch (nanoseconds since midnight of day 0) of a time of day on the current day, or -1 if unknown."""
+        return self.day * DAY_NS + time_ns if time_ns >= 0 else -1
+
+    @property
+    def dated(self):
+        return self.base_date is not None
+
+    @property
+    def base_ns(self):
+        """Epoch of midnight of day 0: nanoseconds since 1970-01-01 once dated, 0 otherwise."""
+        if self.base_date is None:
+            return 0
+        return (self.base_date - _UNIX_EPOCH).days * DAY_NS
+
+    @staticmethod
+    def to_datetimes(epoch_ns):
+        """
+        Convert epoch nanoseconds to naive UTC datetimes for tables and plots (None for unknown epochs).
+
+        Relative (undated) epochs come out on 1970-01-01 plus the day count.
+        """
+        return [datetime.fromtimestamp(value / 1e9, tz=timezone.utc).replace(tzinfo=None) if value >= 0 else None
+                for value in np.asarray(epoch_ns, dtype=np.int64).tolist()]
+
+
+def aligned_epochs(store, reference_store):
+    """
+    Epoch columns of two stores on a common timeline, for joins between devices.
+
+    Absolute (calendar) epochs are used when both clocks are dated. Otherwise both fall back to the
+    relative day count, which lines up logs recorded over the same span starting on the same day.
+
+    Returns:
+        tuple: (epochs of store, epochs of reference_store) as int64 arrays, -1 where unknown.
+    """
+    absolute = store.clock.dated and reference_store.clock.dated
+    return store.timeline_ns(absolute), reference_store.timeline_ns(absolute)
+
+
+class _Timeline:
+    # Epoch accessors shared by FixStore and MotionStore (both keep _epoch_ns relative to day 0 and a clock)
+
+    def timeline_ns(self, absolute=True):
+        """
+        Epoch of every row as int64 nanoseconds, -1 where the time is unknown.
+
+        Args:
+            absolute (bool): Offset by the calendar date when the clock is dated. False gives nanoseconds
+                since midnight of the first day of the log.
+        """
+        epochs = np.array(self._epoch_ns, dtype=np.int64)
+        if absolute and self.clock.dated:
+            epochs[epochs >= 0] += self.clock.base_ns
+        return epochs
+
+    @property
+    def epoch_ns(self):
+        return self.timeline_ns()
+
+    def take(self, indices):
+        """
+        New store with the rows at the given indices (or boolean mask), sharing this store's clock.
+
+        Used to run CEP, statistics and exports on a filtered selection of a session.
+        """
+        subset = type(self)(self.clock)
+        for name, column in vars(self).items():
+            if isinstance(column, array):
+                selected = np.asarray(np.frombuffer(column, dtype=column.typecode)[indices])
+                getattr(subset, name).frombytes(selected.tobytes())
+        return subset
+
+
+class FixStore(_Timeline):
+    """
+    Columnar store of position fixes for one device.
+
+    Fixes are appended one at a time while a log or serial port is being parsed, into compact
+    typed arrays rather than per-fix tuples. Analysis code reads whole columns back as numpy
+    arrays, so CEP, dynamic joins and exports work on vectors instead of Python lists.
+
+    Every fix also gets a monotonic epoch from the store's EpochClock (epoch_ns), so joins, time
+    windows and plots stay correct across midnight.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else EpochClock()
+        self.times = []  # datetime.time of each fix, kept for tables
+        self._time_of_day_ns = array('q')  # Fix time as nanoseconds since UTC midnight
+        self._epoch_ns = array('q')  # Fix time as nanoseconds since midnight of day 0 (-1 if unknown)
+        self._latitude = array('d')
+        self._longitude = array('d')
+        self._altitude = array('d')
+        self._gps_qual = array('h')
+        self._num_sats = array('h')
+        self._hdop = array('d')
+
+    def __len__(self):
+        return len(self._latitude)
+
+    def append(self, fix_time, lat, lon, alt=None, gps_qual=None, num_sats=None, hdop=None):
+        """
+        Append a single fix to the store.
+
+        Args:
+            fix_time (datetime.time): UTC time of the fix.
+            lat (float): Latitude in decimal degrees.
+            lon (float): Longitude in decimal degrees.
+            alt (float, optional): Altitude above mean sea level in meters.
+            gps_qual (int, optional): GGA fix quality indicator.
+            num_sats (int, optional): Number of satellites in use.
+            hdop (float, optional): Horizontal dilution of precision.
+        """
+        time_ns = self.time_to_ns(fix_time)
+        self.clock.day_of(time_ns)
+        self.times.append(fix_time)
+        self._time_of_day_ns.append(time_ns)
+        self._epoch_ns.append(self.clock.epoch_of(time_ns))
+        self._latitude.append(float(lat))
+        self._longitude.append(float(lon))
+        self._altitude.append(self._to_float(alt))
+        self._gps_qual.append(self._to_int(gps_qual))
+        self._num_sats.append(self._to_int(num_sats))
+        self._hdop.append(self._to_float(hdop))
+
+    def take(self, indices):
+        subset = super().take(indices)
+        subset.times = [self.times[i] for i in np.arange(len(self))[indices]]
+        return subset
+
+    def clear(self):
+        """Remove all stored fixes and start over with a fresh clock."""
+        self.__init__()
+
+    @staticmethod
+    def time_to_ns(fix_time):
+        """
+        Convert a fix time to nanoseconds since midnight, or -1 if unavailable.
+
+        Accepts a datetime.time (standard sentences) or an "hhmmss.sss" string (PQTM sentences).
+        """
+        if fix_time is None:
+            return -1
+        if isinstance(fix_time, str):
+            try:
+                seconds = float(fix_time[6:]) if len(fix_time) > 6 else 0.0
+                return ((int(fix_time[0:2]) * 3600 + int(fix_time[2:4]) * 60) * 1_000_000_000
+                        + round(seconds * 1_000_000_000))
+            except ValueError:
+                return -1
+        return ((fix_time.hour * 3600 + fix_time.minute * 60 + fix_time.second) * 1_000_000
+                + fix_time.microsecond) * 1000
+
+    @staticmethod
+    def _to_float(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def _to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return -1
+
+    # Column accessors. These return copies so appends can continue while results are held.
+    @property
+    def time_of_day_ns(self):
+        return np.array(self._time_of_day_ns, dtype=np.int64)
+
+    @property
+    def latitude(self):
+        return np.array(self._latitude, dtype=np.float64)
+
+    @property
+    def longitude(self):
+        return np.array(self._longitude, dtype=np.float64)
+
+    @property
+    def altitude(self):
+        return np.array(self._altitude, dtype=np.float64)
+
+    @property
+    def gps_qual(self):
+        return np.array(self._gps_qual, dtype=np.int16)
+
+    @property
+    def num_sats(self):
+        return np.array(self._num_sats, dtype=np.int16)
+
+    @property
+    def hdop(self):
+        return np.array(self._hdop, dtype=np.float64)
+
+    def tail(self, start):
+        """
+        Epochs and positions of the fixes from index start on, safe to call while another thread appends.
+
+        The columns are sliced (a copy made while holding the GIL) rather than exported to numpy, since an
+        array that is exporting its buffer cannot grow. Only fixes present in every column are returned.
+
+        Args:
+            start (int): Index of the first fix.
+
+        Returns:
+            tuple: (epoch_ns, latitude, longitude) arrays; epochs are relative to day 0, -1 where unknown.
+        """
+        end = len(self._hdop)  # Appended last, so every column holds at least the fixes before end
+        return (np.array(self._epoch_ns[start:end], dtype=np.int64),
+                np.array(self._latitude[start:end], dtype=np.float64),
+                np.array(self._longitude[start:end], dtype=np.float64))
+
+    def valid_mask(self):
+        """Boolean mask of fixes with a usable (non-zero) position."""
+        return (self.latitude != 0) & (self.longitude != 0)
+
+    def as_tuples(self):
+        """Return the fixes as (lat, lon, timestamp) tuples."""
+        return list(zip(self._latitude, self._longitude, self.times))
+
+
+class MotionStore(_Timeline):
+    """
+    Columnar store of per-epoch motion data (speed, course and heading) for one device.
+
+    Several sentences describe the same epoch (RMC, VTG, PQTMPVT, PQTMVEL, PQTMVEHATT, ...). Their values
+    are merged into one row per epoch; the first sentence to provide a value for an epoch wins.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else EpochClock()
+        self._time_of_day_ns = array('q')  # Epoch time as nanoseconds since UTC midnight
+        self._epoch_ns = array('q')  # Epoch time as nanoseconds since midnight of day 0
+        self._speed = array('d')  # Speed over ground in m/s
+        self._course = array('d')  # Course over ground in degrees
+        self._heading = array('d')  # Vehicle/antenna heading in degrees
+
+    def __len__(self):
+        return len(self._time_of_day_ns)
+
+    def update(self, time_ns, speed=None, course=None, heading=None):
+        """
+        Add motion values to the row of an epoch, creating the row if it is a new epoch.
+
+        Args:
+            time_ns (int): Epoch time in nanoseconds since midnight. Ignored if negative (unknown).
+            speed (float, optional): Speed over ground in m/s.
+            course (float, optional): Course over ground in degrees.
+            heading (float, optional): Heading in degrees.
+        """
+        if time_ns < 0:
+            return
+
+        self.clock.day_of(time_ns)
+        epoch_ns = self.clock.epoch_of(time_ns)
+        values = ((self._speed, FixStore._to_float(speed)),
+                  (self._course, FixStore._to_float(course)),
+                  (self._heading, FixStore._to_float(heading)))
+
+        if len(self) and self._epoch_ns[-1] == epoch_ns:
+            # Same epoch as the last row: only fill the columns that are still empty
+            for column, value in values:
+                if np.isnan(column[-1]):
+                    column[-1] = value
+            return
+
+        self._time_of_day_ns.append(time_ns)
+        self._epoch_ns.append(epoch_ns)
+        for column, value in values:
+            column.append(value)
+
+    def clear(self):
+        """Remove all stored epochs and start over with a fresh clock."""
+        self.__init__()
+
+    @property
+    def time_of_day_ns(self):
+        return np.array(self._time_of_day_ns, dtype=np.int64)
+
+    @property
+    def speed(self):
+        return np.array(self._speed, dtype=np.float64)
+
+    @property
+    def course(self):
+        return np.array(self._course, dtype=np.float64)
+
+    @property
+    def heading(self):
+        return np.array(self._heading, dtype=np.float64)
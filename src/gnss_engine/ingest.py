@@ -0,0 +1,405 @@
+# ingest.py
+import bz2
+import csv
+import gzip
+import io
+import logging
+import lzma
+import os
+import queue
+import threading
+
+import pynmea2
+
+from .nmea_data import NMEAData
+from .profiling import count, stage
+from .validate import SentenceValidator
+
+LOG_EXTENSIONS = ('.txt', '.log', '.nmea', '.csv', '.xlsx')
+COMPRESSED_LOG_EXTENSIONS = ('.gz', '.zst', '.xz', '.bz2')
+SUPPORTED_LOG_EXTENSIONS = LOG_EXTENSIONS + tuple(extension + compressed for extension in LOG_EXTENSIONS
+                                                  for compressed in COMPRESSED_LOG_EXTENSIONS)
+READ_AHEAD_BYTES = 1 << 20  # Size of the decompressed blocks handed from the decompression thread to the parser
+READ_AHEAD_BLOCKS = 8  # Decompressed blocks buffered ahead of the parser
+
+
+def notify(message, on_message=None, level=logging.INFO):
+    """
+    Log a message and forward it to an optional front-end callback (e.g. a GUI console tab).
+
+    Args:
+        message (str): Message to report.
+        on_message (callable, optional): Called with the message after it has been logged.
+        level (int): Logging level used for the message.
+    """
+    with stage('logging'):
+        logging.log(level, message)
+    if on_message:
+        with stage('console updates'):
+            on_message(message)
+
+
+def split_compression(file_path):
+    """
+    Split the compression suffix off a log path.
+
+    Returns:
+        tuple: (path without the compression suffix, suffix such as '.gz', or None if not compressed)
+    """
+    stem, extension = os.path.splitext(file_path)
+    if extension.lower() in COMPRESSED_LOG_EXTENSIONS:
+        return stem, extension.lower()
+    return file_path, None
+
+
+def log_name(file_path):
+    """Name of a log for output files: the file name without its extension and compression suffix."""
+    return os.path.splitext(os.path.basename(split_compression(file_path)[0]))[0]
+
+
+class _ReadAheadReader(io.RawIOBase):
+    """
+    Binary stream that decompresses in a background thread, a few blocks ahead of the reader.
+
+    zlib, lzma, bz2 and zstd release the GIL while they decompress, so decompressing the next blocks
+    overlaps with parsing the current one instead of alternating with it.
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self._blocks = queue.Queue(maxsize=READ_AHEAD_BLOCKS)
+        self._block = b''
+        self._offset = 0
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._decompress, name="log decompression", daemon=True)
+        self._thread.start()
+
+    def _decompress(self):
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(READ_AHEAD_BYTES)
+                self._blocks.put(block)
+                if not block:
+                    break
+        except Exception as e:  # Handed to the reading thread, which reports it
+            self._error = e
+            self._blocks.put(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._block is None:  # End of stream reached
+            return 0
+        if self._offset >= len(self._block):
+            block = self._blocks.get()
+            if not block:
+                self._block = None
+                if self._error:
+                    raise self._error
+                return 0
+            self._block, self._offset = block, 0
+
+        count = min(len(buffer), len(self._block) - self._offset)
+        buffer[:count] = self._block[self._offset:self._offset + count]
+        self._offset += count
+        return count
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            while self._thread.is_alive():  # Unblock the thread if it waits on a full queue
+                try:
+                    self._blocks.get_nowait()
+                except queue.Empty:
+                    self._thread.join(0.01)
+            self._source.close()
+        super().close()
+
+
+def open_log_file(file_path):
+    """
+    Open a log file for binary reading, decompressing .gz/.zst/.xz/.bz2 archives on the fly.
+
+    Compressed logs are streamed: nothing is decompressed to disk and only a few blocks are held in
+    memory. zstd archives need the optional 'zstandard' package.
+
+    Returns:
+        io.BufferedReader: Binary stream of the (decompressed) log.
+    """
+    compression = split_compression(file_path)[1]
+    if compression is None:
+        return open(file_path, 'rb')
+
+    if compression == '.gz':
+        source = gzip.open(file_path, 'rb')
+    elif compression == '.xz':
+        source = lzma.open(file_path, 'rb')
+    elif compression == '.bz2':
+        source = bz2.open(file_path, 'rb')
+    else:
+        try:
+            import zstandard  # Optional dependency, only needed for .zst logs
+        except ImportError:
+            raise ValueError(f"Reading {file_path} needs the 'zstandard' package for .zst decompression.")
+        source = zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+
+    return io.BufferedReader(_ReadAheadReader(source), READ_AHEAD_BYTES)
+
+
+def _stream_lines(file_path, on_message=None):
+    # Lines of a compressed text log, decoded as they are decompressed; the count is reported at the end
+    count = 0
+    with io.TextIOWrapper(open_log_file(file_path), encoding='utf-8', errors='surrogateescape') as f:
+        for line in f:
+            count += 1
+            yield line
+    notify(f"Total lines read from compressed file: {count}", on_message)
+
+
+def _stream_csv_lines(file_path, on_message=None):
+    # First column of every CSV row, one row at a time; blank rows become empty lines like blank text lines
+    count = 0
+    with io.TextIOWrapper(open_log_file(file_path), encoding='utf-8', errors='surrogateescape',
+                          newline='') as f:
+        for row in csv.reader(f):
+            count += 1
+            yield row[0] if row else ''
+    notify(f"Total lines read from CSV: {count}", on_message)
+
+
+def _stream_xlsx_lines(file_path, on_message=None):
+    # Column A of the first sheet, one row at a time from the sheet XML (read-only mode never loads the grid)
+    import openpyxl  # Deferred: only Excel inputs need openpyxl
+
+    _, compression = split_compression(file_path)
+    if compression:
+        # An .xlsx is a zip archive and needs random access; it is already compressed, so this copy is small
+        with open_log_file(file_path) as f:
+            source = io.BytesIO(f.read())
+    else:
+        source = file_path
+
+    count = 0
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for (value,) in workbook.worksheets[0].iter_rows(min_col=1, max_col=1, values_only=True):
+            count += 1
+            yield '' if value is None else str(value)
+    finally:
+        workbook.close()
+    notify(f"Total lines read from Excel: {count}", on_message)
+
+
+def read_log_lines(file_path, on_message=None):
+    """
+    Read the raw lines of a log file in .txt, .log, .nmea, .csv, or Excel format.
+
+    Any of these can also be compressed (.gz, .zst, .xz, .bz2). Compressed text logs, CSV and Excel files
+    are read while they are parsed (the first column of CSV/Excel rows holds the sentence), so the
+    returned lines are then an iterator instead of a list and memory use does not grow with the log.
+
+    Args:
+        file_path (str): Path to the log file.
+        on_message (callable, optional): Callback receiving progress messages.
+
+    Returns:
+        list | iterator: Raw lines of the log file.
+    """
+    inner_path, compression = split_compression(file_path)
+
+    if compression and inner_path.endswith(('.txt', '.log', '.nmea')):
+        notify(f"Streaming compressed log file: {file_path}", on_message)
+        lines = _stream_lines(file_path, on_message)
+
+    elif inner_path.endswith(('.txt', '.log', '.nmea')):
+        # Undecodable bytes are kept (surrogateescape) so the validator can reject and quarantine them as-is
+        with open(file_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            lines = f.readlines()
+        notify(f"Total lines read from file: {len(lines)}", on_message)
+
+    elif inner_path.endswith('.csv'):
+        notify(f"Streaming CSV log file: {file_path}", on_message)
+        lines = _stream_csv_lines(file_path, on_message)
+
+    elif inner_path.endswith('.xlsx'):
+        notify(f"Streaming Excel log file: {file_path}", on_message)
+        lines = _stream_xlsx_lines(file_path, on_message)
+
+    else:
+        notify(f"Unsupported file type: {file_path}", on_message, logging.ERROR)
+        raise ValueError("Unsupported file type. Supported formats: .txt, .log, .nmea, .csv, .xlsx "
+                         "(optionally compressed as .gz, .zst, .xz or .bz2)")
+
+    return lines
+
+
+def parse_sentence(nmea_sentence, nmea_data, on_message=None):
+    """
+    Parse a single NMEA sentence and add its content to the NMEAData accumulator.
+
+    Proprietary ($PQTM) and standard ($G*) sentences are parsed; anything else is reported as unknown.
+    Parse failures are logged and reported, never raised.
+
+    Args:
+        nmea_sentence (str): Stripped NMEA sentence.
+        nmea_data (NMEAData): Accumulator receiving parsed rows and fixes.
+        on_message (callable, optional): Callback receiving per-sentence messages.
+
+    Returns:
+        bool: True if the sentence was parsed and stored.
+    """
+    if nmea_sentence.startswith('$PQTM'):
+        notify(f"Proprietary NMEA Message: {nmea_sentence}", on_message)
+        failure = "Failed to parse proprietary NMEA sentence"
+    elif nmea_sentence.startswith('$G'):
+        notify(f"Standard NMEA Message: {nmea_sentence}", on_message)
+        failure = "Failed to parse NMEA sentence"
+    else:
+        notify(f"Unknown Message: {nmea_sentence}", on_message)
+        count('unknown sentences')
+        return False
+
+    try:
+        with stage('pynmea2.parse'):
+            msg = pynmea2.parse(nmea_sentence)
+        if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
+            raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence", msg)
+
+        nmea_data.sentence_type = msg.sentence_type
+        nmea_data.data = msg
+        with stage('add_sentence_data'):
+            nmea_data.add_sentence_data()
+        with stage('fix and motion stores'):
+            nmea_data.add_coordinates()
+            nmea_data.add_motion()
+        with stage('logging'):
+            logging.info(nmea_data)
+        if on_message:
+            with stage('console updates'):
+                on_message(nmea_data)
+        count('sentences parsed')
+        return True
+    except pynmea2.ParseError as e:
+        notify(f"{failure}: {nmea_sentence} - {e}", on_message, logging.WARNING)
+        count('parse errors')
+        return False
+
+
+def report_line_integrity(validator, nmea_data, on_message=None):
+    """
+    Store the corrupt-line accounting of a device in its NMEAData and report its corruption rate.
+
+    Args:
+        validator (SentenceValidator): Validator that checked every line of the device.
+        nmea_data (NMEAData): Accumulator of the device; receives the summary as line_integrity.
+        on_message (callable, optional): Callback receiving the report line.
+    """
+    validator.close()
+    nmea_data.line_integrity = validator.summary()
+    notify(f"Line integrity of {validator.name}: {validator.describe()}", on_message,
+           logging.WARNING if validator.corrupt else logging.INFO)
+
+
+def report_filtered_lines(sentence_filter, skipped, name, on_message=None):
+    """
+    Report how many lines a sentence filter skipped for a log or port.
+
+    Args:
+        sentence_filter (SentenceFilter): Filter that was applied.
+        skipped (int): Number of lines it skipped.
+        name (str): Log or port the lines came from.
+        on_message (callable, optional): Callback receiving the report line.
+    """
+    notify(f"Sentence filter ({sentence_filter.describe()}) skipped {skipped} lines of {name}.", on_message)
+    count('filtered lines', skipped)
+
+
+def parse_nmea_lines(lines, name, on_message=None, stop_event=None, quarantine_path=None, sentence_filter=None,
+                     first_day=0):
+    """
+    Validate and parse a stream of raw lines, such as the lines of a log or the output of the extractor.
+
+    Lines are consumed one at a time, so a generator (e.g. extract.scan_sentences) is parsed in the same
+    pass that produces it, without an intermediate file or list. Every line is pre-validated (framing and
+    checksum) first; corrupt lines are counted, optionally written to a quarantine file, and never reach
+    the parser. With a sentence_filter, unwanted sentence types are skipped before even that.
+
+    Args:
+        lines (iterable[str | bytes]): Raw lines, with or without line endings.
+        name (str): Name of the source in messages and the line integrity report.
+        on_message (callable, optional): Callback receiving progress and per-sentence messages.
+        stop_event (threading.Event, optional): Event to signal parsing to stop early.
+        quarantine_path (str, optional): File receiving the rejected lines.
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip.
+        first_day (int): Day count of the first line, for lines starting past a midnight of their log (see
+            extract.scan_window), so the epochs stay on the timeline of the whole log.
+
+    Returns:
+        tuple: A list of parsed sentences and an NMEAData object.
+    """
+    parsed_sentences = []
+    nmea_data = NMEAData(None, None, parsed_sentences)
+    nmea_data.clock.day = first_day
+    validator = SentenceValidator(os.path.basename(name), quarantine_path)
+    accepts = sentence_filter.accepts if sentence_filter is not None else None
+    skipped = 0
+
+    try:
+        # Process each line of the source
+        for nmea_sentence in lines:
+            if stop_event and stop_event.is_set():  # Check if stop_event is set
+                notify(f"Stop signal received. Ending file processing for {name}.", on_message)
+                break
+
+            if accepts is not None and not accepts(nmea_sentence):
+                skipped += 1
+                continue
+            if not validator.check(nmea_sentence):
+                continue
+
+            if isinstance(nmea_sentence, bytes):  # Validated lines are printable ASCII
+                nmea_sentence = nmea_sentence.decode('ascii')
+            nmea_sentence = nmea_sentence.strip()
+            logging.debug(f"Processing sentence: {nmea_sentence}")
+            parse_sentence(nmea_sentence, nmea_data, on_message)
+
+    except Exception as e:
+        notify(f"Failed to read or process file: {name}. Error: {e}", on_message, logging.ERROR)
+
+    report_line_integrity(validator, nmea_data, on_message)
+    if sentence_filter is not None:
+        report_filtered_lines(sentence_filter, skipped, name, on_message)
+    count('lines read', validator.lines + skipped)
+    count('corrupt lines', validator.corrupt)
+
+    notify(f"Total parsed sentences: {len(parsed_sentences)}", on_message)
+    return parsed_sentences, nmea_data
+
+
+def parse_nmea_from_log(file_path, on_message=None, stop_event=None, quarantine_path=None, sentence_filter=None):
+    """
+    Reads a log file in .txt, .log, .nmea, .csv, or Excel format (optionally compressed) and parses valid
+    NMEA sentences (see parse_nmea_lines).
+
+    Args:
+        file_path (str): Path to the log file to be parsed.
+        on_message (callable, optional): Callback receiving progress and per-sentence messages.
+        stop_event (threading.Event, optional): Event to signal parsing to stop early.
+        quarantine_path (str, optional): File receiving the rejected lines.
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip.
+
+    Returns:
+        tuple: A list of parsed sentences and an NMEAData object.
+    """
+    notify(f"Processing log file: {file_path}", on_message)
+
+    with stage('parse_nmea_from_log'):
+        try:
+            lines = read_log_lines(file_path, on_message)
+        except Exception as e:
+            notify(f"Failed to read or process file: {file_path}. Error: {e}", on_message, logging.ERROR)
+            lines = ()
+
+        return parse_nmea_lines(lines, file_path, on_message, stop_event, quarantine_path, sentence_filter)
@@ -0,0 +1,138 @@
+# live.py
+import logging
+import os
+from time import time, time_ns
+
+import serial
+
+from .capture import RawCaptureWriter
+from .ingest import notify, parse_sentence, report_filtered_lines, report_line_integrity
+from .metrics import DeviceMetrics
+from .nmea_data import NMEAData
+from .validate import SentenceValidator
+
+
+def read_serial_nmea(port, baudrate, timeout, duration, log_folder, timestamp, stop_event=None, on_message=None,
+                     capture=None, metrics=None, nmea_data=None, sentence_filter=None):
+    """
+    Reads live NMEA data from a serial port, writes the raw log and parses every sentence.
+
+    The raw log is a byte-exact capture of the port with receive timestamps (see RawCaptureWriter).
+
+    Lines are pre-validated (framing and checksum) before parsing; corrupt lines go to a quarantine file
+    next to the raw log and the corruption rate of the port is reported when the capture ends. With a
+    sentence_filter, unwanted sentence types are still captured raw but skipped before validation and parsing.
+
+    Args:
+        port (str): Serial port to read from (e.g., "COM3").
+        baudrate (int): Baud rate for serial communication.
+        timeout (float): Timeout for serial port reads (in seconds).
+        duration (float): Duration to read data (in seconds).
+        log_folder (str): Directory to save log files.
+        timestamp (str): Timestamp to append to file names.
+        stop_event (threading.Event, optional): Event to signal the function to stop.
+        on_message (callable, optional): Callback receiving progress and per-sentence messages.
+        capture (dict, optional): RawCaptureWriter options (rotate_bytes, rotate_seconds, compression, ...).
+        metrics (LiveMetrics, optional): Live metrics surface receiving the counters of this device.
+        nmea_data (NMEAData, optional): Accumulator to parse into, for callers that read its fix store while
+            the capture runs (see live_dynamic). A new one is created by default.
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip.
+
+    Returns:
+        NMEAData: Accumulated data, or None if the log file or serial port could not be opened.
+    """
+    start_time = time()
+    if nmea_data is None:
+        nmea_data = NMEAData(None, None, [])
+
+    # Ensure log folder exists
+    os.makedirs(log_folder, exist_ok=True)
+
+    safe_port = port.replace("/", "_")
+    validator = SentenceValidator(f"port {port}", os.path.join(
+        log_folder, f"nmea_quarantine_mode_1_{safe_port}_{baudrate}_{timestamp}.txt"))
+
+    # Open raw NMEA capture
+    raw_nmea_log_path = os.path.join(log_folder, f"nmea_raw_log_mode_1_{safe_port}_{baudrate}_{timestamp}.txt")
+    try:
+        raw_nmea_log = RawCaptureWriter(raw_nmea_log_path, **(capture or {}))
+    except Exception as e:
+        notify(f"Error opening log file {raw_nmea_log_path}: {e}", on_message, logging.ERROR)
+        return None
+
+    accepts = sentence_filter.accepts if sentence_filter is not None else None
+    skipped = 0
+
+    # Counters of the live metrics (see metrics.LiveMetrics). Without metrics they go to a detached DeviceMetrics
+    # nobody samples, so the loop has a single body and pays only a few attribute increments per line
+    device_metrics = metrics.device(port, baudrate) if metrics is not None else DeviceMetrics(port, baudrate)
+    device_metrics.fixes = nmea_data.fixes
+    device_metrics.up = 1
+
+    try:
+        # Attempt to configure and open the serial port
+        try:
+            ser = serial.Serial(
+                port=port,
+                baudrate=baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=timeout
+            )
+            notify(f"Connected to serial port {port} with baudrate {baudrate}.", on_message)
+        except serial.SerialException as e:
+            notify(f"Error opening serial port {port}: {e}", on_message, logging.ERROR)
+            return None  # Exit function if serial port cannot be opened
+
+        try:
+            # Continuously read from serial port until duration expires or stop_event is set
+            while time() - start_time < duration:
+                if stop_event and stop_event.is_set():  # Check if stop_event is set
+                    notify(f"Stop signal received. Ending data collection on {port}.", on_message)
+                    break
+
+                try:
+                    raw_line = ser.readline()
+                    receive_time_ns = time_ns()
+                except serial.SerialException as e:
+                    notify(f"Error reading from serial port: {e}", on_message, logging.ERROR)
+                    break
+
+                try:  # Empty reads too: on a quiet port, they are what flushes the buffered capture
+                    raw_nmea_log.write(raw_line, receive_time_ns)
+                except Exception as e:
+                    logging.error(f"Error writing NMEA sentence to log file: {e}")
+
+                if raw_line:  # An empty read is a timeout, not a line
+                    device_metrics.lines += 1
+                    device_metrics.bytes += len(raw_line)
+                    device_metrics.last_line_ns = receive_time_ns
+                    if accepts is not None and not accepts(raw_line):
+                        skipped += 1
+                    elif not validator.check(raw_line):
+                        device_metrics.corrupt_lines += 1
+                    elif parse_sentence(raw_line.decode('ascii').strip(), nmea_data, on_message):
+                        device_metrics.sentences += 1
+                    else:
+                        device_metrics.parse_errors += 1
+                if metrics is not None and receive_time_ns >= device_metrics.next_queue_sample_ns:
+                    device_metrics.queue_bytes = ser.in_waiting
+                    device_metrics.next_queue_sample_ns = receive_time_ns + 1_000_000_000
+        finally:
+            ser.close()
+
+    except Exception as e:
+        notify(f"Unexpected error during serial read: {e}", on_message, logging.ERROR)
+
+    finally:
+        device_metrics.up = 0
+        # Ensure the capture is flushed and closed properly (waits for pending segment compression)
+        raw_nmea_log.close()
+        notify(f"Log file {raw_nmea_log_path} closed: {raw_nmea_log.lines_written} lines, "
+               f"{raw_nmea_log.bytes_written} bytes in {len(raw_nmea_log.segments)} segment(s).", on_message)
+        report_line_integrity(validator, nmea_data, on_message)
+        if sentence_filter is not None:
+            report_filtered_lines(sentence_filter, skipped, f"port {port}", on_message)
+
+    return nmea_data
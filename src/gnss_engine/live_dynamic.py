@@ -0,0 +1,427 @@
+# live_dynamic.py
+import json
+import logging
+import math
+import os
+import threading
+from array import array
+from collections import deque
+from time import monotonic, sleep
+
+import numpy as np
+
+from .capture import capture_from_environment
+from .ingest import notify
+from .live import read_serial_nmea
+from .metrics import LiveMetrics, metrics_from_environment
+from .nmea_data import NMEAData
+from .pipeline import analyze_dynamic, report_satellite_statistics
+from .projection import geodetic_to_enu, horizontal_error
+from .rolling import SlidingQuantile
+from .validate import SentenceFilter
+
+CEP_PERCENTILES = (50, 68, 90, 95, 99)
+DEFAULT_BAUDRATE = 115200
+DEFAULT_TIMEOUT_S = 1.0
+DEFAULT_REPORT_INTERVAL_S = 10.0  # Progress line with the running CEP of every DUT
+DEFAULT_MAX_LAG_S = 5.0  # DUT epochs the reference is this far behind on are scored as unmatched
+DEFAULT_CEP_WINDOW = 600  # "Current" CEP: over the last 600 matched epochs
+UPDATE_INTERVAL_S = 1.0  # Matching pass over the fixes that arrived since the previous one
+HISTOGRAM_RESOLUTION_M = 0.001
+HISTOGRAM_RANGE_M = 100.0  # Errors beyond are kept as they are (rare)
+
+
+def _device_config(device, role):
+    # Check one device entry of the config and fill in its defaults
+    if not isinstance(device, dict) or not device.get('port'):
+        raise ValueError(f"Every {role} needs a serial port ('port').")
+    try:
+        baudrate = int(device.get('baudrate', DEFAULT_BAUDRATE))
+        timeout = float(device.get('timeout', DEFAULT_TIMEOUT_S))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid baudrate or timeout for {role} {device['port']}.") from None
+    return {'port': str(device['port']), 'baudrate': baudrate, 'timeout': timeout,
+            'name': str(device.get('name') or device['port'])}
+
+
+def load_live_config(path):
+    """
+    Load and check the config file of a headless dynamic live run.
+
+    The file is JSON (see example/dynamic_live_config.json): a 'reference' device and a list of 'devices'
+    under test, each with 'port', 'baudrate', 'timeout' and an optional 'name', plus the run options
+    'duration' (seconds, until stopped if omitted), 'report_interval', 'cep_window', 'max_lag',
+    'latency_correction', 'rolling_window' (seconds), 'capture' (RawCaptureWriter options; the
+    GNSS_CAPTURE_* environment variables without it, see capture_from_environment),
+    'metrics' ({"port": ..., "file": ...}, see LiveMetrics) and 'include_types' / 'exclude_types'
+    (sentence filters of the devices under test, see SentenceFilter; the reference is always parsed in full).
+
+    Args:
+        path (str): Path of the config file.
+
+    Returns:
+        dict: The config with defaults filled in.
+
+    Raises:
+        ValueError: If the file is not valid JSON or the config is incomplete or inconsistent.
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} is not valid JSON: {e}") from None
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must hold a JSON object.")
+
+    devices = config.get('devices')
+    if not isinstance(devices, list) or not devices:
+        raise ValueError("The config needs at least one device under test ('devices').")
+    reference = _device_config(config.get('reference'), 'reference')
+    devices = [_device_config(device, 'device') for device in devices]
+    ports = [reference['port']] + [device['port'] for device in devices]
+    if len(set(ports)) != len(ports):
+        raise ValueError("Every device needs its own serial port.")
+    names = [device['name'] for device in devices]
+    if len(set(names)) != len(names):
+        raise ValueError("Device names must be unique.")
+
+    try:
+        options = {
+            'duration': float(config.get('duration') or math.inf),
+            'report_interval': float(config.get('report_interval', DEFAULT_REPORT_INTERVAL_S)),
+            'cep_window': int(config.get('cep_window', DEFAULT_CEP_WINDOW)),
+            'max_lag': float(config.get('max_lag', DEFAULT_MAX_LAG_S)),
+            'rolling_window': float(config['rolling_window']) if config.get('rolling_window') else None,
+        }
+    except (TypeError, ValueError):
+        raise ValueError("duration, report_interval, cep_window, max_lag and rolling_window must be numbers.") from None
+    if min(options['duration'], options['report_interval'], options['cep_window'], options['max_lag'],
+           options['rolling_window'] or 1) <= 0:
+        raise ValueError("duration, report_interval, cep_window, max_lag and rolling_window must be positive.")
+    for key in ('capture', 'metrics'):
+        if config.get(key) is not None and not isinstance(config[key], dict):
+            raise ValueError(f"'{key}' must be a JSON object.")
+    include, exclude = config.get('include_types') or [], config.get('exclude_types') or []
+    if not isinstance(include, list) or not isinstance(exclude, list):
+        raise ValueError("'include_types' and 'exclude_types' must be lists of sentence filters.")
+
+    return {'reference': reference, 'devices': devices, **options,
+            'latency_correction': bool(config.get('latency_correction', False)),
+            'capture': config.get('capture') or capture_from_environment(), 'metrics': config.get('metrics') or None,
+            'sentence_filter': SentenceFilter(include, exclude) if include or exclude else None}
+
+
+class StreamingCEP:
+    """
+    CEP percentiles of an unbounded stream of horizontal errors, in constant memory.
+
+    Errors are counted in 1 mm bins up to 100 m; the rare errors beyond are kept as they are. Adding a
+    batch is a single np.add.at and a percentile is read from the cumulative counts (nearest rank), so a
+    report costs the same after a minute or a week, where np.percentile over all errors would re-sort a
+    growing array every time. Percentiles are exact to the bin width.
+    """
+
+    def __init__(self, resolution_m=HISTOGRAM_RESOLUTION_M, range_m=HISTOGRAM_RANGE_M):
+        self.resolution_m = resolution_m
+        self.counts = np.zeros(int(round(range_m / resolution_m)), dtype=np.int64)
+        self.outliers = array('d')  # Errors beyond range_m
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, errors):
+        """Add an array of horizontal errors in meters."""
+        bins = (np.asarray(errors, dtype=np.float64) / self.resolution_m).astype(np.int64)
+        inside = bins < len(self.counts)
+        np.add.at(self.counts, bins[inside], 1)
+        self.outliers.extend(np.asarray(errors)[~inside].tolist())
+        self.count += len(bins)
+
+    def percentiles(self, percentiles=CEP_PERCENTILES):
+        """
+        CEP of the errors added so far.
+
+        Returns:
+            dict: 'CEP50', 'CEP68', ... in meters (NaN before the first error).
+        """
+        if not self.count:
+            return {f"CEP{p}": np.nan for p in percentiles}
+        cumulative = np.cumsum(self.counts)
+        outliers = sorted(self.outliers) if self.outliers else []
+        values = {}
+        for p in percentiles:
+            rank = max(math.ceil(p / 100.0 * self.count), 1)  # 1-based nearest rank
+            if rank <= cumulative[-1]:
+                values[f"CEP{p}"] = (int(np.searchsorted(cumulative, rank)) + 0.5) * self.resolution_m
+            else:
+                values[f"CEP{p}"] = outliers[rank - int(cumulative[-1]) - 1]
+        return values
+
+
+class _DeviceScore:
+    # Running dynamic CEP of one device under test
+
+    def __init__(self, name, fixes, cep_window, device_metrics=None):
+        self.name = name
+        self.fixes = fixes
+        self.device_metrics = device_metrics  # DeviceMetrics receiving the current CEP, or None
+        self.cursor = 0  # First fix not scored yet
+        self.last_epoch_ns = -1  # Epoch of the last fix scored
+        self.matched = 0
+        self.unmatched = 0
+        self.cep = StreamingCEP()
+        self.cep_window = cep_window
+        self.window = SlidingQuantile()  # Errors of the last cep_window matched epochs
+        self._recent = deque()
+
+    def add(self, errors):
+        self.cep.add(errors)
+        for error in errors.tolist():
+            self.window.add(error)
+            self._recent.append(error)
+            if len(self._recent) > self.cep_window:
+                self.window.remove(self._recent.popleft())
+        if self.device_metrics is not None:
+            self.device_metrics.dynamic_cep = (self.window.percentile(50), self.window.percentile(95))
+
+    def summary(self):
+        return {'name': self.name, 'matched_epochs': self.matched, 'unmatched_epochs': self.unmatched,
+                **self.cep.percentiles(),
+                'current_CEP50': self.window.percentile(50), 'current_CEP95': self.window.percentile(95)}
+
+
+class StreamingDynamicCEP:
+    """
+    Epoch by epoch scoring of live devices against a live moving reference, while the fixes arrive.
+
+    Every update() takes the fixes appended since the previous one (FixStore.tail): the reference's go
+    into a buffer keyed by epoch, each DUT's are matched against it and their horizontal errors (ENU about
+    the reference position of the same epoch, like calculate_dynamic_cep) are added to the running CEP
+    of the DUT. Epochs are matched on the relative epoch of each store, as aligned_epochs does for undated
+    logs, so receivers started on the same UTC day line up.
+
+    A DUT epoch waits while the reference has not got that far. It is counted as unmatched once the
+    reference is past it without having it (e.g. a 10 Hz DUT against a 1 Hz reference), or once the DUT
+    is max_lag_s ahead of it while the reference still has not delivered. Reference epochs every DUT is
+    past are dropped, so memory stays flat over runs of days.
+
+    Only the thread calling update() uses this object; the capture threads only append to the stores.
+    """
+
+    def __init__(self, reference_fixes, max_lag_s=DEFAULT_MAX_LAG_S, cep_window=DEFAULT_CEP_WINDOW):
+        self.reference_fixes = reference_fixes
+        self.max_lag_ns = int(max_lag_s * 1e9)
+        self.cep_window = cep_window
+        self.devices = {}  # Name -> _DeviceScore
+        self._reference = {}  # Epoch ns -> (lat, lon) of the buffered reference epochs
+        self._reference_epochs = deque()  # The same epochs in arrival (time) order, for dropping the oldest
+        self._reference_cursor = 0  # First reference fix not buffered yet
+        self._reference_latest_ns = -1
+
+    def add_device(self, name, fixes, device_metrics=None):
+        """
+        Score a device under test.
+
+        Args:
+            name (str): Name of the device in the summaries.
+            fixes (FixStore): Fix store its capture appends to.
+            device_metrics (DeviceMetrics, optional): Live metrics receiving its current CEP.
+        """
+        self.devices[name] = _DeviceScore(name, fixes, self.cep_window, device_metrics)
+
+    def update(self):
+        """Match and score the fixes that arrived since the last update. Returns the number of epochs scored."""
+        epochs, latitudes, longitudes = self.reference_fixes.tail(self._reference_cursor)
+        self._reference_cursor += len(epochs)
+        for epoch_ns, lat, lon in zip(epochs.tolist(), latitudes.tolist(), longitudes.tolist()):
+            if epoch_ns >= 0 and epoch_ns not in self._reference:
+                self._reference[epoch_ns] = (lat, lon)
+                self._reference_epochs.append(epoch_ns)
+                self._reference_latest_ns = max(self._reference_latest_ns, epoch_ns)
+
+        scored = sum(self._score(device) for device in self.devices.values())
+
+        # Drop the reference epochs that every DUT with fixes is past (but keep max_lag of them)
+        horizon_ns = min([device.last_epoch_ns for device in self.devices.values() if device.last_epoch_ns >= 0]
+                         + [self._reference_latest_ns - self.max_lag_ns])
+        while self._reference_epochs and self._reference_epochs[0] < horizon_ns:
+            del self._reference[self._reference_epochs.popleft()]
+        return scored
+
+    def _score(self, device):
+        epochs, latitudes, longitudes = device.fixes.tail(device.cursor)
+        if not len(epochs):
+            return 0
+
+        # Score up to the first epoch the reference may still deliver
+        waiting = np.flatnonzero((epochs > self._reference_latest_ns) & (epochs > epochs.max() - self.max_lag_ns))
+        ready = int(waiting[0]) if len(waiting) else len(epochs)
+        if not ready:
+            return 0
+        device.cursor += ready
+        device.last_epoch_ns = max(device.last_epoch_ns, int(epochs[:ready].max()))
+
+        reference = [self._reference.get(epoch_ns) for epoch_ns in epochs[:ready].tolist()]
+        matched = np.array([position is not None for position in reference], dtype=bool)
+        device.unmatched += ready - int(matched.sum())
+        if not matched.any():
+            return 0
+        reference_lat, reference_lon = np.array([position for position in reference if position is not None]).T
+        east, north, _ = geodetic_to_enu(latitudes[:ready][matched], longitudes[:ready][matched], 0.0,
+                                         reference_lat, reference_lon, 0.0)
+        device.matched += len(east)
+        device.add(horizontal_error(east, north))
+        return len(east)
+
+    def summaries(self):
+        """Matched/unmatched epochs, running CEP and current (trailing window) CEP50/95 of every DUT."""
+        return [device.summary() for device in self.devices.values()]
+
+
+def report_progress(scorer, on_message=None):
+    """Log one line with the running dynamic CEP of every DUT."""
+    for summary in scorer.summaries():
+        if summary['matched_epochs']:
+            notify(f"{summary['name']}: {summary['matched_epochs']} epochs matched "
+                   f"({summary['unmatched_epochs']} unmatched), CEP50 {summary['CEP50']:.2f} m, "
+                   f"CEP95 {summary['CEP95']:.2f} m, last {len(scorer.devices[summary['name']].window)} epochs "
+                   f"CEP50 {summary['current_CEP50']:.2f} m, CEP95 {summary['current_CEP95']:.2f} m", on_message)
+        else:
+            notify(f"{summary['name']}: no epochs matched with the reference yet "
+                   f"({summary['unmatched_epochs']} unmatched).", on_message)
+
+
+def _start_metrics(config):
+    # LiveMetrics of the config (stopped by the run), else the shared one of the environment (left running)
+    options = config.get('metrics')
+    if not options:
+        return metrics_from_environment(), False
+    try:
+        return LiveMetrics(int(options['port']) if options.get('port') else None, options.get('file')).start(), True
+    except (OSError, ValueError) as e:
+        logging.error(f"Could not start the live metrics: {e}")
+        return None, False
+
+
+def run_dynamic_live(config, log_folder, timestamp, stop_event=None, on_message=None):
+    """
+    Headless dynamic live test: capture a reference receiver and N devices under test, score them while
+    they run, then analyse and export every DUT as the GUI's live dynamic mode does.
+
+    Every device is read by its own read_serial_nmea thread (raw capture, validation, parsing). The calling
+    thread matches the new fixes against the reference every second (StreamingDynamicCEP) and logs the
+    running CEP of every DUT each report interval. The run ends after the configured duration, when
+    stop_event is set or on Ctrl+C; each DUT then gets the full analyze_dynamic (track, motion, latency,
+    fix events, rolling CEP) and its Excel workbook, and the run a JSON summary.
+
+    Args:
+        config (dict): Run configuration (see load_live_config).
+        log_folder (str): Directory of the raw captures and the summary (logs/NMEA_<timestamp>).
+        timestamp (str): Timestamp of the run.
+        stop_event (threading.Event, optional): Event to end the run early.
+        on_message (callable, optional): Callback receiving progress messages.
+
+    Returns:
+        dict: DUT name -> 'name', 'nmea_data', 'cep_value', 'satellite_stats' and 'streaming' (the running
+        CEP summary), or None if the reference delivered no fixes.
+    """
+    stop_event = stop_event or threading.Event()
+    reference, devices = config['reference'], config['devices']
+    metrics, own_metrics = _start_metrics(config)
+
+    # Accumulators are created here so the scorer can read the fix stores while the captures append to them
+    nmea = {device['port']: NMEAData(None, None, []) for device in [reference] + devices}
+    captured = {}
+
+    def capture(device):
+        captured[device['port']] = read_serial_nmea(
+            device['port'], device['baudrate'], device['timeout'], config['duration'], log_folder, timestamp,
+            stop_event, on_message, config['capture'], metrics, nmea[device['port']],
+            None if device is reference else config['sentence_filter'])  # The reference is parsed in full
+
+    scorer = StreamingDynamicCEP(nmea[reference['port']].fixes, config['max_lag'], config['cep_window'])
+    for device in devices:
+        scorer.add_device(device['name'], nmea[device['port']].fixes,
+                          metrics.device(device['port'], device['baudrate']) if metrics is not None else None)
+
+    notify(f"Dynamic live test: reference {reference['name']} ({reference['port']}), "
+           f"{len(devices)} device(s) under test.", on_message)
+    threads = [threading.Thread(target=capture, args=(device,), name=f"capture {device['name']}", daemon=True)
+               for device in [reference] + devices]
+    for thread in threads:
+        thread.start()
+
+    try:
+        next_report = monotonic() + config['report_interval']
+        while any(thread.is_alive() for thread in threads):
+            sleep(UPDATE_INTERVAL_S)
+            scorer.update()
+            if monotonic() >= next_report:
+                report_progress(scorer, on_message)
+                next_report += config['report_interval']
+    except KeyboardInterrupt:
+        notify("Interrupted: stopping the captures.", on_message, logging.WARNING)
+        stop_event.set()
+    for thread in threads:
+        thread.join()
+    scorer.update()
+    report_progress(scorer, on_message)
+    if own_metrics:
+        metrics.stop()
+
+    reference_data = captured.get(reference['port'])
+    if reference_data is None or not len(reference_data.fixes):
+        notify(f"No fixes from the reference {reference['name']} ({reference['port']}); "
+               f"dynamic CEP cannot be calculated.", on_message, logging.ERROR)
+        return None
+
+    rolling_window = {'window_s': config['rolling_window']} if config['rolling_window'] else None
+    results = {}
+    for device, streaming in zip(devices, scorer.summaries()):
+        nmea_data = captured.get(device['port'])
+        if nmea_data is None:
+            continue
+        port, subject = device['port'], f"port {device['port']}"
+        try:
+            cep_value = analyze_dynamic(nmea_data, reference_data.fixes, f"Mode 1: CEP statistics for port {port}:",
+                                        subject, on_message, reference_data.motion, config['latency_correction'],
+                                        rolling_window)
+            satellite_stats = report_satellite_statistics(nmea_data, subject, on_message)
+        except Exception as e:
+            notify(f"Error analysing {subject}: {e}", on_message, logging.ERROR)
+            continue
+        nmea_data.write_to_excel_mode_1_dynamic(port, device['baudrate'], timestamp, cep_value)
+        results[device['name']] = {'name': device['name'], 'nmea_data': nmea_data, 'cep_value': cep_value,
+                                   'satellite_stats': satellite_stats, 'streaming': streaming}
+
+    write_live_summary(results, config, log_folder, timestamp)
+    return results
+
+
+def write_live_summary(results, config, log_folder, timestamp):
+    """
+    Write "<log_folder>/dynamic_live_summary_<timestamp>.json": per DUT the final CEP (all matched epochs)
+    and the running CEP the streaming scorer reached, for scripts driving headless runs.
+    """
+    rows = []
+    for device in config['devices']:
+        result = results.get(device['name'])
+        row = {'name': device['name'], 'port': device['port'], 'baudrate': device['baudrate']}
+        if result is not None:
+            cep_value = result['cep_value'] or {}
+            row.update({key: float(cep_value[key]) if key in cep_value else None
+                        for key in ('CEP50', 'CEP68', 'CEP90', 'CEP95', 'CEP99')})
+            row['num_points'] = cep_value.get('num_points', 0)
+            row['streaming'] = {key: None if isinstance(value, float) and math.isnan(value) else value
+                                for key, value in result['streaming'].items()}
+        rows.append(row)
+
+    path = os.path.join(log_folder, f"dynamic_live_summary_{timestamp}.json")
+    try:
+        os.makedirs(log_folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'reference': config['reference'], 'devices': rows}, f, indent=2)
+        logging.info(f"Dynamic live summary written to {path}")
+    except OSError as e:
+        logging.error(f"Error writing the dynamic live summary {path}: {e}")
@@ -0,0 +1,280 @@
+# log_index.py
+import bisect
+import itertools
+import json
+import logging
+import mmap
+import os
+import re
+
+from .fix_store import DAY_NS, _ROLLOVER_NS
+from .ingest import split_compression
+
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 2  # Version 1 also stored the offsets of every N-th sentence of each type
+DEFAULT_INDEX_EVERY = 10  # Index every 10th epoch
+
+# Sentence types with the UTC time of their epoch in the first field
+_EPOCH_TYPES = frozenset((b'GGA', b'RMC', b'GNS', b'ZDA', b'GST'))
+# Address and (if it looks like one) the time field of every line; "\n$" is a literal the regex engine can skip to
+_LINE_HEAD = rb'\$([A-Z0-9]+)[,*](\d{6}(?:\.\d+)?)?'
+_FIRST_LINE = re.compile(_LINE_HEAD)
+_NEXT_LINES = re.compile(rb'\n' + _LINE_HEAD)
+
+
+def time_field_ns(field):
+    """UTC time field of a sentence (b"hhmmss.sss") in nanoseconds since midnight. Raises ValueError if malformed."""
+    return (int(field[0:2]) * 3600 + int(field[2:4]) * 60) * 1_000_000_000 + round(float(field[4:]) * 1e9)
+
+
+def time_of_day_ns(value):
+    """datetime.time (or nanoseconds) as nanoseconds since midnight."""
+    if isinstance(value, int):
+        return value
+    return ((value.hour * 3600 + value.minute * 60 + value.second) * 1_000_000 + value.microsecond) * 1000
+
+
+def index_path(log_path):
+    """Path of the sidecar index of a log: "<log>.idx.json" next to it."""
+    return log_path + INDEX_SUFFIX
+
+
+class LogIndex:
+    """
+    Sparse index of a raw NMEA log for random access by time.
+
+    The index records the byte offset of every N-th epoch (an epoch starts at the first GGA/RMC/GNS/ZDA/GST
+    sentence with a new UTC time) on the log's timeline, and the number of sentences of each type. A
+    30-second window of a 12-hour log is then found by binary search and only that slice is read. Times on the timeline are nanoseconds since midnight of the first day, advanced
+    by a day when the time of day rolls over, as in EpochClock. Where the time jumps back (a receiver
+    reset, logs appended to each other) a new run of increasing times starts, searched on its own.
+
+    The index is only valid for the exact file it was built from: size and modification time are stored
+    and checked by load. Compressed logs cannot be indexed (a compressed stream cannot be seeked into).
+    """
+
+    def __init__(self, log_path, size, mtime_ns, every, epoch_time_ns, epoch_offsets, epoch_numbers, runs, types):
+        self.log_path = log_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.every = every
+        self.epoch_time_ns = epoch_time_ns  # Timeline time of every N-th epoch
+        self.epoch_offsets = epoch_offsets  # Byte offset of its first sentence
+        self.epoch_numbers = epoch_numbers  # Its number among all epochs of the log
+        self.runs = runs  # Index of the first indexed epoch of every run of increasing times
+        self.types = types  # Address (e.g. "GNGGA") -> number of sentences
+
+    @classmethod
+    def build(cls, log_path, every=DEFAULT_INDEX_EVERY):
+        """
+        Build the index of a log with one scan over its bytes.
+
+        Args:
+            log_path (str): Uncompressed raw log (.txt/.log/.nmea).
+            every (int): Index every N-th epoch.
+
+        Returns:
+            LogIndex: The index (not yet saved, see save).
+        """
+        if split_compression(log_path)[1] is not None:
+            raise ValueError(f"Compressed logs cannot be indexed: {log_path}. Decompress it first.")
+        every = max(int(every), 1)
+
+        epoch_time_ns, epoch_offsets, epoch_numbers, runs = [], [], [], []
+        counts = {}
+        epochs = 0
+        day = 0
+        time_field = None
+
+        stat = os.stat(log_path)
+        with open(log_path, 'rb') as f, (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size
+                                         else memoryview(b'')) as mapped:
+            # The first line has no "\n" before it for _NEXT_LINES to anchor on
+            first = _FIRST_LINE.match(mapped)
+            for match in itertools.chain((first,) if first else (), _NEXT_LINES.finditer(mapped)):
+                address, field = match.group(1, 2)
+                counts[address] = counts.get(address, 0) + 1
+
+                if field is None or field == time_field or address[-3:] not in _EPOCH_TYPES or address[0] == 80:
+                    continue  # Not a new epoch (80 is 'P': proprietary sentences never start one)
+
+                # "hhmmss.ss" fields sort like the times they hold, so only a jump back needs them parsed
+                restart = False
+                if time_field is not None and field < time_field:
+                    if time_field_ns(time_field) - time_field_ns(field) > _ROLLOVER_NS:  # Past midnight
+                        day += 1
+                    else:  # Receiver reset, logs appended to each other: a new run, indexed at once
+                        restart = True
+                time_field = field
+
+                if restart or not runs or epochs - epoch_numbers[-1] >= every:
+                    if restart or not runs:
+                        runs.append(len(epoch_time_ns))
+                    epoch_time_ns.append(day * DAY_NS + time_field_ns(field))
+                    epoch_offsets.append(match.start(1) - 1)
+                    epoch_numbers.append(epochs)
+                epochs += 1
+
+        types = {address.decode('ascii'): counts[address] for address in sorted(counts)}
+        logging.info(f"Indexed {log_path}: {epochs} epochs, {sum(counts.values())} sentences, "
+                     f"{len(types)} sentence types")
+        return cls(log_path, stat.st_size, stat.st_mtime_ns, every, epoch_time_ns, epoch_offsets, epoch_numbers, runs,
+                   types)
+
+    def save(self, path=None):
+        """Write the index as JSON (default: index_path of the log). Returns the path written."""
+        path = path or index_path(self.log_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'log': os.path.basename(self.log_path), 'size': self.size,
+                       'mtime_ns': self.mtime_ns, 'every': self.every,
+                       'epochs': {'time_ns': self.epoch_time_ns, 'offsets': self.epoch_offsets,
+                                  'numbers': self.epoch_numbers, 'runs': self.runs},
+                       'types': self.types}, f, separators=(',', ':'))
+        return path
+
+    @classmethod
+    def load(cls, log_path, path=None):
+        """
+        Read the sidecar index of a log.
+
+        Returns:
+            LogIndex: The index, or None if there is none, it has an older format or the log changed since it was
+            built.
+        """
+        path = path or index_path(log_path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            stat = os.stat(log_path)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            logging.info(f"Ignoring index {path} of an older format; rebuild it.")
+            return None
+        if data.get('size') != stat.st_size or data.get('mtime_ns') != stat.st_mtime_ns:
+            logging.info(f"Ignoring stale index {path}: the log changed since it was built.")
+            return None
+        epochs = data['epochs']
+        return cls(log_path, data['size'], data['mtime_ns'], data['every'], epochs['time_ns'], epochs['offsets'],
+                   epochs['numbers'], epochs['runs'], data['types'])
+
+    def byte_range(self, start_ns=None, end_ns=None, run=0):
+        """
+        Byte range of the log covering a window of its timeline, at the granularity of the indexed epochs.
+
+        The range starts at the last indexed epoch at or before start_ns and ends at the first indexed epoch
+        at or after end_ns, so it contains the whole window plus at most N epochs on either side.
+
+        Args:
+            start_ns (int, optional): First time of the window on the timeline.
+            end_ns (int, optional): End of the window on the timeline.
+            run (int): Run of increasing times to search (a log only has several if its time jumps back).
+
+        Returns:
+            tuple: (first byte, end byte, number of the epoch at the first byte).
+        """
+        if not self.epoch_time_ns:
+            return 0, self.size, 0
+        low = self.runs[run]
+        high = self.runs[run + 1] if run + 1 < len(self.runs) else len(self.epoch_time_ns)
+        times = self.epoch_time_ns
+
+        first = low if start_ns is None else max(bisect.bisect_right(times, start_ns, low, high) - 1, low)
+        last = high if end_ns is None else bisect.bisect_left(times, end_ns, low, high)
+        end_byte = self.epoch_offsets[last] if last < len(self.epoch_offsets) else self.size
+        return self.epoch_offsets[first], max(end_byte, self.epoch_offsets[first]), self.epoch_numbers[first]
+
+    def time_of_day_ranges(self, start=None, end=None):
+        """
+        Byte ranges covering a daily UTC window on every day of the log (see byte_range).
+
+        A window such as 09:59:45-10:00:15 occurs once per day the log covers, and a window that wraps past
+        midnight (end before start) spans two days, so a log crossing midnight can need several slices.
+
+        Args:
+            start (datetime.time | int, optional): First time of day of the window (or ns since midnight).
+            end (datetime.time | int, optional): End time of day of the window.
+
+        Returns:
+            list[tuple]: Non-overlapping (first byte, end byte, first epoch number) ranges, in file order.
+        """
+        if not self.epoch_time_ns:
+            return [(0, self.size, 0)]
+        start_ns = 0 if start is None else time_of_day_ns(start)
+        end_ns = DAY_NS if end is None else time_of_day_ns(end)
+        if end_ns == start_ns:
+            return []
+        if end_ns < start_ns:  # Window across midnight
+            end_ns += DAY_NS
+
+        ranges = []
+        for run, low in enumerate(self.runs):
+            high = self.runs[run + 1] if run + 1 < len(self.runs) else len(self.epoch_time_ns)
+            # The day before the run is included for windows wrapping into its first day
+            for day in range(self.epoch_time_ns[low] // DAY_NS - 1, self.epoch_time_ns[high - 1] // DAY_NS + 1):
+                first, last, epoch = self.byte_range(day * DAY_NS + start_ns, day * DAY_NS + end_ns, run)
+                if last <= first:
+                    continue
+                if ranges and first <= ranges[-1][1]:
+                    ranges[-1] = (ranges[-1][0], max(last, ranges[-1][1]), ranges[-1][2])
+                else:
+                    ranges.append((first, last, epoch))
+        return ranges
+
+    def window_range(self, start=None, end=None):
+        """
+        Byte range of the log covering the time window of a fix filter (see query.FixQuery.mask).
+
+        Unlike time_of_day_ranges, the window occurs once: start is its first occurrence on the timeline and
+        end the first occurrence at or after start. A log whose time jumps back is not narrowed, as the
+        timeline of its fixes is not the one of the index.
+
+        Args:
+            start (datetime.time | int, optional): First time of day of the window (or ns since midnight).
+            end (datetime.time | int, optional): End time of day of the window.
+
+        Returns:
+            tuple: (first byte, end byte, day of the first byte on the timeline), or None if the log has to
+            be read in full. The day lets the slice keep the day count of the whole log (see EpochClock).
+        """
+        if not self.epoch_time_ns or len(self.runs) > 1:
+            return None
+        start_ns = None if start is None else _first_occurrence(time_of_day_ns(start), self.epoch_time_ns[0])
+        end_ns = None if end is None else _first_occurrence(time_of_day_ns(end),
+                                                            self.epoch_time_ns[0] if start_ns is None else start_ns)
+        first, last, _ = self.byte_range(start_ns, end_ns)
+        # Offsets increase along a single run, so the indexed epoch at the first byte is found by bisection
+        day = self.epoch_time_ns[bisect.bisect_left(self.epoch_offsets, first)] // DAY_NS
+        return first, last, day
+
+
+def _first_occurrence(time_ns, not_before_ns):
+    # First time on the timeline at or after not_before_ns with this time of day, as in FixQuery.to_epoch_ns
+    occurrence = not_before_ns // DAY_NS * DAY_NS + time_ns
+    return occurrence if occurrence >= not_before_ns else occurrence + DAY_NS
+
+
+def get_log_index(log_path, every=DEFAULT_INDEX_EVERY, build=True):
+    """
+    Sidecar index of a log: loaded if it is up to date, otherwise built (and saved next to the log).
+
+    Args:
+        log_path (str): Uncompressed raw log.
+        every (int): Index density for a new index (see LogIndex.build).
+        build (bool): Build a missing or stale index. Without it, None is returned in that case.
+
+    Returns:
+        LogIndex: The index, or None if there is none (or the log is compressed).
+    """
+    if split_compression(log_path)[1] is not None:
+        return None
+    index = LogIndex.load(log_path)
+    if index is not None or not build:
+        return index
+
+    index = LogIndex.build(log_path, every)
+    try:
+        index.save()
+    except OSError as e:  # e.g. a read-only log folder; the index is still usable for this run
+        logging.warning(f"Could not save the index of {log_path}: {e}")
+    return index
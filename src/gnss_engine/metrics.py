@@ -0,0 +1,263 @@
+# metrics.py
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .projection import geodetic_to_enu, horizontal_error
+
+METRICS_PORT_ENV = 'GNSS_METRICS_PORT'  # Serve Prometheus metrics on this localhost port
+METRICS_FILE_ENV = 'GNSS_METRICS_FILE'  # Rewrite this JSON file with the metrics every interval
+DEFAULT_INTERVAL_S = 5.0
+DEFAULT_CEP_WINDOW = 600  # "Current" CEP: over the last 600 fixes (10 minutes at 1 Hz)
+
+# Prometheus metric name, type, help text and the key of the value in a device sample
+_PROMETHEUS_METRICS = (
+    ('gnss_device_up', 'gauge', 'Whether the device is being captured.', 'up'),
+    ('gnss_lines_total', 'counter', 'Raw lines received from the device.', 'lines'),
+    ('gnss_bytes_total', 'counter', 'Bytes received from the device.', 'bytes'),
+    ('gnss_sentences_parsed_total', 'counter', 'Sentences parsed.', 'sentences'),
+    ('gnss_parse_errors_total', 'counter', 'Valid lines the parser rejected or did not know.', 'parse_errors'),
+    ('gnss_corrupt_lines_total', 'counter', 'Lines rejected by the framing and checksum check.', 'corrupt_lines'),
+    ('gnss_fixes_total', 'counter', 'GGA fixes stored.', 'fixes'),
+    ('gnss_sentence_rate', 'gauge', 'Lines per second over the last sampling interval.', 'line_rate'),
+    ('gnss_parse_error_ratio', 'gauge', 'Rejected (corrupt or unparsed) share of the lines of the last interval.',
+     'error_ratio'),
+    ('gnss_serial_queue_bytes', 'gauge', 'Bytes waiting in the serial input buffer (backlog of the reader).',
+     'queue_bytes'),
+    ('gnss_seconds_since_last_line', 'gauge', 'Seconds since the last line was received.', 'idle_s'),
+    ('gnss_cep50_meters', 'gauge', 'CEP50 of the most recent fixes.', 'cep50_m'),
+    ('gnss_cep95_meters', 'gauge', 'CEP95 of the most recent fixes.', 'cep95_m'),
+)
+
+
+class DeviceMetrics:
+    """
+    Counters of one live device, updated by its acquisition loop.
+
+    Only the acquisition thread writes them and every update is a plain attribute assignment, so the
+    loop takes no lock and pays a few attribute increments per line. The sampling thread of LiveMetrics
+    only reads them; a sample may be a line behind, never inconsistent in a harmful way.
+    """
+
+    __slots__ = ('port', 'baudrate', 'reference_point', 'fixes', 'up', 'lines', 'bytes', 'sentences', 'parse_errors',
+                 'corrupt_lines', 'queue_bytes', 'last_line_ns', 'next_queue_sample_ns', 'dynamic_cep')
+
+    def __init__(self, port, baudrate=None, reference_point=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.reference_point = reference_point  # CEP reference; the mean of the recent fixes without one
+        self.fixes = None  # FixStore of the capture, attached by the acquisition loop
+        self.up = 0
+        self.lines = 0
+        self.bytes = 0
+        self.sentences = 0
+        self.parse_errors = 0
+        self.corrupt_lines = 0
+        self.queue_bytes = 0
+        self.last_line_ns = 0
+        self.next_queue_sample_ns = 0  # The serial input buffer is polled once per second, not per line
+        self.dynamic_cep = None  # (CEP50, CEP95) against a moving reference, set by the dynamic live mode
+
+
+class LiveMetrics:
+    """
+    Metrics surface of the live engine: per-device rates, error ratios, serial backlog and current CEP.
+
+    A background thread samples the DeviceMetrics of every device each interval (rates are taken between
+    two samples) and publishes the sample as Prometheus text on http://<host>:<http_port>/metrics and/or
+    as a JSON file that is rewritten in place (atomically, so readers never see half a file).
+
+    Usage:
+        metrics = LiveMetrics(http_port=9108).start()
+        read_serial_nmea(..., metrics=metrics)
+    """
+
+    def __init__(self, http_port=None, json_path=None, interval=DEFAULT_INTERVAL_S, cep_window=DEFAULT_CEP_WINDOW,
+                 host='127.0.0.1'):
+        self.http_port = http_port
+        self.json_path = json_path
+        self.interval = interval
+        self.cep_window = cep_window
+        self.host = host
+        self.devices = {}  # Port -> DeviceMetrics
+        self._previous = {}  # Port -> (sample time ns, lines, rejected lines) of the last sample
+        self._latest = []
+        self._lock = threading.Lock()  # Guards the device registry and the latest sample, never the counters
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def device(self, port, baudrate=None, reference_point=None):
+        """
+        Counters of a device, created on first use. A device captured again keeps counting (counters only grow).
+
+        Args:
+            port (str): Serial port of the device; the label of its metrics.
+            baudrate (int, optional): Baud rate, reported with the device.
+            reference_point (tuple, optional): (lat, lon) the current CEP is measured against.
+
+        Returns:
+            DeviceMetrics: The counters to update from the acquisition loop.
+        """
+        with self._lock:
+            device = self.devices.get(port)
+            if device is None:
+                device = self.devices[port] = DeviceMetrics(port, baudrate, reference_point)
+            if reference_point is not None:
+                device.reference_point = reference_point
+            return device
+
+    def start(self):
+        """Start the sampling thread and the HTTP endpoint (if http_port is set). Returns self."""
+        if self.http_port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.http_port), _handler(self))
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="metrics http", daemon=True).start()
+            logging.info(f"Live metrics on http://{self.host}:{self._server.server_address[1]}/metrics")
+        if self.json_path:
+            logging.info(f"Live metrics written to {self.json_path} every {self.interval:g} s")
+        self._thread = threading.Thread(target=self._run, name="metrics sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and serving, after a last sample (so the JSON file shows the final counters)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                self.sample()
+                return
+
+    def sample(self):
+        """
+        Take a sample of every device and publish it (JSON file); the HTTP endpoint serves the latest one.
+
+        Returns:
+            list[dict]: One row per device.
+        """
+        now_ns = time.time_ns()
+        with self._lock:
+            devices = list(self.devices.values())
+        rows = [self._sample_device(device, now_ns) for device in devices]
+        with self._lock:
+            self._latest = rows
+        if self.json_path:
+            self._write_json(rows, now_ns)
+        return rows
+
+    def _sample_device(self, device, now_ns):
+        # Counters are read once each, then rates are taken against the previous sample of the device
+        lines, rejected = device.lines, device.corrupt_lines + device.parse_errors
+        previous_ns, previous_lines, previous_rejected = self._previous.get(device.port, (now_ns, lines, rejected))
+        self._previous[device.port] = (now_ns, lines, rejected)
+        elapsed_s = (now_ns - previous_ns) / 1e9
+        new_lines = lines - previous_lines
+
+        row = {'port': device.port, 'baudrate': device.baudrate, 'up': device.up, 'lines': lines,
+               'bytes': device.bytes, 'sentences': device.sentences, 'parse_errors': device.parse_errors,
+               'corrupt_lines': device.corrupt_lines, 'fixes': len(device.fixes) if device.fixes is not None else 0,
+               'line_rate': new_lines / elapsed_s if elapsed_s > 0 else 0.0,
+               'error_ratio': (rejected - previous_rejected) / new_lines if new_lines > 0 else 0.0,
+               'queue_bytes': device.queue_bytes,
+               'idle_s': (now_ns - device.last_line_ns) / 1e9 if device.last_line_ns else None}
+        row['cep50_m'], row['cep95_m'] = self._current_cep(device)
+        return row
+
+    def _current_cep(self, device):
+        # CEP50/CEP95 of the last cep_window fixes, read with FixStore.tail while the acquisition thread appends
+        if device.dynamic_cep is not None:  # Scored against a moving reference by the dynamic live mode
+            return device.dynamic_cep
+        if device.fixes is None or not len(device.fixes):
+            return None, None
+        _, latitudes, longitudes = device.fixes.tail(max(len(device.fixes) - self.cep_window, 0))
+        valid = (latitudes != 0) & (longitudes != 0)
+        if not valid.any():
+            return None, None
+        latitudes, longitudes = latitudes[valid], longitudes[valid]
+        ref_lat, ref_lon = device.reference_point or (latitudes.mean(), longitudes.mean())
+        east, north, _ = geodetic_to_enu(latitudes, longitudes, 0.0, ref_lat, ref_lon, 0.0)
+        cep50, cep95 = np.percentile(horizontal_error(east, north), [50, 95])
+        return float(cep50), float(cep95)
+
+    def _write_json(self, rows, now_ns):
+        # Write to a temporary file and swap it in, so a reader never sees a partly written file
+        temporary_path = f"{self.json_path}.tmp"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump({'time': now_ns / 1e9, 'interval_s': self.interval, 'cep_window_fixes': self.cep_window,
+                           'devices': rows}, f, indent=2)
+            os.replace(temporary_path, self.json_path)
+        except OSError as e:
+            logging.error(f"Error writing the metrics file {self.json_path}: {e}")
+
+    def prometheus_text(self):
+        """The latest sample in the Prometheus text exposition format."""
+        with self._lock:
+            rows = self._latest
+        lines = []
+        for name, kind, description, key in _PROMETHEUS_METRICS:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            for row in rows:
+                if row[key] is not None:
+                    port = str(row['port']).replace('\\', '\\\\').replace('"', '\\"')
+                    lines.append(f'{name}{{port="{port}"}} {row[key]}')
+        return "\n".join(lines) + "\n"
+
+
+def _handler(metrics):
+    # Request handler class serving the metrics of one LiveMetrics
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # Scrapes every few seconds would flood the console log
+            pass
+
+    return MetricsHandler
+
+
+_environment_metrics = None
+_environment_lock = threading.Lock()
+
+
+def metrics_from_environment():
+    """
+    LiveMetrics requested through the environment, started on first use and shared by every later run.
+
+    GNSS_METRICS_PORT serves Prometheus metrics on that localhost port, GNSS_METRICS_FILE rewrites that JSON
+    file every few seconds. Without either, there are no metrics (None).
+    """
+    global _environment_metrics
+    with _environment_lock:  # Devices started together must share one endpoint
+        if _environment_metrics is None:
+            port = os.environ.get(METRICS_PORT_ENV, '').strip()
+            json_path = os.environ.get(METRICS_FILE_ENV, '').strip() or None
+            if not port and not json_path:
+                return None
+            try:
+                _environment_metrics = LiveMetrics(int(port) if port else None, json_path).start()
+            except (OSError, ValueError) as e:
+                logging.error(f"Could not start the live metrics: {e}")
+                return None
+        return _environment_metrics
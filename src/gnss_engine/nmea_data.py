@@ -1,9 +1,17 @@
-# headless_class.py
+# nmea_data.py
 import logging
-import pandas as pd
 import numpy as np
 import os
 import sys
+from datetime import date, datetime
+
+from .dynamic import match_epochs
+from .fix_store import EpochClock, FixStore, MotionStore, aligned_epochs
+from .profiling import timed
+from .projection import geodetic_to_enu, horizontal_error, distance_between
+
+KNOTS_TO_MPS = 0.514444  # Knots to meters per second
+
 
 # noinspection PyCompatibility
 class NMEAData:
@@ -13,9 +21,14 @@ class NMEAData:
         self.sentence_type = sentence_type
         self.data = data
         self.parsed_sentences = parsed_sentences  # List to store parsed NMEA data
-        self.coordinates = []  # To store latitude and longitude tuples
+        self.clock = EpochClock()  # Day count and UTC date shared by the fix and motion stores
+        self.fixes = FixStore(self.clock)  # Columnar store of GGA fixes (time, lat, lon, alt, quality, ...)
+        self.motion = MotionStore(self.clock)  # Columnar store of per-epoch speed, course and heading
+        self.current_time_ns = -1  # Time of the current epoch, for sentences that carry no UTC time of their own
         self.MIN_POINTS_FOR_CEP = 50  # Minimum number of points for CEP calculation
-        self.satellite_info = []  # To store satellite CNR and related info from GSV sentences
+        self.gsv_satellite_info = []  # To store satellite CNR and related info from GSV sentences
+        self.gsv_epoch_ns = []  # Epoch (relative to day 0) of the last fix before each gsv_satellite_info entry
+        self.line_integrity = None  # Corrupt-line accounting (Metric/Value table) of the validator, once known
 
     def __str__(self):
         # Pretty print the data based on sentence type
@@ -528,7 +541,7 @@ class NMEAData:
             # Pretty print the data based on sentence type
             if self.sentence_type == "GSV":
                 # Use system time to timestamp each GSV message
-                sentence_timestamp = pd.Timestamp.now().replace(microsecond=3)
+                sentence_timestamp = datetime.now().replace(microsecond=3)
 
                 # Extract satellite CNR and relevant data from GSV sentence
                 for i in range(1, 5):  # GSV sentences may contain up to 4 satellite entries
@@ -540,13 +553,14 @@ class NMEAData:
                     # Ensure we have valid numeric values
                     try:
                         if satellite_prn and snr and snr != '':  # Ensure snr is not an empty string
-                            self.satellite_info.append({
+                            self.gsv_satellite_info.append({
                                 "Timestamp": sentence_timestamp,
                                 "Satellite PRN": satellite_prn,
                                 "Elevation (°)": float(elevation) if elevation else None,
                                 "Azimuth (°)": float(azimuth) if azimuth else None,
                                 "CNR (SNR) (dB)": float(snr) if snr else None
                             })
+                            self.gsv_epoch_ns.append(self.clock.epoch_of(self.current_time_ns))
                     except ValueError:
                         logging.error(f"Invalid data for satellite PRN {satellite_prn} in GSV sentence.")
             self.parsed_sentences.append({
@@ -990,26 +1004,69 @@ class NMEAData:
             return f"Unsupported NMEA sentence type: {self.sentence_type}"
 
     def add_coordinates(self):
-        # Add GLL or GGA coordinates to the coordinates list
-        if self.sentence_type == "GGA":
-            lat = self.data.latitude
-            lon = self.data.longitude
-        else:
+        # Add GGA fixes to the columnar fix store
+        if self.sentence_type != "GGA":
             return
 
-        self.coordinates.append((lat, lon))
+        self.fixes.append(
+            self.data.timestamp,
+            self.data.latitude,
+            self.data.longitude,
+            alt=self.data.altitude,
+            gps_qual=self.data.gps_qual,
+            num_sats=self.data.num_sats,
+            hdop=self.data.horizontal_dil
+        )
+
+    def add_motion(self):
+        # Add speed, course and heading of the current sentence to the motion store (all speeds in m/s)
+        if self.sentence_type == "GGA":
+            self.current_time_ns = FixStore.time_to_ns(self.data.timestamp)
+        elif self.sentence_type == "RMC":
+            self.current_time_ns = FixStore.time_to_ns(self.data.timestamp)
+            self.clock.set_date(self.data.datestamp, self.current_time_ns)
+            speed = FixStore._to_float(self.data.spd_over_grnd) * KNOTS_TO_MPS
+            self.motion.update(self.current_time_ns, speed=speed, course=self.data.true_course)
+        elif self.sentence_type == "VTG":
+            speed = FixStore._to_float(self.data.spd_over_grnd_kmph) / 3.6
+            self.motion.update(self.current_time_ns, speed=speed, course=self.data.true_track)
+        elif self.sentence_type == "PVT":
+            self.current_time_ns = FixStore.time_to_ns(self.data.time)
+            speed = np.hypot(FixStore._to_float(self.data.vel_n), FixStore._to_float(self.data.vel_e))
+            self.motion.update(self.current_time_ns, speed=speed, course=self.data.heading)
+        elif self.sentence_type == "VEL":
+            self.current_time_ns = FixStore.time_to_ns(self.data.time)
+            self.motion.update(self.current_time_ns, speed=self.data.grd_spd, course=self.data.heading)
+        elif self.sentence_type == "DRPVA":
+            self.current_time_ns = FixStore.time_to_ns(self.data.time)
+            self.motion.update(self.current_time_ns, speed=self.data.speed, heading=self.data.heading)
+        elif self.sentence_type == "VEHATT":
+            self.motion.update(self.current_time_ns, heading=self.data.heading)
+        elif self.sentence_type == "INS":
+            self.motion.update(self.current_time_ns, heading=self.data.yaw)
+        elif self.sentence_type == "ZDA":
+            # ZDA carries no motion, only the date that anchors the epoch timeline
+            try:
+                utc_date = date(int(self.data.year), int(self.data.month), int(self.data.day))
+            except (TypeError, ValueError):
+                return
+            self.clock.set_date(utc_date, FixStore.time_to_ns(self.data.timestamp))
+
+    @property
+    def coordinates(self):
+        # (lat, lon, timestamp) tuples, kept for callers that still iterate fixes one by one
+        return self.fixes.as_tuples()
 
     def calculate_mean_point(self):
         # Filter out coordinates with zero values
-        valid_coords = [(lat, lon) for lat, lon in self.coordinates if lat != 0 and lon != 0]
+        valid = self.fixes.valid_mask()
 
-        if not valid_coords:
+        if not valid.any():
             return None
 
-        latitudes = [coord[0] for coord in valid_coords]
-        longitudes = [coord[1] for coord in valid_coords]
-        return np.mean(latitudes), np.mean(longitudes)
+        return np.mean(self.fixes.latitude[valid]), np.mean(self.fixes.longitude[valid])
 
+    @timed('calculate_cep')
     def calculate_cep(self, reference_point=None):
         """
         Calculate the Circular Error Probable (CEP) metrics (CEP50, CEP68, CEP90, CEP95, CEP99).
@@ -1017,201 +1074,196 @@ class NMEAData:
         :return: Dictionary containing CEP metrics in meters and relevant statistics
         """
         # Filter out coordinates with zero values
-        valid_coords = [(lat, lon) for lat, lon in self.coordinates if lat != 0 and lon != 0]
+        valid = self.fixes.valid_mask()
+        num_points = int(valid.sum())
 
-        if not valid_coords:
+        if not num_points:
             return None
 
         # Warn the user if there are fewer than the recommended number of points
-        if len(valid_coords) < self.MIN_POINTS_FOR_CEP:
-            logging.warning(f"Warning: Only {len(valid_coords)} data points available for CEP calculation. "
+        if num_points < self.MIN_POINTS_FOR_CEP:
+            logging.warning(f"Warning: Only {num_points} data points available for CEP calculation. "
                             f"At least {self.MIN_POINTS_FOR_CEP} points are recommended for a reliable calculation.")
 
+        # Label the distance column by the kind of reference used
+        distance_label = "Distance from Reference (m)"
         if reference_point is None:
             reference_point = self.calculate_mean_point()
+            distance_label = "Distance from Mean Point (m)"
 
         ref_lat, ref_lon = reference_point
 
-        # Function to convert degrees to meters
-        def deg_to_meters(lat1, lon1, lat2, lon2):
-            lat_dist = (lat1 - lat2) * 111139  # Approximation for meters/degree latitude
-            lon_dist = (lon1 - lon2) * (111139 * np.cos(np.radians(lat1)))  # Latitude dependent
-            return np.sqrt(lat_dist ** 2 + lon_dist ** 2)
+        # Project all fixes into the local ENU frame of the reference point in one pass
+        latitudes = self.fixes.latitude[valid]
+        longitudes = self.fixes.longitude[valid]
+        east, north, up = geodetic_to_enu(latitudes, longitudes, 0.0, ref_lat, ref_lon, 0.0)
+        distances = horizontal_error(east, north)
 
-        # Calculate distances to the reference point
-        distances = [deg_to_meters(ref_lat, ref_lon, lat, lon) for lat, lon in valid_coords]
+        fix_times = [fix_time for fix_time, keep in zip(self.fixes.times, valid) if keep]
+        epoch_ns = self.fixes.epoch_ns[valid]
+        valid_coords = list(zip(latitudes, longitudes, fix_times))
 
-        # CEP calculations using percentiles
-        cep50 = np.percentile(distances, 50)
-        cep68 = np.percentile(distances, 68)
-        cep90 = np.percentile(distances, 90)
-        cep95 = np.percentile(distances, 95)
-        cep99 = np.percentile(distances, 99)
+        # Per-fix result table shared by the Excel writers and the GUI
+        data_points = self.build_data_points(fix_times, latitudes, longitudes, east, north, distances,
+                                             distance_label)
 
         # Return all CEP values and additional statistics in a dictionary
         return {
-            'CEP50': cep50,
-            'CEP68': cep68,
-            'CEP90': cep90,
-            'CEP95': cep95,
-            'CEP99': cep99,
-            'num_points': len(valid_coords),  # Number of valid data points used
+            **self.cep_percentiles(distances),
+            'num_points': num_points,  # Number of valid data points used
             'reference_point': reference_point,  # Reference point used (if any)
-            'distances': distances  # All distances to the reference point
+            'distances': distances,  # All distances to the reference point
+            'coordinates': valid_coords,
+            'epoch_ns': epoch_ns,  # Epoch of each fix, for time axes across midnight
+            'east': east,  # ENU offsets reused by exports and plots
+            'north': north,
+            'up': up,
+            'data_points': data_points  # Per-fix table (time, lat, lon, E, N, error)
         }
 
-    def write_to_excel_mode_1(self, port, baudrate, timestamp, cep_value, filename="nmea_data_mode_1"):
+    @timed('calculate_dynamic_cep')
+    def calculate_dynamic_cep(self, reference_fixes, fix_points=None):
         """
-        MODE 1:Write NMEA parsed data, summary statistics (CEP), and individual data points with distances to an Excel file.
-        Also includes a new sheet "Satellites summary" for satellite CNR summary.
+        Calculate the Circular Error Probable (CEP) metrics (CEP50, CEP68, CEP90, CEP95, CEP99) for dynamic reference points.
+        :param reference_fixes: FixStore of the reference device.
+        :param fix_points: FixStore of the device under test. Defaults to this device's fixes.
+        :return: Dictionary containing CEP metrics in meters and relevant statistics.
         """
-        try:
-            # Ensure reference point is properly formatted
-            ref_point = cep_value['reference_point']
-            if ref_point:
-                formatted_ref_point = f"({float(ref_point[0]):.7f}, {float(ref_point[1]):.7f})"
-            else:
-                formatted_ref_point = ''
-
-            # Prepare the data for the summary sheet
-            summary_data = {
-                'Port': port,
-                'Baudrate': baudrate,
-                'Reference Point': formatted_ref_point,
-                'Number of Data Points': cep_value['num_points'],
-                'CEP50 (m)': cep_value['CEP50'],
-                'CEP68 (m)': cep_value['CEP68'],
-                'CEP90 (m)': cep_value['CEP90'],
-                'CEP95 (m)': cep_value['CEP95'],
-                'CEP99 (m)': cep_value['CEP99'],
-            }
+        if fix_points is None:
+            fix_points = self.fixes
 
-            # Create a dataframe for parsed sentences
-            df_parsed = pd.DataFrame(self.parsed_sentences)
-
-            # Create a dataframe for the summary data
-            df_summary = pd.DataFrame([summary_data])
+        if reference_fixes is None or not len(reference_fixes) or not len(fix_points):
+            return None
 
-            def deg_to_meters(lat1, lon1, lat2, lon2):
-                lat_dist = (lat1 - lat2) * 111139  # Approximation for meters/degree latitude
-                lon_dist = (lon1 - lon2) * (111139 * np.cos(np.radians(lat1)))  # Latitude dependent
-                return np.sqrt(lat_dist ** 2 + lon_dist ** 2)
+        # Pair fixes with the reference epoch that carries the same fix time (and day, across midnight)
+        fix_epochs, ref_epochs = aligned_epochs(fix_points, reference_fixes)
+        fix_idx, ref_idx = match_epochs(fix_epochs, ref_epochs)
 
-            # Create a dataframe for data points with distances and timestamps
-            reference_point = cep_value['reference_point']
-            data_points = []
-            if reference_point:
-                ref_lat, ref_lon = reference_point
+        if not len(fix_idx):
+            return None
 
+        # Project every fix about its own reference epoch in a single vectorized call
+        latitudes = fix_points.latitude[fix_idx]
+        longitudes = fix_points.longitude[fix_idx]
+        east, north, up = geodetic_to_enu(latitudes, longitudes, 0.0,
+                                          reference_fixes.latitude[ref_idx], reference_fixes.longitude[ref_idx], 0.0)
+        distances = horizontal_error(east, north)
 
+        fix_times = [fix_points.times[i] for i in fix_idx]
+        matched_points = list(zip(latitudes, longitudes, fix_times))
 
-                # Collect the data points along with calculated distances
-                for entry in self.parsed_sentences:
-                    if "Latitude" in entry and "Longitude" in entry:
-                        try:
-                            # Convert latitude and longitude to float before calculating distance
-                            lat = float(entry.get("Latitude", "0").split()[0])
-                            lon = float(entry.get("Longitude", "0").split()[0])
+        # Per-fix result table shared by the Excel writers and the GUI
+        data_points = self.build_data_points(fix_times, latitudes, longitudes, east, north, distances)
 
-                            # Calculate distance from reference point
-                            distance = deg_to_meters(ref_lat, ref_lon, lat, lon)
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Reference (m)": distance
-                            })
-                        except ValueError:
-                            logging.error(f"Invalid data point for latitude/longitude in entry: {entry}")
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Reference (m)": None
-                            })
-            else:
-                # No reference point provided, so use the mean point
-                mean_lat, mean_lon = self.calculate_mean_point()
-
-                for entry in self.parsed_sentences:
-                    if "Latitude" in entry and "Longitude" in entry:
-                        try:
-                            # Convert latitude and longitude to float before calculating distance
-                            lat = float(entry.get("Latitude", "0").split()[0])
-                            lon = float(entry.get("Longitude", "0").split()[0])
-
-                            # Calculate distance from the mean point
-                            distance = deg_to_meters(mean_lat, mean_lon, lat, lon)
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Mean Point (m)": distance  # Change label when using mean
-                            })
-                        except ValueError:
-                            logging.error(f"Invalid data point for latitude/longitude in entry: {entry}")
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Mean Point (m)": None
-                            })
-
-            df_data_points = pd.DataFrame(data_points)
-
-            # Create a dataframe for the satellite CNR summary
-            df_sat_summary = pd.DataFrame(self.satellite_info)
+        # Return all CEP values and additional statistics in a dictionary
+        return {
+            **self.cep_percentiles(distances),
+            'num_points': len(distances),  # Number of valid data points used
+            'distances': distances,  # All distances to the reference points
+            'reference_point': reference_fixes,  # Reference fixes used
+            'reference_indices': ref_idx,  # Reference epoch matched to each fix
+            'epoch_ns': fix_epochs[fix_idx],  # Epoch of each matched fix, for time axes across midnight
+            'coordinates': matched_points,  # Fix points matched to a reference epoch
+            'east': east,  # ENU offsets reused by exports and plots
+            'north': north,
+            'up': up,
+            'data_points': data_points  # Per-fix table (time, lat, lon, E, N, error)
+        }
 
-            # Default statistics for satellites
-            df_sat_summary_stats = pd.DataFrame()  # Initialize to avoid 'referenced before assignment'
+    @staticmethod
+    def cep_percentiles(distances):
+        """
+        CEP50/68/90/95/99 of a distance array, computed with a single percentile call.
+        :param distances: Array of horizontal errors in meters.
+        :return: Dictionary keyed by CEP name.
+        """
+        cep50, cep68, cep90, cep95, cep99 = np.percentile(distances, [50, 68, 90, 95, 99])
+        return {'CEP50': cep50, 'CEP68': cep68, 'CEP90': cep90, 'CEP95': cep95, 'CEP99': cep99}
 
-            # Calculate satellite statistics for the "Satellites summary" sheet
-            if not df_sat_summary.empty:
-                avg_cnr = df_sat_summary["CNR (SNR) (dB)"].mean()
-                min_cnr = df_sat_summary["CNR (SNR) (dB)"].min()
-                max_cnr = df_sat_summary["CNR (SNR) (dB)"].max()
+    @staticmethod
+    def build_data_points(fix_times, latitudes, longitudes, east, north, distances,
+                          distance_label="Distance from Reference (m)"):
+        """
+        Build the per-fix result table consumed by the Excel writers and the GUI.
+        :param fix_times: List of fix times, aligned with the arrays.
+        :param latitudes: Array of fix latitudes in decimal degrees.
+        :param longitudes: Array of fix longitudes in decimal degrees.
+        :param east: Array of east offsets from the reference in meters.
+        :param north: Array of north offsets from the reference in meters.
+        :param distances: Array of horizontal errors in meters.
+        :param distance_label: Column name for the horizontal error.
+        :return: Dictionary of equal-length columns, ready for pd.DataFrame.
+        """
+        return {
+            "Timestamp": [fix_time.replace(tzinfo=None) if fix_time else None for fix_time in fix_times],
+            "Latitude": latitudes,
+            "Longitude": longitudes,
+            "East (m)": east,
+            "North (m)": north,
+            distance_label: distances
+        }
 
-                # Calculate the number of unique satellites (unique PRNs)
-                unique_prns = df_sat_summary["Satellite PRN"].nunique()
+    @staticmethod
+    def calculate_distance(point1, point2):
+        """
+        Calculate the horizontal distance between two GPS coordinates using the local ENU projection.
+        :param point1: Tuple containing (latitude, longitude) for the reference point.
+        :param point2: Tuple containing (latitude, longitude) for the second point.
+        :return: Distance in meters between the two points.
+        """
+        return distance_between(point1, point2)
 
-                sat_summary_stats = {
-                    "Average CNR (SNR) (dB)": avg_cnr,
-                    "Min CNR (SNR) (dB)": min_cnr,
-                    "Max CNR (SNR) (dB)": max_cnr,
-                    "Total Satellites Tracked": unique_prns
-                }
+    @timed('calculate_satellite_statistics')
+    def calculate_satellite_statistics(self):
+        import pandas as pd  # Deferred: pandas is only needed once results are summarised
 
-                df_sat_summary_stats = pd.DataFrame([sat_summary_stats])
+        # Create a dataframe for the satellite CNR summary
+        df_gsv_sat_summary = pd.DataFrame(self.gsv_satellite_info)
 
-            # Write data to Excel
-            filepath = f"logs/NMEA_{timestamp}/{filename}_{port}_{baudrate}_{timestamp}.xlsx"
-            max_rows = 1048576  # Excel row limit
+        # Default statistics for satellites
+        df_gsv_satellite_summary_stats = pd.DataFrame()  # Initialize to avoid 'referenced before assignment'
 
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Write parsed sentences, splitting across multiple sheets if necessary
-                for i in range(0, len(df_parsed), max_rows):
-                    chunk = df_parsed.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"Parsed_{i // max_rows + 1}")
+        # Calculate satellite statistics for the "Satellites summary" sheet
+        if not df_gsv_sat_summary.empty:
+            avg_cnr = df_gsv_sat_summary["CNR (SNR) (dB)"].mean()
+            min_cnr = df_gsv_sat_summary["CNR (SNR) (dB)"].min()
+            max_cnr = df_gsv_sat_summary["CNR (SNR) (dB)"].max()
 
-                # Write summary data to a new sheet called "CEP Summary"
-                df_summary.to_excel(writer, index=False, sheet_name="CEP Summary")
+            # Calculate the number of unique satellites (unique PRNs)
+            unique_prns = df_gsv_sat_summary["Satellite PRN"].nunique()
 
-                # Write data points with distances, splitting across multiple sheets if necessary
-                for i in range(0, len(df_data_points), max_rows):
-                    chunk = df_data_points.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"DataPoints_{i // max_rows + 1}")
+            gsv_satellite_summary_stats = {
+                "Average CNR (SNR) (dB)": avg_cnr,
+                "Min CNR (SNR) (dB)": min_cnr,
+                "Max CNR (SNR) (dB)": max_cnr,
+                "Total Satellites Tracked": unique_prns
+            }
 
-                # Write satellite summary, splitting if necessary
-                for i in range(0, len(df_sat_summary), max_rows):
-                    chunk = df_sat_summary.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"SatSummary_{i // max_rows + 1}")
+            df_gsv_satellite_summary_stats = pd.DataFrame([gsv_satellite_summary_stats])
 
-                # Write satellite summary statistics (if any)
-                if not df_sat_summary_stats.empty:
-                    df_sat_summary_stats.to_excel(writer, index=False, sheet_name="SatSummaryStats")
+        return df_gsv_satellite_summary_stats
 
-            logging.info(f"Data written to {filepath}")
+    @staticmethod
+    def format_reference_point(reference_point):
+        # Format a static (lat, lon) reference point for the summary sheet
+        if reference_point:
+            return f"({float(reference_point[0]):.7f}, {float(reference_point[1]):.7f})"
+        return ''
 
+    def write_to_excel_mode_1(self, port, baudrate, timestamp, cep_value, filename="nmea_data_mode_1"):
+        """
+        MODE 1: Write NMEA parsed data, summary statistics (CEP), and individual data points with distances to an Excel file.
+        Also includes a new sheet "Satellites summary" for satellite CNR summary.
+        """
+        try:
+            summary_data = {
+                'Port': port,
+                'Baudrate': baudrate,
+                'Reference Point': self.format_reference_point(cep_value['reference_point']),
+                **self.cep_summary(cep_value)
+            }
+            filepath = f"logs/NMEA_{timestamp}/{filename}_{port.replace('/', '_')}_{baudrate}_{timestamp}.xlsx"
+            self.write_excel(filepath, summary_data, cep_value)
         except Exception as e:
             logging.error(f"Error writing to Excel file: {e}")
 
@@ -1221,150 +1273,110 @@ class NMEAData:
         Also includes a new sheet "Satellites summary" for satellite CNR summary.
         """
         try:
-            # Ensure reference point is properly formatted
-            ref_point = cep_value['reference_point']
-            if ref_point:
-                formatted_ref_point = f"({float(ref_point[0]):.7f}, {float(ref_point[1]):.7f})"
-            else:
-                formatted_ref_point = ''
-
-            # Prepare the data for the summary sheet
             summary_data = {
-                'Reference Point': formatted_ref_point,
-                'Number of Data Points': cep_value['num_points'],
-                'CEP50 (m)': cep_value['CEP50'],
-                'CEP68 (m)': cep_value['CEP68'],
-                'CEP90 (m)': cep_value['CEP90'],
-                'CEP95 (m)': cep_value['CEP95'],
-                'CEP99 (m)': cep_value['CEP99'],
+                'Reference Point': self.format_reference_point(cep_value['reference_point']),
+                **self.cep_summary(cep_value)
             }
+            filepath = f"logs/NMEA_{timestamp}/{filename}_{timestamp}.xlsx"
+            self.write_excel(filepath, summary_data, cep_value)
+        except Exception as e:
+            logging.error(f"Error writing to Excel file: {e}")
 
-            # Create a dataframe for parsed sentences
-            df_parsed = pd.DataFrame(self.parsed_sentences)
-
-            # Create a dataframe for the summary data
-            df_summary = pd.DataFrame([summary_data])
-
-            def deg_to_meters(lat1, lon1, lat2, lon2):
-                lat_dist = (lat1 - lat2) * 111139  # Approximation for meters/degree latitude
-                lon_dist = (lon1 - lon2) * (111139 * np.cos(np.radians(lat1)))  # Latitude dependent
-                return np.sqrt(lat_dist ** 2 + lon_dist ** 2)
-
-            # Create a dataframe for data points with distances and timestamps
-            reference_point = cep_value['reference_point']
-            data_points = []
-            if reference_point:
-                ref_lat, ref_lon = reference_point
-
-                # Collect the data points along with calculated distances
-                for entry in self.parsed_sentences:
-                    if "Latitude" in entry and "Longitude" in entry:
-                        try:
-                            # Convert latitude and longitude to float before calculating distance
-                            lat = float(entry.get("Latitude", "0").split()[0])
-                            lon = float(entry.get("Longitude", "0").split()[0])
-
-                            # Calculate distance from reference point
-                            distance = deg_to_meters(ref_lat, ref_lon, lat, lon)
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Reference (m)": distance
-                            })
-                        except ValueError:
-                            logging.error(f"Invalid data point for latitude/longitude in entry: {entry}")
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Reference (m)": None
-                            })
-            else:
-                # No reference point provided, so use the mean point
-                mean_lat, mean_lon = self.calculate_mean_point()
-
-                for entry in self.parsed_sentences:
-                    if "Latitude" in entry and "Longitude" in entry:
-                        try:
-                            # Convert latitude and longitude to float before calculating distance
-                            lat = float(entry.get("Latitude", "0").split()[0])
-                            lon = float(entry.get("Longitude", "0").split()[0])
-
-                            # Calculate distance from the mean point
-                            distance = deg_to_meters(mean_lat, mean_lon, lat, lon)
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Mean Point (m)": distance  # Change label when using mean
-                            })
-                        except ValueError:
-                            logging.error(f"Invalid data point for latitude/longitude in entry: {entry}")
-                            data_points.append({
-                                "Timestamp": entry.get("Timestamp"),
-                                "Latitude": entry.get("Latitude"),
-                                "Longitude": entry.get("Longitude"),
-                                "Distance from Mean Point (m)": None
-                            })
+    def write_to_excel_mode_1_dynamic(self, port, baudrate, timestamp, cep_value, filename="nmea_data_mode_1"):
+        """
+        MODE 1: Write NMEA parsed data, summary statistics (CEP), and individual data points with distances to an Excel file.
+        Also includes a new sheet "Satellites summary" for satellite CNR summary.
+        """
+        try:
+            summary_data = {
+                'Port': port,
+                'Baudrate': baudrate,
+                **self.cep_summary(cep_value)
+            }
+            filepath = f"logs/NMEA_{timestamp}/{filename}_{port.replace('/', '_')}_{baudrate}_{timestamp}.xlsx"
+            self.write_excel(filepath, summary_data, cep_value)
+        except Exception as e:
+            logging.error(f"Error writing to live mode dynamic test results Excel file: {e}")
 
-            df_data_points = pd.DataFrame(data_points)
+    def write_to_excel_mode_2_dynamic(self, timestamp, cep_value, filename="nmea_data_mode_2"):
+        """
+        MODE 2: Write NMEA parsed data, summary statistics (CEP), and individual data points with distances to an Excel file.
+        Also includes a new sheet "Satellites summary" for satellite CNR summary.
+        """
+        try:
+            summary_data = self.cep_summary(cep_value)
+            filepath = f"logs/NMEA_{timestamp}/{filename}_{timestamp}.xlsx"
+            self.write_excel(filepath, summary_data, cep_value)
+        except Exception as e:
+            logging.error(f"Error writing file mode dynamic results to Excel file: {e}")
 
-            # Create a dataframe for the satellite CNR summary
-            df_sat_summary = pd.DataFrame(self.satellite_info)
+    @staticmethod
+    def cep_summary(cep_value):
+        # CEP columns shared by every summary sheet
+        return {
+            'Number of Data Points': cep_value['num_points'],
+            'CEP50 (m)': cep_value['CEP50'],
+            'CEP68 (m)': cep_value['CEP68'],
+            'CEP90 (m)': cep_value['CEP90'],
+            'CEP95 (m)': cep_value['CEP95'],
+            'CEP99 (m)': cep_value['CEP99'],
+        }
 
-            # Default statistics for satellites
-            df_sat_summary_stats = pd.DataFrame()  # Initialize to avoid 'referenced before assignment'
+    @timed('write_to_excel')
+    def write_excel(self, filepath, summary_data, cep_value):
+        """
+        Write parsed sentences, the CEP summary, per-fix data points and satellite summaries to an Excel file.
 
-            # Calculate satellite statistics for the "Satellites summary" sheet
-            if not df_sat_summary.empty:
-                avg_cnr = df_sat_summary["CNR (SNR) (dB)"].mean()
-                min_cnr = df_sat_summary["CNR (SNR) (dB)"].min()
-                max_cnr = df_sat_summary["CNR (SNR) (dB)"].max()
+        Args:
+            filepath (str): Destination .xlsx path.
+            summary_data (dict): Row written to the "CEP Summary" sheet.
+            cep_value (dict): Result of calculate_cep or calculate_dynamic_cep.
+        """
+        import pandas as pd  # Deferred: pandas and openpyxl are only needed for the export
 
-                # Calculate the number of unique satellites (unique PRNs)
-                unique_prns = df_sat_summary["Satellite PRN"].nunique()
+        # Create dataframes for parsed sentences, the summary and the per-fix data points
+        df_parsed = pd.DataFrame(self.parsed_sentences)
+        df_summary = pd.DataFrame([summary_data])
+        df_data_points = pd.DataFrame(cep_value['data_points'])
 
-                sat_summary_stats = {
-                    "Average CNR (SNR) (dB)": avg_cnr,
-                    "Min CNR (SNR) (dB)": min_cnr,
-                    "Max CNR (SNR) (dB)": max_cnr,
-                    "Total Satellites Tracked": unique_prns
-                }
+        # Create a dataframe for the satellite CNR summary and its statistics
+        df_sat_summary = pd.DataFrame(self.gsv_satellite_info)
+        df_sat_summary_stats = self.calculate_satellite_statistics()
 
-                df_sat_summary_stats = pd.DataFrame([sat_summary_stats])
+        max_rows = 1048576  # Excel row limit
 
-            # Write data to Excel
-            filepath = f"logs/NMEA_{timestamp}/{filename}_{timestamp}.xlsx"
-            max_rows = 1048576  # Excel row limit
+        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            # Write parsed sentences, splitting across multiple sheets if necessary
+            for i in range(0, len(df_parsed), max_rows):
+                chunk = df_parsed.iloc[i:i + max_rows]
+                chunk.to_excel(writer, index=False, sheet_name=f"Parsed_{i // max_rows + 1}")
 
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Write parsed sentences, splitting across multiple sheets if necessary
-                for i in range(0, len(df_parsed), max_rows):
-                    chunk = df_parsed.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"Parsed_{i // max_rows + 1}")
+            # Write summary data to a new sheet called "CEP Summary"
+            df_summary.to_excel(writer, index=False, sheet_name="CEP Summary")
 
-                # Write summary data to a new sheet called "CEP Summary"
-                df_summary.to_excel(writer, index=False, sheet_name="CEP Summary")
+            # Write data points with distances, splitting across multiple sheets if necessary
+            for i in range(0, len(df_data_points), max_rows):
+                chunk = df_data_points.iloc[i:i + max_rows]
+                chunk.to_excel(writer, index=False, sheet_name=f"DataPoints_{i // max_rows + 1}")
 
-                # Write data points with distances, splitting across multiple sheets if necessary
-                for i in range(0, len(df_data_points), max_rows):
-                    chunk = df_data_points.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"DataPoints_{i // max_rows + 1}")
+            # Write satellite summary, splitting if necessary
+            for i in range(0, len(df_sat_summary), max_rows):
+                chunk = df_sat_summary.iloc[i:i + max_rows]
+                chunk.to_excel(writer, index=False, sheet_name=f"SatSummary_{i // max_rows + 1}")
 
-                # Write satellite summary, splitting if necessary
-                for i in range(0, len(df_sat_summary), max_rows):
-                    chunk = df_sat_summary.iloc[i:i + max_rows]
-                    chunk.to_excel(writer, index=False, sheet_name=f"SatSummary_{i // max_rows + 1}")
+            # Write satellite summary statistics (if any)
+            if not df_sat_summary_stats.empty:
+                df_sat_summary_stats.to_excel(writer, index=False, sheet_name="SatSummaryStats")
 
-                # Write satellite summary statistics (if any)
-                if not df_sat_summary_stats.empty:
-                    df_sat_summary_stats.to_excel(writer, index=False, sheet_name="SatSummaryStats")
+            # Write the corrupt-line accounting of the input (if any)
+            if self.line_integrity:
+                pd.DataFrame(self.line_integrity).to_excel(writer, index=False, sheet_name="Line Integrity")
 
-            logging.info(f"Data written to {filepath}")
+            # Write additional analysis tables (e.g. dynamic motion errors), one sheet each
+            for sheet_name, table in cep_value.get('tables', {}).items():
+                pd.DataFrame(table).to_excel(writer, index=False, sheet_name=sheet_name)
 
-        except Exception as e:
-            logging.error(f"Error writing to Excel file: {e}")
+        logging.info(f"Data written to {filepath}")
 
     @staticmethod
     def setup_logging(log_folder, timestamp):
@@ -1391,4 +1403,4 @@ class NMEAData:
             ]
         )
 
-        logging.info(f"Console logging setup complete. Logs are being saved to {log_file}")
\ No newline at end of file
+        logging.info(f"Console logging setup complete. Logs are being saved to {log_file}")
@@ -0,0 +1,381 @@
+# pipeline.py
+import logging
+import os
+
+from .dynamic import (calculate_motion_errors, calculate_track_errors, estimate_latency,
+                      latency_corrected_distances)
+from .extract import scan_sentences, scan_window
+from .fix_events import detect_fix_events
+from .ingest import log_name, notify, parse_nmea_from_log, parse_nmea_lines
+from .live import read_serial_nmea
+from .rolling import DEFAULT_ROLLING_WINDOW_S, rolling_cep, rolling_stability
+
+
+def report_cep(cep_value, heading, subject, on_message=None):
+    """
+    Log the CEP statistics of a run and forward them to the front-end.
+
+    Args:
+        cep_value (dict): Result of calculate_cep or calculate_dynamic_cep, or None.
+        heading (str): First line of the report (e.g. "Mode 2: CEP statistics for logfile x:").
+        subject (str): Port or log the statistics belong to, used when no coordinates are available.
+        on_message (callable, optional): Callback receiving the report lines.
+    """
+    if cep_value:
+        notify(heading, on_message)
+        for key in ('CEP50', 'CEP68', 'CEP90', 'CEP95', 'CEP99'):
+            notify(f"{key}: {cep_value[key]:.2f} meters", on_message)
+    else:
+        notify(f"No coordinates available for CEP calculation for {subject}.", on_message)
+
+
+def report_satellite_statistics(nmea_data, subject, on_message=None):
+    """
+    Calculate the GSV satellite statistics of a run, log them and forward them to the front-end.
+
+    Args:
+        nmea_data (NMEAData): Accumulated data of the run.
+        subject (str): Port or log the statistics belong to.
+        on_message (callable, optional): Callback receiving the report lines.
+
+    Returns:
+        pd.DataFrame: Satellite statistics (empty if no GSV data was available).
+    """
+    gsv_sats_summary_stats = nmea_data.calculate_satellite_statistics()
+
+    if not gsv_sats_summary_stats.empty:
+        # Extract statistics for logging
+        stats = gsv_sats_summary_stats.iloc[0]
+
+        notify(f"GSV Satellite Statistics for {subject}:", on_message)
+        notify(f"Average CNR (SNR) (dB): {stats['Average CNR (SNR) (dB)']:.2f}", on_message)
+        notify(f"Minimum CNR (SNR) (dB): {stats['Min CNR (SNR) (dB)']:.2f}", on_message)
+        notify(f"Maximum CNR (SNR) (dB): {stats['Max CNR (SNR) (dB)']:.2f}", on_message)
+        notify(f"Total Satellites Tracked: {stats['Total Satellites Tracked']}", on_message)
+    else:
+        notify(f"No GSV satellite information available for statistics calculation for {subject}.", on_message)
+
+    return gsv_sats_summary_stats
+
+
+def load_nmea_log(file_path, stop_event=None, on_message=None, quarantine_path=None, extract=None,
+                  sentence_filter=None, window=None):
+    """
+    Parse a pre-collected NMEA log file into an NMEAData accumulator.
+
+    With extract, the log is filtered by the extractor while it is parsed: the selected sentences are
+    piped from extract.scan_sentences straight into the parser in one pass over the raw log, without an
+    intermediate file. With window (the time bounds of a fix filter) and an up-to-date sidecar index
+    (see log_index), only the part of the log around the window is read; the line integrity report then
+    covers that part only.
+
+    Args:
+        file_path (str): Path to the NMEA log file.
+        stop_event (threading.Event, optional): Event to signal processing to stop.
+        on_message (callable, optional): Callback receiving progress messages.
+        quarantine_path (str, optional): File receiving the lines rejected by the pre-validation.
+        extract (dict, optional): Keyword arguments of extract.scan_sentences ('types', and optionally
+            'start', 'end', 'decimate'). Only for text logs (.txt/.log/.nmea, optionally compressed).
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip, checked on every line
+            before it is validated and parsed. Works for every log format.
+        window (tuple, optional): (start, end) UTC times of day (datetime.time or None) of the fix filter the
+            data will be trimmed to (see extract.scan_window). Ignored with extract.
+
+    Returns:
+        NMEAData: Parsed data, or None if the file is missing, empty or the run was stopped.
+    """
+    # Check if the file exists
+    if not os.path.exists(file_path):
+        notify(f"File does not exist: {file_path}", on_message, logging.ERROR)
+        return None
+
+    indexed_window = scan_window(file_path, *window) if window and not extract else None
+    try:
+        if indexed_window is not None:
+            notify(f"Reading the indexed time window of log file: {file_path}", on_message)
+            window_lines, first_day = indexed_window
+            parsed_sentences, nmea_data = parse_nmea_lines(window_lines, file_path, on_message, stop_event,
+                                                           quarantine_path, sentence_filter, first_day)
+        elif extract:
+            notify(f"Extracting {', '.join(extract['types'])} sentences from log file: {file_path}", on_message)
+            parsed_sentences, nmea_data = parse_nmea_lines(scan_sentences(file_path, **extract), file_path,
+                                                           on_message, stop_event, quarantine_path, sentence_filter)
+        else:
+            parsed_sentences, nmea_data = parse_nmea_from_log(file_path, on_message, stop_event, quarantine_path,
+                                                              sentence_filter)
+    except Exception as e:
+        notify(f"Error during parsing NMEA log file: {file_path}. Exception: {e}", on_message, logging.ERROR)
+        return None
+
+    if stop_event and stop_event.is_set():  # Partial results are discarded when the user stops the run
+        notify(f"Stop signal received for {file_path}.", on_message)
+        return None
+
+    if not parsed_sentences:
+        notify(f"No valid NMEA sentences found in log file: {file_path}", on_message, logging.ERROR)
+        return None
+
+    return nmea_data
+
+
+def analyze_fix_events(nmea_data, cep_value, subject, on_message=None):
+    """
+    Detect TTFF, convergence and fix dropout events of a device and add them to its CEP result.
+
+    The summary is stored in cep_value['convergence'] (metric -> value) and exported as the 'Convergence'
+    and 'Fix Events' sheets.
+    """
+    fix_events = detect_fix_events(nmea_data.fixes)
+    if fix_events is None:
+        return
+
+    summary = dict(zip(fix_events['summary']["Metric"], fix_events['summary']["Value"]))
+    cep_value['convergence'] = summary
+    cep_value.setdefault('tables', {})["Convergence"] = fix_events['summary']
+    cep_value['tables']["Fix Events"] = fix_events['events']
+
+    notify(f"Fix events for {subject}: TTFF {summary['Time to First Fix (s)']:.1f} s, "
+           f"time to RTK fixed {summary['Time to RTK Fixed (s)']:.1f} s, "
+           f"{summary['Fix Dropouts']:.0f} fix dropouts, {summary['RTK Fixed Losses']:.0f} RTK fixed losses",
+           on_message)
+
+
+def analyze_rolling_cep(cep_value, subject, rolling_window=None, on_message=None):
+    """
+    Add the rolling CEP50/CEP95 series and its stability metrics to a CEP result.
+
+    The series is stored in cep_value['rolling_cep'] and added to the per-fix data points, so it is
+    plotted by the GUI and exported with every fix. The stability metrics are stored in
+    cep_value['rolling_stability'] and exported as the 'Rolling CEP' sheet.
+
+    Args:
+        cep_value (dict): Result of calculate_cep or calculate_dynamic_cep.
+        subject (str): Port or log the statistics belong to.
+        rolling_window (dict, optional): 'window_s' (seconds) or 'window_epochs' (fixes) of the trailing window.
+            Defaults to DEFAULT_ROLLING_WINDOW_S seconds.
+        on_message (callable, optional): Callback receiving the report lines.
+    """
+    rolling_window = rolling_window or {}
+    rolling = rolling_cep(cep_value['distances'], cep_value['epoch_ns'], **rolling_window)
+    stability = rolling_stability(rolling)
+
+    cep_value['rolling_cep'] = rolling
+    cep_value['rolling_stability'] = stability
+    for name, values in rolling.items():
+        cep_value['data_points'][f"Rolling {name} (m)"] = values
+
+    if rolling_window.get('window_epochs'):
+        window = f"{rolling_window['window_epochs']} fixes"
+    else:
+        window = f"{rolling_window.get('window_s') or DEFAULT_ROLLING_WINDOW_S:g} s"
+    cep_value.setdefault('tables', {})["Rolling CEP"] = {"Metric": ["Window", *stability],
+                                                         "Value": [window, *stability.values()]}
+
+    notify(f"Rolling CEP95 ({window}) for {subject}: median {stability['Rolling CEP95 Median (m)']:.2f} m, "
+           f"worst window {stability['Rolling CEP95 Max (m)']:.2f} m", on_message)
+
+
+def analyze_static(nmea_data, reference_point, heading, subject, on_message=None, rolling_window=None):
+    """
+    Calculate and report CEP against a fixed reference point (or the mean point if none is given).
+
+    Fix events and the rolling CEP are added to the result (see analyze_fix_events and analyze_rolling_cep).
+
+    Returns:
+        dict: CEP result, or None if no coordinates are available.
+    """
+    if reference_point is None:
+        notify("Calculating the mean point from log data for CEP Analysis.", on_message)
+    else:
+        notify(f"Using provided reference point: {reference_point}", on_message)
+
+    cep_value = nmea_data.calculate_cep(reference_point)
+    report_cep(cep_value, heading, subject, on_message)
+    if cep_value:
+        analyze_fix_events(nmea_data, cep_value, subject, on_message)
+        analyze_rolling_cep(cep_value, subject, rolling_window, on_message)
+    return cep_value
+
+
+def report_error_table(title, table, on_message=None):
+    """
+    Log a percentile table of dynamic errors and forward it to the front-end.
+
+    Args:
+        title (str): First line of the report.
+        table (dict): Table built by dynamic.error_percentile_table.
+        on_message (callable, optional): Callback receiving the report lines.
+    """
+    notify(title, on_message)
+    for row, metric in enumerate(table["Metric"]):
+        if not table["Epochs"][row]:
+            notify(f"{metric}: no matched epochs", on_message)
+            continue
+        notify(f"{metric}: mean {table['Mean Error'][row]:.2f}, P50 {table['P50 |Error|'][row]:.2f}, "
+               f"P95 {table['P95 |Error|'][row]:.2f} over {table['Epochs'][row]} epochs", on_message)
+
+
+def analyze_latency(nmea_data, reference_fixes, cep_value, subject, latency_correction=False, on_message=None):
+    """
+    Estimate the latency of a device against the reference and optionally re-score CEP with it removed.
+
+    The estimate is stored in cep_value['latency']. With latency_correction, the CEP of the fixes scored
+    against the reference at (fix time - latency) is added under cep_value['latency_corrected_cep'].
+    Both are exported as a 'Latency' sheet.
+    """
+    latency = estimate_latency(nmea_data.fixes, reference_fixes)
+    if latency is None:
+        notify(f"Latency of {subject} not observable: the reference is not moving long enough.", on_message)
+        return
+
+    cep_value['latency'] = latency
+    notify(f"Estimated latency of {subject}: {latency['latency_s'] * 1000:.0f} ms "
+           f"(RMS error {latency['rms_error_unshifted_m']:.2f} m -> {latency['rms_error_m']:.2f} m over "
+           f"{latency['moving_epochs']} moving epochs)", on_message)
+
+    rows = {"Estimated Latency (s)": latency['latency_s'],
+            "RMS Error Unshifted (m)": latency['rms_error_unshifted_m'],
+            "RMS Error at Latency (m)": latency['rms_error_m'],
+            "Moving Epochs": latency['moving_epochs']}
+
+    if latency_correction:
+        distances = latency_corrected_distances(nmea_data.fixes, reference_fixes, latency['latency_s'])
+        if len(distances):
+            corrected = nmea_data.cep_percentiles(distances)
+            cep_value['latency_corrected_cep'] = corrected
+            report_cep(corrected, f"Latency-corrected CEP statistics for {subject}:", subject, on_message)
+            rows.update({f"Latency-Corrected {key} (m)": value for key, value in corrected.items()})
+
+    cep_value.setdefault('tables', {})["Latency"] = {"Metric": list(rows), "Value": list(rows.values())}
+
+
+def analyze_dynamic(nmea_data, reference_fixes, heading, subject, on_message=None, reference_motion=None,
+                    latency_correction=False, rolling_window=None):
+    """
+    Calculate and report CEP against a moving reference, matched epoch by epoch.
+
+    The horizontal error is also split into along-track and cross-track components, added to the per-fix
+    data points and summarised under 'tables'. If the reference motion data is given, speed, course, heading
+    and altitude errors are scored as well and added under 'motion_errors', with their percentile table
+    under 'tables' for the export. The latency against the reference is always estimated; with
+    latency_correction the CEP is re-scored with it removed (see analyze_latency). Fix events (TTFF,
+    convergence, dropouts) and the rolling CEP are added as well (see analyze_fix_events and
+    analyze_rolling_cep).
+
+    Returns:
+        dict: CEP result, or None if no epochs could be matched.
+    """
+    cep_value = nmea_data.calculate_dynamic_cep(reference_fixes)
+    report_cep(cep_value, heading, subject, on_message)
+
+    if cep_value:
+        # Along/cross-track split against the reference track tangent, also added to the per-fix data points
+        track_errors = calculate_track_errors(cep_value, reference_fixes)
+        cep_value['data_points'].update(track_errors['errors'])
+        cep_value.setdefault('tables', {})["Track Errors"] = track_errors['table']
+        report_error_table(f"Along-track/cross-track errors for {subject}:", track_errors['table'], on_message)
+
+    if cep_value and reference_motion is not None:
+        motion_errors = calculate_motion_errors(nmea_data.fixes, nmea_data.motion, reference_fixes, reference_motion)
+        cep_value['motion_errors'] = motion_errors['errors']
+        cep_value.setdefault('tables', {})["Motion Errors"] = motion_errors['table']
+        report_error_table(f"Speed/course/heading/altitude errors for {subject}:", motion_errors['table'],
+                           on_message)
+
+    if cep_value:
+        analyze_latency(nmea_data, reference_fixes, cep_value, subject, latency_correction, on_message)
+        analyze_fix_events(nmea_data, cep_value, subject, on_message)
+        analyze_rolling_cep(cep_value, subject, rolling_window, on_message)
+
+    return cep_value
+
+
+def process_nmea_log(file_path, timestamp, reference_point=None, stop_event=None, on_message=None, extract=None,
+                     sentence_filter=None):
+    """
+    Process pre-collected NMEA log file: parse, calculate CEP and satellite statistics, and export to Excel.
+
+    Args:
+        file_path (str): Path to the NMEA log file.
+        timestamp (str): Timestamp of the run, selects the logs/NMEA_<timestamp> output folder.
+        reference_point (tuple, optional): Custom reference point (latitude, longitude). Defaults to None.
+        stop_event (threading.Event, optional): Event to signal processing to stop.
+        on_message (callable, optional): Callback receiving progress messages.
+        extract (dict, optional): Parse only the sentences selected by the extractor (see load_nmea_log).
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip (see load_nmea_log).
+
+    Returns:
+        dict: 'name', 'nmea_data', 'cep_value' and 'satellite_stats' of the run, or None on failure.
+    """
+    filename = log_name(file_path)
+    notify(f"Starting log processing for file: {filename} at {timestamp}", on_message)
+
+    # Ensure log folder exists
+    os.makedirs(f"logs/NMEA_{timestamp}", exist_ok=True)
+
+    quarantine_path = f"logs/NMEA_{timestamp}/{filename}_quarantine_{timestamp}.txt"
+    nmea_data = load_nmea_log(file_path, stop_event, on_message, quarantine_path, extract, sentence_filter)
+    if nmea_data is None:
+        return None
+
+    try:
+        cep_value = analyze_static(nmea_data, reference_point, f"Mode 2: CEP statistics for logfile {filename}:",
+                                   f"log {file_path}", on_message)
+    except Exception as e:
+        notify(f"Error calculating CEP values: {e}", on_message, logging.ERROR)
+        return None
+
+    try:
+        satellite_stats = report_satellite_statistics(nmea_data, f"file {filename}", on_message)
+    except Exception as e:
+        notify(f"Error calculating GSV Satellite Statistics: {e}", on_message, logging.ERROR)
+        satellite_stats = None
+
+    notify(f"Finished log processing for file: {filename}", on_message)
+
+    # Write results to an Excel file
+    nmea_data.write_to_excel_mode_2(timestamp, cep_value, filename)
+
+    return {'name': filename, 'nmea_data': nmea_data, 'cep_value': cep_value, 'satellite_stats': satellite_stats}
+
+
+def run_live_capture(port, baudrate, timeout, duration, log_folder, timestamp, reference_point=None, stop_event=None,
+                     on_message=None, capture=None, metrics=None, sentence_filter=None):
+    """
+    Capture live NMEA data from a serial port, then calculate CEP and satellite statistics and export to Excel.
+
+    Args:
+        port (str): Serial port to read from (e.g., "COM3").
+        baudrate (int): Baud rate for serial communication.
+        timeout (float): Timeout for serial port reads (in seconds).
+        duration (float): Duration to read data (in seconds).
+        log_folder (str): Directory to save log files.
+        timestamp (str): Timestamp to append to file names.
+        reference_point (tuple, optional): Custom reference point for CEP calculation.
+        stop_event (threading.Event, optional): Event to signal the function to stop.
+        on_message (callable, optional): Callback receiving progress messages.
+        capture (dict, optional): Raw capture options (rotation, compression), see RawCaptureWriter.
+        metrics (LiveMetrics, optional): Live metrics surface; its current CEP uses reference_point too.
+        sentence_filter (SentenceFilter, optional): Sentence types to parse or skip (see read_serial_nmea).
+
+    Returns:
+        dict: 'name', 'nmea_data', 'cep_value' and 'satellite_stats' of the run, or None on failure.
+    """
+    if metrics is not None:
+        metrics.device(port, baudrate, reference_point)
+    nmea_data = read_serial_nmea(port, baudrate, timeout, duration, log_folder, timestamp, stop_event, on_message,
+                                 capture, metrics, sentence_filter=sentence_filter)
+    if nmea_data is None:
+        return None
+
+    cep_value = nmea_data.calculate_cep(reference_point)
+    report_cep(cep_value, f"Mode 1: CEP statistics for port {port}:", f"port {port}", on_message)
+    if cep_value:
+        analyze_fix_events(nmea_data, cep_value, f"port {port}", on_message)
+        analyze_rolling_cep(cep_value, f"port {port}", on_message=on_message)
+    satellite_stats = report_satellite_statistics(nmea_data, f"port {port}", on_message)
+
+    # Save parsed data to Excel
+    nmea_data.write_to_excel_mode_1(port, baudrate, timestamp, cep_value)
+
+    return {'name': port, 'nmea_data': nmea_data, 'cep_value': cep_value, 'satellite_stats': satellite_stats}
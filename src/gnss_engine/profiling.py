@@ -0,0 +1,262 @@
+# profiling.py
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+PROFILE_ENV = 'GNSS_PROFILE'  # "1": stage timers, "cprofile" / "pyinstrument": timers and a profiler capture
+CAPTURES = ('cprofile', 'pyinstrument')
+CPROFILE_TOP = 60  # Functions listed in the text summary of a cProfile capture
+
+_OFF = nullcontext()  # What stage() returns while instrumentation is off: entering it costs next to nothing
+_active = None  # Instrumentation of the run in progress, or None
+
+
+class Instrumentation:
+    """
+    Stage timers and counters of one run.
+
+    Times are wall-clock and inclusive: a stage nested in another (e.g. add_sentence_data inside
+    parse_nmea_from_log) is counted in both. Stages of devices processed in parallel threads add up, so
+    their totals can exceed the wall time of the run. Thread-safe.
+    """
+
+    def __init__(self):
+        self.timers = {}  # Stage -> [calls, total seconds, longest call in seconds]
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name, seconds, calls=1):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [calls, seconds, seconds]
+            else:
+                timer[0] += calls
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def add_count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        """Timers and counters as plain data (picklable, e.g. to return them from a worker process)."""
+        with self._lock:
+            return {'timers': {name: list(timer) for name, timer in self.timers.items()},
+                    'counters': dict(self.counters)}
+
+    def merge(self, snapshot):
+        """Add the timers and counters of another run (e.g. a batch worker) to this one."""
+        with self._lock:
+            for name, (calls, total, longest) in snapshot['timers'].items():
+                timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+                timer[0] += calls
+                timer[1] += total
+                timer[2] = max(timer[2], longest)
+            for name, n in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, wall_s, title="Timing report"):
+        """
+        Format the timers (slowest first) and counters as a text table.
+
+        Args:
+            wall_s (float): Wall time of the run, for the share of every stage.
+            title (str): First line of the report.
+
+        Returns:
+            str: The report.
+        """
+        lines = [f"{title} (wall time {wall_s:.3f} s)", "",
+                 f"{'Stage':<34}{'Calls':>12}{'Total (s)':>12}{'Mean (ms)':>12}{'Max (ms)':>12}{'% of wall':>11}"]
+        for name, (calls, total, longest) in sorted(self.snapshot()['timers'].items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<34}{calls:>12}{total:>12.3f}{1000 * total / calls:>12.3f}{1000 * longest:>12.3f}"
+                         f"{100 * total / wall_s if wall_s else 0:>10.1f}%")
+        if self.counters:
+            lines += ["", "Counters"]
+            lines += [f"  {name}: {n}" for name, n in sorted(self.counters.items())]
+        lines.append("")
+        lines.append("Times are inclusive (nested stages count in their parents too); parallel devices add up.")
+        return "\n".join(lines) + "\n"
+
+
+class _Stage:
+    # Timer of one entry into a stage
+    __slots__ = ('instrumentation', 'name', 'start')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name):
+    """
+    Context manager timing a stage of the current run (a shared no-op while instrumentation is off).
+
+    Usage:
+        with stage('calculate_cep'):
+            ...
+    """
+    instrumentation = _active
+    return _OFF if instrumentation is None else _Stage(instrumentation, name)
+
+
+def timed(name):
+    """Decorator timing every call of a function as a stage (see stage)."""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Add n to a counter of the current run (nothing while instrumentation is off)."""
+    instrumentation = _active
+    if instrumentation is not None:
+        instrumentation.add_count(name, n)
+
+
+def is_enabled():
+    """Whether a run is being instrumented."""
+    return _active is not None
+
+
+def start_instrumentation():
+    """Switch the stage timers on in this process (batch workers; front-ends use profile_run)."""
+    global _active
+    _active = Instrumentation()
+    return _active
+
+
+def collect_instrumentation():
+    """Return the timers and counters gathered since the last collection and start over (batch workers)."""
+    global _active
+    if _active is None:
+        return None
+    snapshot = _active.snapshot()
+    _active = Instrumentation()
+    return snapshot
+
+
+def merge_instrumentation(snapshot):
+    """Add timers and counters collected elsewhere (a batch worker) to the current run."""
+    instrumentation = _active
+    if instrumentation is not None and snapshot:
+        instrumentation.merge(snapshot)
+
+
+def profile_setting():
+    """
+    Instrumentation requested through the GNSS_PROFILE environment variable.
+
+    Returns:
+        tuple: (enabled, capture) -- capture is 'cprofile', 'pyinstrument' or None.
+    """
+    setting = os.environ.get(PROFILE_ENV, '').strip().lower()
+    enabled = setting not in ('', '0', 'off', 'false', 'no')
+    return enabled, setting if setting in CAPTURES else None
+
+
+def _start_capture(capture):
+    # Start a profiler for the calling thread, or return None
+    if capture == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    if capture == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logging.warning("pyinstrument is not installed (pip install pyinstrument); only stage timers are recorded.")
+            return None
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+    if capture:
+        raise ValueError(f"Unsupported profiler: {capture}. Supported profilers: {', '.join(CAPTURES)}")
+    return None
+
+
+def _write_capture(profiler, capture, log_folder, timestamp):
+    # Stop the profiler and write its results next to the timing report
+    if capture == 'cprofile':
+        import io
+        import pstats
+        profiler.disable()
+        profile_path = os.path.join(log_folder, f"cprofile_{timestamp}.prof")
+        profiler.dump_stats(profile_path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(CPROFILE_TOP)
+        with open(os.path.join(log_folder, f"cprofile_{timestamp}.txt"), 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        logging.info(f"cProfile capture written to {profile_path} (open with snakeviz or pstats)")
+    else:
+        profiler.stop()
+        profile_path = os.path.join(log_folder, f"pyinstrument_{timestamp}.html")
+        with open(profile_path, 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+        logging.info(f"pyinstrument capture written to {profile_path}")
+
+
+@contextmanager
+def profile_run(log_folder, timestamp, enabled=None, capture=None, title=None):
+    """
+    Instrument a run and write its timing report to "<log_folder>/timing_report_<timestamp>.txt".
+
+    Instrumentation is opt-in: without enabled, the GNSS_PROFILE environment variable decides ("1" for the
+    stage timers, "cprofile" or "pyinstrument" to also capture a profile), and the run is left untouched
+    when it is not set. A profiler capture covers the thread that enters profile_run; threads it starts
+    (e.g. one per device) are covered by the stage timers only. Runs started while one is already being
+    instrumented are reported as part of it. Reports of several runs with the same timestamp are appended.
+
+    Args:
+        log_folder (str): Output folder of the run (logs/NMEA_<timestamp>).
+        timestamp (str): Timestamp of the run.
+        enabled (bool, optional): Switch instrumentation on or off regardless of GNSS_PROFILE.
+        capture (str, optional): 'cprofile' or 'pyinstrument' (with enabled).
+        title (str, optional): First line of the report.
+
+    Yields:
+        Instrumentation: The timers of the run, or None if it is not instrumented.
+    """
+    global _active
+    if enabled is None:
+        enabled, capture = profile_setting()
+    if not enabled or _active is not None:
+        yield _active
+        return
+
+    profiler = _start_capture(capture)
+    instrumentation = _active = Instrumentation()
+    start = time.perf_counter()
+    try:
+        yield instrumentation
+    finally:
+        wall_s = time.perf_counter() - start
+        _active = None
+        os.makedirs(log_folder, exist_ok=True)
+        try:
+            if profiler is not None:
+                _write_capture(profiler, capture, log_folder, timestamp)
+            report_path = os.path.join(log_folder, f"timing_report_{timestamp}.txt")
+            with open(report_path, 'a', encoding='utf-8') as f:
+                f.write(instrumentation.report(wall_s, title or f"Timing report of run {timestamp}") + "\n")
+            logging.info(f"Timing report written to {report_path}")
+        except OSError as e:
+            logging.error(f"Error writing the timing report: {e}")
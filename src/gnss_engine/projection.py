@@ -0,0 +1,99 @@
+# projection.py
+import numpy as np
+
+# WGS84 ellipsoid parameters
+WGS84_A = 6378137.0  # Semi-major axis (m)
+WGS84_F = 1 / 298.257223563  # Flattening
+WGS84_E2 = WGS84_F * (2 - WGS84_F)  # First eccentricity squared
+
+
+def geodetic_to_ecef(lat, lon, alt=0.0):
+    """
+    Convert geodetic coordinates to Earth-Centred Earth-Fixed (ECEF) coordinates.
+
+    Args:
+        lat (array-like): Latitude(s) in decimal degrees.
+        lon (array-like): Longitude(s) in decimal degrees.
+        alt (array-like): Height(s) above the ellipsoid in meters.
+
+    Returns:
+        tuple: (x, y, z) numpy arrays in meters.
+    """
+    lat_rad = np.radians(np.asarray(lat, dtype=float))
+    lon_rad = np.radians(np.asarray(lon, dtype=float))
+    alt = np.asarray(alt, dtype=float)
+
+    sin_lat = np.sin(lat_rad)
+    cos_lat = np.cos(lat_rad)
+
+    # Prime vertical radius of curvature
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+
+    x = (n + alt) * cos_lat * np.cos(lon_rad)
+    y = (n + alt) * cos_lat * np.sin(lon_rad)
+    z = (n * (1 - WGS84_E2) + alt) * sin_lat
+    return x, y, z
+
+
+def geodetic_to_enu(lat, lon, alt, ref_lat, ref_lon, ref_alt=0.0):
+    """
+    Project geodetic coordinates into a local East/North/Up frame about a reference.
+
+    The reference may be a single point (static tests) or an array of points of the same
+    length as the input (dynamic tests), in which case each fix is projected about its own
+    reference epoch.
+
+    Args:
+        lat (array-like): Latitude(s) in decimal degrees.
+        lon (array-like): Longitude(s) in decimal degrees.
+        alt (array-like): Height(s) in meters.
+        ref_lat (array-like): Reference latitude(s) in decimal degrees.
+        ref_lon (array-like): Reference longitude(s) in decimal degrees.
+        ref_alt (array-like): Reference height(s) in meters.
+
+    Returns:
+        tuple: (east, north, up) numpy arrays in meters.
+    """
+    x, y, z = geodetic_to_ecef(lat, lon, alt)
+    ref_x, ref_y, ref_z = geodetic_to_ecef(ref_lat, ref_lon, ref_alt)
+    dx, dy, dz = x - ref_x, y - ref_y, z - ref_z
+
+    ref_lat_rad = np.radians(np.asarray(ref_lat, dtype=float))
+    ref_lon_rad = np.radians(np.asarray(ref_lon, dtype=float))
+    sin_lat, cos_lat = np.sin(ref_lat_rad), np.cos(ref_lat_rad)
+    sin_lon, cos_lon = np.sin(ref_lon_rad), np.cos(ref_lon_rad)
+
+    # Rotate the ECEF offsets into the local tangent plane of the reference
+    east = -sin_lon * dx + cos_lon * dy
+    north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+    up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+    return east, north, up
+
+
+def horizontal_error(east, north):
+    """
+    Horizontal (2D) error magnitude for ENU offsets.
+
+    Args:
+        east (array-like): East offsets in meters.
+        north (array-like): North offsets in meters.
+
+    Returns:
+        numpy.ndarray: Horizontal distances in meters.
+    """
+    return np.hypot(east, north)
+
+
+def distance_between(point1, point2):
+    """
+    Horizontal distance between two (lat, lon) points using the local ENU projection.
+
+    Args:
+        point1 (tuple): (latitude, longitude) of the reference point.
+        point2 (tuple): (latitude, longitude) of the second point.
+
+    Returns:
+        float: Distance in meters.
+    """
+    east, north, _ = geodetic_to_enu(point2[0], point2[1], 0.0, point1[0], point1[1], 0.0)
+    return float(horizontal_error(east, north))
@@ -0,0 +1,169 @@
+# query.py
+import datetime
+
+import numpy as np
+
+from .fix_store import DAY_NS
+from .nmea_data import NMEAData
+
+# Standard DOP ratings: (upper bound, label). Each bucket covers (previous bound, bound].
+HDOP_BUCKETS = ((1.0, "Ideal"), (2.0, "Excellent"), (5.0, "Good"), (10.0, "Moderate"), (20.0, "Fair"),
+                (np.inf, "Poor"))
+
+
+class FixQuery:
+    """
+    Indexed filters over the fixes of one parsed session.
+
+    The index is built once per session: a sorted time index over the fix epochs, and one boolean mask
+    per GGA quality value, satellite count and HDOP bucket. A query combines those masks with a
+    binary-searched time window, so CEP, satellite statistics and exports can be recomputed for any
+    filter ("RTK fixed between 10:00 and 10:30", "skip the first 5 minutes") without re-parsing the log.
+
+    Example:
+        query = FixQuery(nmea_data)
+        rtk = query.select(start=datetime.time(10, 0), end=datetime.time(10, 30), gps_qual=4)
+        cep_value = rtk.calculate_cep()
+    """
+
+    def __init__(self, nmea_data):
+        self.nmea_data = nmea_data
+        fixes = nmea_data.fixes
+
+        # Sorted time index (epochs are in arrival order, which is not guaranteed to be time order)
+        self.epoch_ns = fixes.epoch_ns
+        self._order = np.argsort(self.epoch_ns, kind='stable')
+        self._sorted_epochs = self.epoch_ns[self._order]
+        known = self._sorted_epochs >= 0
+        self.first_epoch_ns = int(self._sorted_epochs[known][0]) if known.any() else -1
+
+        # One mask per distinct value of each indexed column
+        gps_qual = fixes.gps_qual
+        num_sats = fixes.num_sats
+        hdop_bucket = np.searchsorted([bound for bound, _ in HDOP_BUCKETS], fixes.hdop, side='left')
+        hdop_bucket[np.isnan(fixes.hdop)] = -1  # Unknown HDOP never matches a bucket
+        self.quality_masks = {int(value): gps_qual == value for value in np.unique(gps_qual)}
+        self.satellite_masks = {int(value): num_sats == value for value in np.unique(num_sats)}
+        self.hdop_masks = {HDOP_BUCKETS[bucket][1]: hdop_bucket == bucket for bucket in np.unique(hdop_bucket)
+                           if bucket >= 0}
+
+    def __len__(self):
+        return len(self.epoch_ns)
+
+    def to_epoch_ns(self, value, not_before_ns=None):
+        """
+        Resolve a time bound to an epoch on the session's timeline.
+
+        Args:
+            value (int | datetime.datetime | datetime.time): Epoch in nanoseconds, UTC datetime (needs a dated
+                session, see EpochClock) or UTC time of day. A time of day resolves to its first occurrence at
+                or after not_before_ns.
+            not_before_ns (int, optional): Lower bound for time-of-day values. Defaults to the first fix.
+
+        Returns:
+            int: Epoch in nanoseconds.
+        """
+        clock = self.nmea_data.clock
+        if isinstance(value, datetime.datetime):
+            if not clock.dated:
+                raise ValueError("Date-time bounds need a dated session (RMC or ZDA); use a time of day instead.")
+            since_day_0 = value.replace(tzinfo=None) - datetime.datetime.combine(clock.base_date, datetime.time())
+            return clock.base_ns + since_day_0 // datetime.timedelta(microseconds=1) * 1000
+        if isinstance(value, datetime.time):
+            if not_before_ns is None:
+                not_before_ns = max(self.first_epoch_ns, 0)
+            time_ns = ((value.hour * 3600 + value.minute * 60 + value.second) * 1_000_000 + value.microsecond) * 1000
+            midnight = clock.base_ns + (not_before_ns - clock.base_ns) // DAY_NS * DAY_NS
+            epoch = midnight + time_ns
+            return epoch if epoch >= not_before_ns else epoch + DAY_NS
+        return int(value)
+
+    def window_indices(self, start_ns=None, end_ns=None):
+        """Fix indices with epochs in [start_ns, end_ns), found by binary search on the sorted time index."""
+        first = np.searchsorted(self._sorted_epochs, max(0 if start_ns is None else start_ns, 0), side='left')
+        last = len(self) if end_ns is None else np.searchsorted(self._sorted_epochs, end_ns, side='left')
+        return self._order[first:max(first, last)]
+
+    def mask(self, start=None, end=None, skip_first_s=None, gps_qual=None, min_sats=None, max_sats=None,
+             hdop=None):
+        """
+        Boolean mask of the fixes matching every given filter.
+
+        Args:
+            start (int | datetime.datetime | datetime.time, optional): First epoch included (see to_epoch_ns).
+            end (int | datetime.datetime | datetime.time, optional): First epoch excluded. A time of day
+                resolves to its first occurrence after start.
+            skip_first_s (float, optional): Exclude this many seconds after the first fix (convergence).
+            gps_qual (int | iterable, optional): GGA fix quality value(s) to keep (e.g. 4 for RTK fixed).
+            min_sats (int, optional): Minimum number of satellites in use.
+            max_sats (int, optional): Maximum number of satellites in use.
+            hdop (str | iterable, optional): HDOP bucket label(s) to keep (see HDOP_BUCKETS).
+
+        Returns:
+            np.ndarray: Boolean mask over the session's fixes.
+        """
+        start_ns = None if start is None else self.to_epoch_ns(start)
+        if skip_first_s is not None and self.first_epoch_ns >= 0:
+            skip_ns = self.first_epoch_ns + int(skip_first_s * 1e9)
+            start_ns = skip_ns if start_ns is None else max(start_ns, skip_ns)
+        end_ns = None if end is None else self.to_epoch_ns(end, start_ns)
+
+        selected = np.zeros(len(self), dtype=bool)
+        if start_ns is None and end_ns is None:
+            selected[:] = True
+        else:
+            selected[self.window_indices(start_ns, end_ns)] = True
+
+        if gps_qual is not None:
+            selected &= self._any_of(self.quality_masks, np.atleast_1d(gps_qual).tolist())
+        if min_sats is not None or max_sats is not None:
+            low = -np.inf if min_sats is None else min_sats
+            high = np.inf if max_sats is None else max_sats
+            selected &= self._any_of(self.satellite_masks, [value for value in self.satellite_masks
+                                                            if low <= value <= high])
+        if hdop is not None:
+            labels = [hdop] if isinstance(hdop, str) else list(hdop)
+            unknown = set(labels) - {label for _, label in HDOP_BUCKETS}
+            if unknown:
+                raise ValueError(f"Unknown HDOP bucket(s): {', '.join(sorted(unknown))}. "
+                                 f"Supported buckets: {', '.join(label for _, label in HDOP_BUCKETS)}")
+            selected &= self._any_of(self.hdop_masks, labels)
+
+        return selected
+
+    def _any_of(self, masks, keys):
+        # OR of the precomputed masks of the given keys; keys with no fixes select nothing
+        combined = np.zeros(len(self), dtype=bool)
+        for key in keys:
+            if key in masks:
+                combined |= masks[key]
+        return combined
+
+    def select(self, **filters):
+        """
+        Filtered view of the session, as an NMEAData that CEP, statistics and exports accept as-is.
+
+        Fixes are filtered with mask(**filters). Motion epochs and GSV satellite entries are kept for the
+        epochs of the selected fixes only. Parsed sentences are kept in full as the record of the log.
+
+        Returns:
+            NMEAData: Session restricted to the selected fixes.
+        """
+        return self.subset(self.mask(**filters))
+
+    def subset(self, fix_mask):
+        """NMEAData restricted to the fixes of a boolean mask (see select)."""
+        source = self.nmea_data
+        subset = NMEAData(None, None, source.parsed_sentences)
+        subset.port, subset.baudrate = source.port, source.baudrate
+        subset.line_integrity = source.line_integrity
+        subset.clock = source.clock
+        subset.fixes = source.fixes.take(fix_mask)
+
+        # Motion rows and GSV entries follow the epochs of the selected fixes
+        kept_epochs = source.fixes.timeline_ns(absolute=False)[fix_mask]
+        subset.motion = source.motion.take(np.isin(source.motion.timeline_ns(absolute=False), kept_epochs))
+        gsv_keep = np.isin(np.asarray(source.gsv_epoch_ns, dtype=np.int64), kept_epochs)
+        subset.gsv_satellite_info = [info for info, keep in zip(source.gsv_satellite_info, gsv_keep) if keep]
+        subset.gsv_epoch_ns = [epoch for epoch, keep in zip(source.gsv_epoch_ns, gsv_keep) if keep]
+        return subset
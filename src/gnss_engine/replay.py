@@ -0,0 +1,364 @@
+# replay.py
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from .log_index import time_field_ns
+from .live import read_serial_nmea
+
+DAY_S = 86400.0
+# Sentence types carrying the UTC time of their epoch in the first field; they pace a replay at log rate
+_EPOCH_TYPES = (b'GGA', b'RMC', b'GNS', b'ZDA', b'GST')
+
+
+def load_replay_epochs(file_path):
+    """
+    Split a raw log into epochs for replay.
+
+    Args:
+        file_path (str): Uncompressed raw log.
+
+    Returns:
+        list[tuple]: (seconds since the first epoch, bytes of all sentences of the epoch) in log order. Times
+        that jump back are clamped (a midnight rollover adds a day), so the replay never waits backwards.
+    """
+    epochs = []
+    lines = []
+    epoch_s = 0.0
+    last_s = None
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                line += b'\r\n'
+            fields = line.split(b',', 2)
+            address = fields[0][1:]
+            time_s = None
+            if len(fields) > 2 and address[-3:] in _EPOCH_TYPES and not address.startswith(b'P'):
+                try:
+                    time_s = time_field_ns(fields[1]) / 1e9
+                except ValueError:
+                    pass
+
+            if time_s is not None and time_s != last_s:  # A new epoch starts with this line
+                if lines:
+                    epochs.append((epoch_s, b''.join(lines)))
+                    lines = []
+                if last_s is not None:
+                    delta = time_s - last_s
+                    if delta < -DAY_S / 2:  # Past midnight
+                        delta += DAY_S
+                    epoch_s += max(delta, 0.0)
+                last_s = time_s
+            lines.append(line)
+    if lines:
+        epochs.append((epoch_s, b''.join(lines)))
+    return epochs
+
+
+class SerialReplayer:
+    """
+    One simulated receiver: replays recorded epochs into the master side of a pseudo-terminal.
+
+    The consumer opens the slave side (slave_name, e.g. /dev/pts/7) like any serial port, so the real
+    live path (read_serial_nmea, the GUI threads) is exercised unchanged. Pacing follows the log's epoch
+    times divided by speed (speed 0: as fast as the link allows), or a fixed epoch_rate in Hz. The link is
+    limited to baudrate (10 bits per byte, as 8N1 on a UART).
+
+    Like a UART whose receive buffer overflows, nothing waits for a slow reader: a line that does not fit
+    into the pseudo-terminal buffer is dropped (counted in dropped_lines), and a line that only fits in part
+    is cut off (counted in truncated_lines), which the consumer sees as a corrupt sentence.
+
+    Send times are recorded per delivered byte offset, so latency can be measured against the receive
+    timestamps of the consumer's raw capture (see replay_latencies).
+    """
+
+    def __init__(self, epochs, baudrate=115200, speed=1.0, epoch_rate=None, duration=None, loop=True):
+        import tty  # Unix only (termios); imported here so the package still loads on Windows
+
+        if not hasattr(os, 'openpty'):
+            raise ValueError("Serial replay needs pseudo-terminals (Linux or macOS).")
+        self.epochs = epochs
+        self.baudrate = baudrate
+        self.speed = speed
+        self.epoch_rate = epoch_rate
+        self.duration = duration
+        self.loop = loop
+
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)  # No echo, no line editing, no CR/LF translation: bytes pass through as-is
+        os.set_blocking(self.master_fd, False)
+        self.slave_name = os.ttyname(self.slave_fd)
+
+        self.sent_lines = 0
+        self.sent_bytes = 0
+        self.dropped_lines = 0
+        self.truncated_lines = 0
+        self.send_offsets = []  # Delivered byte offset of every fully sent line
+        self.send_times_ns = []  # ... and the time its last byte was written
+        self.elapsed_s = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start replaying in a background thread."""
+        self._thread = threading.Thread(target=self.run, name=f"replay {self.slave_name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        """Stop and release the pseudo-terminal."""
+        self.stop()
+        self.join()
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _epoch_schedule(self):
+        # (due time in seconds since start, epoch bytes), looping over the log until the duration is used up
+        period = self.epochs[-1][0] + (self.epochs[-1][0] / max(len(self.epochs) - 1, 1))
+        count = 0
+        lap = 0
+        while True:
+            for epoch_s, data in self.epochs:
+                if self.epoch_rate:
+                    due = count / self.epoch_rate
+                elif self.speed:
+                    due = (lap * period + epoch_s) / self.speed
+                else:
+                    due = 0.0
+                yield due, data
+                count += 1
+            if not self.loop:
+                return
+            lap += 1
+
+    def run(self):
+        """Replay until the log ends (without loop), the duration is used up, or stop() is called."""
+        seconds_per_byte = 10.0 / self.baudrate
+        start = time.perf_counter()
+        link_free = start  # The link is busy until this time with the bytes already sent
+
+        for due, data in self._epoch_schedule():
+            now = time.perf_counter()
+            if self._stop.is_set() or (self.duration is not None and now - start >= self.duration):
+                break
+            wait = max(start + due, link_free) - now
+            if wait > 0:
+                time.sleep(wait)
+
+            for line in data.splitlines(keepends=True):
+                # A line leaves the UART no faster than the baud rate allows
+                wait = link_free - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    written = os.write(self.master_fd, line)
+                except BlockingIOError:
+                    written = 0
+                except OSError as e:  # The consumer side is gone
+                    logging.error(f"Replay to {self.slave_name} stopped: {e}")
+                    self._stop.set()
+                    break
+
+                if written == len(line):
+                    self.sent_lines += 1
+                    self.send_offsets.append(self.sent_bytes)
+                    self.send_times_ns.append(time.time_ns())
+                elif written:
+                    self.truncated_lines += 1
+                else:
+                    self.dropped_lines += 1
+                self.sent_bytes += written
+                link_free = max(link_free, time.perf_counter()) + len(line) * seconds_per_byte
+
+        self.elapsed_s = time.perf_counter() - start
+
+
+def replay_latencies(replayer, rx_times_path):
+    """
+    Latency of every line between the replayer writing it and the consumer's capture receiving it.
+
+    Args:
+        replayer (SerialReplayer): Finished replayer.
+        rx_times_path (str): "<offset>\\t<receive time ns>" sidecar of the consumer's raw capture.
+
+    Returns:
+        np.ndarray: Latencies in seconds of the lines found on both sides.
+    """
+    try:
+        received = np.loadtxt(rx_times_path, dtype=np.int64, delimiter='\t', ndmin=2)
+    except (OSError, ValueError):
+        return np.array([])
+    if not len(received) or not replayer.send_offsets:
+        return np.array([])
+
+    # Both sides count the same delivered bytes, so a line has the same offset on both
+    sent_offsets = np.asarray(replayer.send_offsets, dtype=np.int64)
+    sent_times = np.asarray(replayer.send_times_ns, dtype=np.int64)
+    found = np.searchsorted(sent_offsets, received[:, 0])
+    found = np.minimum(found, len(sent_offsets) - 1)
+    matched = sent_offsets[found] == received[:, 0]
+    return (received[matched, 1] - sent_times[found[matched]]) / 1e9
+
+
+def run_folder(log_folder, devices, speed=1.0, epoch_rate=None):
+    """
+    Capture folder of one replay run: "<log_folder>/<devices>dev_<rate>".
+
+    The rate is the fixed epoch rate ("50Hz"), the replay speed ("x10") or "max" (as fast as the link
+    allows). Pseudo-terminal names are reused between runs, so runs sharing a timestamp need their own
+    folders; a folder already used gets a "_2", "_3", ... suffix.
+    """
+    if epoch_rate:
+        rate = f"{epoch_rate:g}Hz"
+    else:
+        rate = f"x{speed:g}" if speed else "max"
+    folder = os.path.join(log_folder, f"{devices}dev_{rate}")
+    candidate, run = folder, 1
+    while os.path.exists(candidate):
+        run += 1
+        candidate = f"{folder}_{run}"
+    return candidate
+
+
+def run_replay(log_paths, devices=1, baudrate=115200, speed=1.0, epoch_rate=None, duration=10.0,
+               log_folder="logs/replay", timestamp=None, timeout=0.1, drain_s=1.0):
+    """
+    Replay recorded logs into simulated serial devices and measure the live path reading them.
+
+    Every device is a SerialReplayer read by its own read_serial_nmea thread, as in a live multi-device run.
+    Devices take the logs in turn (device i replays log_paths[i % len(log_paths)]).
+
+    Args:
+        log_paths (list[str]): Recorded raw logs.
+        devices (int): Number of simulated devices.
+        baudrate (int): Link speed of every device.
+        speed (float): Replay speed relative to the log's own timing (0: as fast as the link allows).
+        epoch_rate (float, optional): Fixed epoch rate in Hz instead of the log's timing.
+        duration (float): Replay time in seconds (logs are looped).
+        log_folder (str): Folder of the consumers' raw captures. Every run writes to its own subfolder
+            ("<devices>dev_<rate>", see run_folder), so the runs of a sweep never overwrite each other's captures.
+        timestamp (str, optional): Timestamp of the capture file names. Defaults to now.
+        timeout (float): Read timeout of the consumers.
+        drain_s (float): Time the consumers keep reading after the replay ends.
+
+    Returns:
+        dict: Run settings and totals, with one entry per device under 'devices'.
+    """
+    timestamp = timestamp or time.strftime("%Y%m%d_%H%M%S")
+    log_folder = run_folder(log_folder, devices, speed, epoch_rate)
+    epochs = {path: load_replay_epochs(path) for path in set(log_paths)}
+    replayers = [SerialReplayer(epochs[log_paths[i % len(log_paths)]], baudrate, speed, epoch_rate, duration)
+                 for i in range(devices)]
+
+    results = [None] * devices
+    stop_event = threading.Event()
+
+    def consume(i, replayer):
+        # The consumers are ended by stop_event once the replay is drained; the duration is only a backstop
+        results[i] = read_serial_nmea(replayer.slave_name, baudrate, timeout, duration + drain_s + 60, log_folder,
+                                      timestamp, stop_event)
+
+    consumers = [threading.Thread(target=consume, args=(i, replayer), name=f"consumer {i + 1}")
+                 for i, replayer in enumerate(replayers)]
+    try:
+        for consumer in consumers:
+            consumer.start()
+        time.sleep(0.2)  # Let every consumer open its port before the first byte is sent
+        for replayer in replayers:
+            replayer.start()
+        for replayer in replayers:
+            replayer.join()
+        time.sleep(drain_s)
+    finally:
+        stop_event.set()
+        for consumer in consumers:
+            consumer.join()
+        for replayer in replayers:
+            replayer.close()
+
+    report = {'devices': [], 'device_count': devices, 'baudrate': baudrate, 'speed': speed, 'epoch_rate': epoch_rate,
+              'duration_s': duration, 'capture_folder': log_folder}
+    all_latencies = []
+    for i, (replayer, nmea_data) in enumerate(zip(replayers, results)):
+        safe_port = replayer.slave_name.replace("/", "_")
+        rx_times = os.path.join(log_folder, f"nmea_raw_log_mode_1_{safe_port}_{baudrate}_{timestamp}_rx_times.tsv")
+        latencies = replay_latencies(replayer, rx_times)
+        all_latencies.append(latencies)
+
+        integrity = {}
+        if nmea_data is not None and nmea_data.line_integrity:
+            integrity = dict(zip(nmea_data.line_integrity["Metric"], nmea_data.line_integrity["Value"]))
+        elapsed = replayer.elapsed_s or duration
+        report['devices'].append({
+            'device': i + 1,
+            'port': replayer.slave_name,
+            'sent_lines': replayer.sent_lines,
+            'sent_rate': replayer.sent_lines / elapsed,
+            'dropped_lines': replayer.dropped_lines,
+            'truncated_lines': replayer.truncated_lines,
+            'received_lines': len(latencies),
+            'parsed_sentences': len(nmea_data.parsed_sentences) if nmea_data is not None else 0,
+            'corrupt_lines': integrity.get("Corrupt Lines", 0),
+            **_latency_stats(latencies),
+        })
+
+    latencies = np.concatenate(all_latencies) if all_latencies else np.array([])
+    device_rows = report['devices']
+    report['totals'] = {
+        'sent_lines': sum(row['sent_lines'] for row in device_rows),
+        'sent_rate': sum(row['sent_rate'] for row in device_rows),
+        'received_lines': sum(row['received_lines'] for row in device_rows),
+        'lost_lines': sum(row['dropped_lines'] + row['truncated_lines'] for row in device_rows),
+        'corrupt_lines': sum(row['corrupt_lines'] for row in device_rows),
+        **_latency_stats(latencies),
+    }
+    return report
+
+
+def _latency_stats(latencies):
+    # Latency percentiles in milliseconds (NaN without matched lines)
+    if not len(latencies):
+        return {'latency_p50_ms': np.nan, 'latency_p95_ms': np.nan, 'latency_max_ms': np.nan}
+    return {'latency_p50_ms': float(np.percentile(latencies, 50) * 1000),
+            'latency_p95_ms': float(np.percentile(latencies, 95) * 1000),
+            'latency_max_ms': float(np.max(latencies) * 1000)}
+
+
+def find_max_rate(log_paths, devices=1, baudrate=115200, rates=(1, 5, 10, 20, 50, 100, 200), duration=10.0,
+                  max_latency_ms=100.0, **options):
+    """
+    Highest fixed epoch rate the live path sustains for a number of devices.
+
+    The epoch rate is raised through rates until lines are lost, corrupted, or the P95 latency exceeds
+    max_latency_ms (the consumer falls behind).
+
+    Returns:
+        tuple: (highest sustained rate in Hz or None, list of the reports of every rate tried)
+    """
+    sustained = None
+    reports = []
+    for rate in rates:
+        report = run_replay(log_paths, devices, baudrate, epoch_rate=rate, duration=duration, **options)
+        reports.append(report)
+        totals = report['totals']
+        ok = (not totals['lost_lines'] and not totals['corrupt_lines']
+              and totals['latency_p95_ms'] <= max_latency_ms)
+        logging.info(f"{devices} device(s) at {rate} Hz: {totals['sent_rate']:.0f} lines/s, "
+                     f"{totals['lost_lines']} lost, P95 latency {totals['latency_p95_ms']:.1f} ms"
+                     f"{'' if ok else ' (not sustained)'}")
+        if not ok:
+            break
+        sustained = rate
+    return sustained, reports
@@ -0,0 +1,127 @@
+# rolling.py
+from bisect import bisect_left, insort
+
+import numpy as np
+
+ROLLING_PERCENTILES = (50, 95)
+DEFAULT_ROLLING_WINDOW_S = 60.0  # Trailing window of the rolling CEP when none is configured
+MIN_ROLLING_POINTS = 10  # Time windows with fewer fixes than this report NaN
+
+
+class SlidingQuantile:
+    """
+    Percentiles of a sliding window of values, kept in a sorted list.
+
+    Adding or removing a value is a binary search plus one list insert/delete (a memmove), so sliding
+    the window by one fix costs O(log w) comparisons instead of re-sorting the whole window. Percentiles
+    use linear interpolation between the closest ranks, the same definition as np.percentile.
+    """
+
+    def __init__(self):
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value):
+        insort(self._values, value)
+
+    def remove(self, value):
+        del self._values[bisect_left(self._values, value)]
+
+    def percentile(self, p):
+        values = self._values
+        if not values:
+            return np.nan
+        rank = p / 100.0 * (len(values) - 1)
+        below = int(rank)
+        above = min(below + 1, len(values) - 1)
+        return values[below] + (values[above] - values[below]) * (rank - below)
+
+
+def rolling_cep(distances, epoch_ns, window_s=None, window_epochs=None, percentiles=ROLLING_PERCENTILES,
+                min_points=MIN_ROLLING_POINTS):
+    """
+    Rolling CEP over a trailing window ending at every fix.
+
+    The window is either a time span (window_s, using the fix epochs) or a number of fixes (window_epochs).
+    Both are slid over the fixes once with a SlidingQuantile, adding the new fix and dropping the fixes
+    that fell out of the window.
+
+    Args:
+        distances (np.ndarray): Horizontal error of every fix in meters, in time order.
+        epoch_ns (np.ndarray): Epoch of every fix in nanoseconds (-1 where unknown). Only used for time windows.
+        window_s (float, optional): Window length in seconds. Defaults to DEFAULT_ROLLING_WINDOW_S.
+        window_epochs (int, optional): Window length in fixes. Takes precedence over window_s.
+        percentiles (tuple): CEP percentiles to report.
+        min_points (int): Time windows with fewer fixes report NaN. Fix-count windows report NaN until full.
+
+    Returns:
+        dict: 'CEP<p>' -> array with the rolling value at every fix.
+
+    Raises:
+        ValueError: If the window is not positive.
+    """
+    if window_epochs is not None and window_epochs <= 0:
+        raise ValueError(f"Rolling CEP window must be at least one fix, got {window_epochs}.")
+    if window_s is not None and not window_s > 0:
+        raise ValueError(f"Rolling CEP window must be longer than 0 s, got {window_s}.")
+
+    distances = np.asarray(distances, dtype=np.float64)
+    epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+    series = {p: np.full(len(distances), np.nan) for p in percentiles}
+
+    if window_epochs is None:
+        window_ns = int((DEFAULT_ROLLING_WINDOW_S if window_s is None else window_s) * 1e9)
+    else:
+        min_points = window_epochs
+
+    window = SlidingQuantile()
+    members = []  # Indices in the window, oldest first (as a queue: head is the next to drop)
+    head = 0
+    errors, epochs = distances.tolist(), epoch_ns.tolist()
+    for index, (distance, epoch) in enumerate(zip(errors, epochs)):
+        if distance != distance or (window_epochs is None and epoch < 0):  # NaN error or unknown time
+            continue
+
+        members.append(index)
+        window.add(distance)
+
+        # Drop the fixes that are no longer inside the trailing window
+        if window_epochs is None:
+            while epochs[members[head]] <= epoch - window_ns:
+                window.remove(errors[members[head]])
+                head += 1
+        elif len(window) > window_epochs:
+            window.remove(errors[members[head]])
+            head += 1
+
+        if len(window) >= min_points:
+            for p in percentiles:
+                series[p][index] = window.percentile(p)
+
+    return {f'CEP{p}': values for p, values in series.items()}
+
+
+def rolling_stability(rolling):
+    """
+    Stability metrics of a rolling CEP series: best, typical and worst window, and the spread over the run.
+
+    Args:
+        rolling (dict): Result of rolling_cep.
+
+    Returns:
+        dict: Metric -> value (NaN if no window had enough fixes).
+    """
+    metrics = {}
+    for name, values in rolling.items():
+        populated = ~np.isnan(values)
+        if not populated.any():
+            metrics.update({f"Rolling {name} {label}": np.nan for label in ("Min (m)", "Median (m)", "Max (m)",
+                                                                             "Std (m)")})
+            continue
+        metrics[f"Rolling {name} Min (m)"] = float(np.min(values[populated]))
+        metrics[f"Rolling {name} Median (m)"] = float(np.median(values[populated]))
+        metrics[f"Rolling {name} Max (m)"] = float(np.max(values[populated]))
+        metrics[f"Rolling {name} Std (m)"] = float(np.std(values[populated]))
+    return metrics
@@ -0,0 +1,269 @@
+# validate.py
+import logging
+import os
+import re
+
+MAX_SENTENCE_LENGTH = 512  # Longer "lines" are runs of garbage or sentences glued together by a dropped EOL
+_PRINTABLE = bytes(range(0x20, 0x7f))
+_HEX_DIGITS = frozenset(b'0123456789ABCDEFabcdef')
+
+# Rejection reasons, in the order they are checked
+EMPTY = 'empty'
+FRAMING = 'framing'
+NON_PRINTABLE = 'non-printable'
+MISSING_CHECKSUM = 'missing checksum'
+BAD_CHECKSUM = 'bad checksum'
+
+INCLUDE_TYPES_ENV = 'GNSS_INCLUDE_TYPES'  # Sentence filters to parse, e.g. "GGA,GSV" (see SentenceFilter)
+EXCLUDE_TYPES_ENV = 'GNSS_EXCLUDE_TYPES'  # Sentence filters to skip, e.g. "GSA,PQTM*"
+_FILTER_SPEC = re.compile(r'[A-Z0-9]+\*?|\*')
+_ADDRESS = re.compile(rb'\s*\$([A-Z0-9]+)')  # Address of a sentence: talker and type, or proprietary address
+
+
+def address_alternatives(types):
+    """
+    Regex alternation (bytes) of the sentence addresses selected by a set of talker+type filters.
+
+    Filters are written without the '$':
+        "GGA"      -- the type from any talker ($GPGGA, $GNGGA, $GBGGA, ...)
+        "GNGGA"    -- exactly this talker and type
+        "PQTMEPE"  -- a proprietary sentence
+        "PQTM*"    -- every sentence whose address starts with the prefix ("*" alone: every sentence)
+
+    Shared by the extractor (extract.sentence_pattern) and the ingest-time SentenceFilter, so both accept the
+    same filters.
+
+    Raises:
+        ValueError: If a filter is malformed or there is none.
+    """
+    alternatives = []
+    for spec in types:
+        spec = spec.strip().upper().lstrip('$')
+        if not _FILTER_SPEC.fullmatch(spec):
+            raise ValueError(f"Invalid sentence filter: {spec!r}. Use a type (GGA), talker and type (GNGGA), "
+                             f"a proprietary address (PQTMEPE), a prefix (PQTM*) or * for every sentence.")
+        if spec.endswith('*'):
+            alternatives.append(re.escape(spec[:-1]).encode() + rb'[A-Z0-9]*')
+        elif len(spec) == 3 and not spec.startswith('P'):
+            alternatives.append(rb'[A-Z]{2}' + spec.encode())
+        else:
+            alternatives.append(re.escape(spec).encode())
+    if not alternatives:
+        raise ValueError("At least one sentence filter is needed.")
+    return b'|'.join(alternatives)
+
+
+def nmea_checksum(body):
+    """
+    XOR of all bytes of a sentence body (between '$' and '*').
+
+    The body is read as one integer and folded in half until a single byte is left, so the XOR takes
+    O(log n) integer operations instead of a Python loop over every byte.
+    """
+    value = int.from_bytes(body, 'little')
+    width = len(body)
+    while width > 1:
+        width = (width + 1) // 2
+        value = (value >> (width * 8)) ^ (value & ((1 << (width * 8)) - 1))
+    return value
+
+
+def check_sentence(line, require_checksum=True):
+    """
+    Check framing and checksum of one line without parsing it and without raising.
+
+    Args:
+        line (bytes | str): Raw line, with or without the line ending.
+        require_checksum (bool): Reject sentences without a '*hh' checksum field.
+
+    Returns:
+        str: Rejection reason (EMPTY, FRAMING, NON_PRINTABLE, MISSING_CHECKSUM, BAD_CHECKSUM), or None if the
+        line is a well-formed sentence.
+    """
+    if isinstance(line, str):
+        line = line.encode('utf-8', 'surrogateescape')
+    line = line.strip()
+
+    if not line:
+        return EMPTY
+    if line[0] not in b'$!' or len(line) > MAX_SENTENCE_LENGTH or b'$' in line[1:]:
+        return FRAMING
+    if line.translate(None, _PRINTABLE):  # Anything left after deleting printable ASCII is line noise
+        return NON_PRINTABLE
+
+    star = line.rfind(b'*')
+    if star < 0:
+        return MISSING_CHECKSUM if require_checksum else None
+    checksum = line[star + 1:]
+    if len(checksum) != 2 or not _HEX_DIGITS.issuperset(checksum):
+        return FRAMING
+    if nmea_checksum(line[1:star]) != int(checksum, 16):
+        return BAD_CHECKSUM
+    return None
+
+
+class SentenceValidator:
+    """
+    Pre-validation stage in front of the NMEA parser, with corrupt-line accounting for one device.
+
+    Every line is checked with check_sentence before it reaches pynmea2, so corrupt lines from a noisy
+    serial link or a damaged log cost a few byte operations instead of a raised and caught ParseError.
+    Rejected lines are counted per reason and optionally written to a quarantine file
+    ("<line number>\\t<reason>\\t<raw line>"), which is opened on the first rejection.
+
+    Empty lines (serial read timeouts, blank lines in logs) are skipped and counted, but are not
+    corruption and do not count towards the corruption rate.
+    """
+
+    def __init__(self, name="", quarantine_path=None, require_checksum=True):
+        self.name = name
+        self.quarantine_path = quarantine_path
+        self.require_checksum = require_checksum
+        self.lines = 0
+        self.rejected = {}  # Reason -> number of lines
+        self._quarantine = None
+
+    def check(self, line):
+        """
+        Validate one line and account for it.
+
+        Returns:
+            bool: True if the line should be parsed.
+        """
+        self.lines += 1
+        reason = check_sentence(line, self.require_checksum)
+        if reason is None:
+            return True
+
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        if reason != EMPTY and self.quarantine_path:
+            self._write_quarantine(line, reason)
+        return False
+
+    def _write_quarantine(self, line, reason):
+        if isinstance(line, str):
+            line = line.encode('utf-8', 'surrogateescape')
+        try:
+            if self._quarantine is None:
+                self._quarantine = open(self.quarantine_path, 'ab')
+            self._quarantine.write(b'%d\t%s\t%s\n' % (self.lines, reason.encode(), line.rstrip(b'\r\n')))
+        except OSError as e:
+            logging.error(f"Error writing to quarantine file {self.quarantine_path}: {e}")
+            self.quarantine_path = None  # Keep validating; only the quarantine copy is lost
+
+    def close(self):
+        """Close the quarantine file, if one was opened."""
+        if self._quarantine is not None:
+            self._quarantine.close()
+            self._quarantine = None
+
+    @property
+    def corrupt(self):
+        """Number of rejected lines, not counting empty lines."""
+        return sum(count for reason, count in self.rejected.items() if reason != EMPTY)
+
+    @property
+    def corruption_rate(self):
+        """Fraction of non-empty lines that were rejected (0.0 if there were none)."""
+        non_empty = self.lines - self.rejected.get(EMPTY, 0)
+        return self.corrupt / non_empty if non_empty else 0.0
+
+    def summary(self):
+        """Line accounting as a Metric/Value table, for reports and the 'Line Integrity' sheet."""
+        rows = {"Lines Read": self.lines,
+                "Empty Lines": self.rejected.get(EMPTY, 0),
+                "Corrupt Lines": self.corrupt,
+                "Corruption Rate (%)": 100.0 * self.corruption_rate}
+        for reason in (FRAMING, NON_PRINTABLE, MISSING_CHECKSUM, BAD_CHECKSUM):
+            rows[f"Rejected: {reason}"] = self.rejected.get(reason, 0)
+        return {"Metric": list(rows), "Value": list(rows.values())}
+
+    def describe(self):
+        """One-line description of the corruption rate, for the console log."""
+        details = ", ".join(f"{reason} {count}" for reason, count in self.rejected.items() if reason != EMPTY)
+        return (f"{self.corrupt} of {self.lines - self.rejected.get(EMPTY, 0)} lines rejected "
+                f"({100.0 * self.corruption_rate:.2f}%){': ' + details if details else ''}")
+
+
+class SentenceFilter:
+    """
+    Ingest-time allowlist/denylist of sentence types, applied to the raw address before validation and parsing.
+
+    Filters use the extractor syntax (see address_alternatives). A sentence is kept if its address matches
+    one of the include filters (all sentences without any) and none of the exclude filters. A skipped
+    sentence costs a regex match on the first few bytes of the line instead of a checksum, a pynmea2 parse
+    and add_sentence_data, so a run that only needs CEP (GGA) and CNR (GSV) no longer needs a separate
+    extraction pass. Lines that do not start like a sentence are kept, so the validator still counts them
+    as corrupt.
+
+    Usage:
+        sentence_filter = SentenceFilter(include=['GGA', 'GSV'])
+        if sentence_filter.accepts(line):
+            ...
+    """
+
+    def __init__(self, include=None, exclude=None):
+        self.include = [spec.strip().upper() for spec in include or () if spec.strip()]
+        self.exclude = [spec.strip().upper() for spec in exclude or () if spec.strip()]
+        if not self.include and not self.exclude:
+            raise ValueError("A sentence filter needs types to include or exclude.")
+        # Patterns for both kinds of lines: logs are read as text, serial ports and the extractor give bytes
+        self._patterns = {bytes: self._compile(lambda pattern: pattern),
+                          str: self._compile(lambda pattern: pattern.decode('ascii'))}
+
+    def _compile(self, convert):
+        # (address pattern, include matcher, exclude matcher) for one line type
+        include, exclude = (re.compile(convert(address_alternatives(specs))).fullmatch if specs else None
+                            for specs in (self.include, self.exclude))
+        return re.compile(convert(_ADDRESS.pattern)).match, include, exclude
+
+    def __getstate__(self):  # Compiled patterns are rebuilt in batch worker processes
+        return {'include': self.include, 'exclude': self.exclude}
+
+    def __setstate__(self, state):
+        self.__init__(state['include'], state['exclude'])
+
+    def accepts(self, line):
+        """
+        Whether a raw line should be validated and parsed.
+
+        Args:
+            line (bytes | str): Raw line, with or without the line ending.
+
+        Returns:
+            bool: False if the sentence type is filtered out.
+        """
+        address, include, exclude = self._patterns[type(line)]
+        match = address(line)
+        if match is None:
+            return True
+        address = match.group(1)
+        if include is not None and not include(address):
+            return False
+        return exclude is None or not exclude(address)
+
+    def describe(self):
+        """The filters as one line, for the console log."""
+        parts = []
+        if self.include:
+            parts.append(f"only {', '.join(self.include)}")
+        if self.exclude:
+            parts.append(f"{'except' if self.include else 'all but'} {', '.join(self.exclude)}")
+        return " ".join(parts)
+
+
+def sentence_filter_from_environment():
+    """
+    SentenceFilter requested through GNSS_INCLUDE_TYPES / GNSS_EXCLUDE_TYPES (comma or space separated), for
+    the front-ends without command line options (GUI, interactive menu). None if neither is set or a filter
+    is malformed (logged).
+    """
+    include, exclude = (os.environ.get(name, '').replace(',', ' ').split()
+                        for name in (INCLUDE_TYPES_ENV, EXCLUDE_TYPES_ENV))
+    if not include and not exclude:
+        return None
+    try:
+        return SentenceFilter(include, exclude)
+    except ValueError as e:
+        logging.error(f"Ignoring the sentence filter of {INCLUDE_TYPES_ENV}/{EXCLUDE_TYPES_ENV}: {e}")
+        return None
@@ -1,321 +1,164 @@
 # Standard Library Imports
+import argparse
 import os
 import sys
 import threading
 import logging
-from datetime import datetime
-from time import time
-
-# Third-Party Library Imports
-import serial
-import pynmea2
-import pandas as pd
+from datetime import datetime, time
 
 # Local Application Imports
-from headless_class import NMEAData
-
-# noinspection PyCompatibility
-def setup_logging(log_folder, timestamp):
+from gnss_engine import (HDOP_BUCKETS, NMEAData, SentenceFilter, capture_from_environment, load_live_config,
+                         metrics_from_environment, process_nmea_log, profile_run, run_dynamic_live, run_live_capture,
+                         sentence_filter_from_environment)
+from gnss_engine.batch import BATCH_OUTPUT_FORMATS, collect_log_files, run_batch
+from gnss_engine.profiling import CAPTURES
+
+# Thin headless front-end: all ingest, CEP and export work is done by gnss_engine
+setup_logging = NMEAData.setup_logging
+
+def positive_number(number_type):
+    """argparse type accepting numbers of number_type (int or float) greater than zero."""
+    def parse(value):
+        number = number_type(value)
+        if not number > 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+        return number
+    parse.__name__ = number_type.__name__  # argparse names the type in "invalid int value" errors
+    return parse
+
+def parse_args(argv):
     """
-    Sets up logging to output to both the console and a log file.
+    Parse the command line of the non-interactive batch mode.
 
     Args:
-        log_folder (str): Directory to save log files.
-        timestamp (str): Timestamp to append to the log file name.
-    """
-    # Ensure the log directory exists
-    os.makedirs(log_folder, exist_ok=True)
-
-    # Define the log file path
-    log_file = os.path.join(log_folder, f"console_output_{timestamp}.txt")
-
-    # Configure logging with both file and console handlers
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, mode='a', encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-
-    logging.info(f"Console logging setup complete. Logs are being saved to {log_file}")
-
-# noinspection PyCompatibility
-def read_nmea_data(port, baudrate, timeout, duration, log_folder, timestamp, reference_point=None, stop_event=None):
-    """
-    Reads live NMEA data from a serial port and processes it.
-
-    Args:
-        port (str): Serial port to read from (e.g., "COM3").
-        baudrate (int): Baud rate for serial communication.
-        timeout (float): Timeout for serial port reads (in seconds).
-        duration (float): Duration to read data (in seconds).
-        log_folder (str): Directory to save log files.
-        timestamp (str): Timestamp to append to file names.
-        reference_point (tuple, optional): Custom reference point for CEP calculation.
-        stop_event (threading.Event, optional): Event to signal the function to stop.
-    """
-    parsed_sentences = []
-    start_time = time()
-    nmea_data = NMEAData(None, None, parsed_sentences)
-
-    # Ensure log folder exists
-    os.makedirs(log_folder, exist_ok=True)
-
-    safe_port = port.replace("/", "_")
-
-    # Open raw NMEA log file
-    raw_nmea_log_path = os.path.join(log_folder, f"nmea_raw_log_mode_1_{safe_port}_{baudrate}_{timestamp}.txt")
-    try:
-        raw_nmea_log = open(raw_nmea_log_path, "a", encoding="utf-8")
-    except Exception as e:
-        logging.error(f"Error opening log file {raw_nmea_log_path}: {e}")
-        return
-
-    try:
-        # Attempt to configure and open the serial port
-        try:
-            ser = serial.Serial(
-                port=port,
-                baudrate=baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=timeout
-            )
-            logging.info(f"Connected to serial port {port} with baudrate {baudrate}.")
-        except serial.SerialException as e:
-            logging.error(f"Error opening serial port {port}: {e}")
-            return  # Exit function if serial port cannot be opened
-
-        # Continuously read from serial port until duration expires or stop_event is set
-        while time() - start_time < duration:
-            if stop_event and stop_event.is_set():  # Check if stop_event is set
-                logging.info(f"Stop signal received. Ending data collection on {port}.")
-                break  # Exit the loop gracefully
-
-            try:
-                nmea_sentence = ser.readline().decode('ascii', errors='replace').strip()
-
-                try:
-                    raw_nmea_log.write(nmea_sentence + "\n")
-                except Exception as e:
-                    logging.error(f"Error writing NMEA sentence to log file: {e}")
-
-                # Handle proprietary NMEA sentences
-                if nmea_sentence.startswith('$PQTM'):
-                    logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                    try:
-                        msg = pynmea2.parse(nmea_sentence)
-                        if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                            raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence", msg)
-
-                        nmea_data.sentence_type = msg.sentence_type
-                        nmea_data.data = msg
-                        nmea_data.add_sentence_data()
-                        nmea_data.add_coordinates()
-                        logging.info(nmea_data)
-                    except pynmea2.ParseError as e:
-                        logging.warning(f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                    continue
-
-                # Handle standard NMEA sentences
-                if nmea_sentence.startswith('$G'):
-                    logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                    try:
-                        msg = pynmea2.parse(nmea_sentence)
-                        if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                            raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence", msg)
-
-                        nmea_data.sentence_type = msg.sentence_type
-                        nmea_data.data = msg
-                        nmea_data.add_sentence_data()
-                        nmea_data.add_coordinates()
-                        logging.info(nmea_data)
-                    except pynmea2.ParseError as e:
-                        logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                else:
-                    logging.info(f"Unknown Message: {nmea_sentence}")
-
-            except serial.SerialException as e:
-                logging.error(f"Error reading from serial port: {e}")
-                break
-
-    except Exception as e:
-        logging.error(f"Unexpected error during serial read: {e}")
-
-    finally:
-        # Ensure the log file is closed properly
-        raw_nmea_log.close()
-        logging.info(f"Log file {raw_nmea_log_path} closed.")
-
-    # Calculate CEP and log the results
-    cep_value = nmea_data.calculate_cep(reference_point)
-    if cep_value:
-        logging.info(f"Mode 1: CEP statistics for port {port}:")
-        logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-        logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-        logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-        logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-        logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-    else:
-        logging.info(f"No coordinates available for CEP calculation for port {port}.")
-
-    # Save parsed data to Excel
-    nmea_data.write_to_excel_mode_1(port, baudrate, timestamp, cep_value)
-
-# noinspection PyCompatibility
-def parse_nmea_from_log(file_path):
-    """
-    Reads a log file in .txt, .log, .nmea, .csv, or Excel format and parses valid NMEA sentences.
-
-    Args:
-        file_path (str): Path to the log file to be parsed.
+        argv (list[str]): Command line arguments, without the program name.
 
     Returns:
-        tuple: A list of parsed sentences and an NMEAData object.
+        argparse.Namespace: Parsed arguments.
     """
-    parsed_sentences = []
-    nmea_data = NMEAData(None, None, parsed_sentences)
-    logging.info(f"Processing log file: {file_path}")
-
+    parser = argparse.ArgumentParser(
+        description="Batch CEP and satellite analysis of NMEA log files. Run without arguments for the interactive menu.")
+    parser.add_argument("paths", nargs="*", help="Log files, directories (searched recursively) or glob patterns")
+    parser.add_argument("--live-config", metavar="PATH",
+                        help="Instead of logs: run a headless dynamic live test of the reference and devices in this "
+                             "JSON config (see example/dynamic_live_config.json); Ctrl+C ends it early")
+    reference = parser.add_mutually_exclusive_group()
+    reference.add_argument("--reference", nargs=2, type=float, metavar=("LAT", "LON"),
+                           help="Static reference point. Defaults to the mean point of each log.")
+    reference.add_argument("--reference-log", metavar="PATH",
+                           help="Log of a reference receiver for dynamic (epoch by epoch) CEP")
+    parser.add_argument("--format", choices=BATCH_OUTPUT_FORMATS, default="xlsx",
+                        help="Format of the consolidated summary table (default: xlsx)")
+    parser.add_argument("--workers", type=positive_number(int), default=None,
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--export-each", action="store_true",
+                        help="Also write the full Excel workbook of every log file")
+    parser.add_argument("--latency-correction", action="store_true",
+                        help="With --reference-log: also report CEP with each receiver's estimated latency removed")
+    parser.add_argument("--profile", nargs="?", const="timers", choices=("timers",) + CAPTURES,
+                        help="Write a per-stage timing report to the run's log folder; 'cprofile' or 'pyinstrument' "
+                             "also capture a profile (the GNSS_PROFILE environment variable does the same)")
+
+    # Sentence filters: unwanted sentence types are skipped before they are validated and parsed
+    types = parser.add_argument_group("sentence filters")
+    types.add_argument("--include-types", nargs="+", metavar="TYPE",
+                       help="Parse only these sentences, e.g. GGA GSV (any talker), GNGGA, PQTMEPE or PQTM*")
+    types.add_argument("--exclude-types", nargs="+", metavar="TYPE", help="Skip these sentences, e.g. GSA GLL")
+
+    rolling = parser.add_mutually_exclusive_group()
+    rolling.add_argument("--rolling-window", type=positive_number(float), metavar="SECONDS",
+                         help="Trailing window of the rolling CEP50/CEP95 in seconds (default: 60)")
+    rolling.add_argument("--rolling-epochs", type=positive_number(int), metavar="N",
+                         help="Trailing window of the rolling CEP50/CEP95 in fixes instead of seconds")
+
+    # Fix filters: CEP and statistics are computed over the matching fixes only
+    filters = parser.add_argument_group("fix filters")
+    filters.add_argument("--start", type=time.fromisoformat, metavar="HH:MM:SS",
+                         help="UTC time of day of the first fix to include")
+    filters.add_argument("--end", type=time.fromisoformat, metavar="HH:MM:SS",
+                         help="UTC time of day where the selection ends (first occurrence after --start)")
+    filters.add_argument("--skip-first", type=float, metavar="SECONDS", dest="skip_first_s",
+                         help="Exclude the first SECONDS of every log (convergence)")
+    filters.add_argument("--gps-qual", type=int, nargs="+", metavar="Q",
+                         help="GGA fix quality values to keep (e.g. 4 for RTK fixed, 4 5 for fixed and float)")
+    filters.add_argument("--min-sats", type=int, help="Minimum number of satellites in use")
+    filters.add_argument("--hdop", nargs="+", choices=[label for _, label in HDOP_BUCKETS],
+                         help="HDOP buckets to keep")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.live_config:
+        parser.error("give log files to analyse or --live-config")
     try:
-        # Handle different file types based on the file extension
-        if file_path.endswith(('.txt', '.log', '.nmea')):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            logging.info(f"Total lines read from file: {len(lines)}")
-
-        elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, header=None)
-            lines = df[0].astype(str).tolist()
-            logging.info(f"Total lines read from CSV: {len(df)}")
-
-        elif file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path, header=None)
-            lines = df[0].astype(str).tolist()
-            logging.info(f"Total lines read from Excel: {len(df)}")
-
-        else:
-            logging.error(f"Unsupported file type: {file_path}")
-            raise ValueError("Unsupported file type. Supported formats: .txt, .log, .nmea, .csv, .xlsx")
-
-        # Process each line in the file
-        for nmea_sentence in lines:
-            nmea_sentence = nmea_sentence.strip()
-            logging.debug(f"Processing sentence: {nmea_sentence}")
-
-            try:
-                if nmea_sentence.startswith('$PQTM'):
-                    logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                    msg = pynmea2.parse(nmea_sentence)
-
-                    if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                        raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence", msg)
-
-                    nmea_data.sentence_type = msg.sentence_type
-                    nmea_data.data = msg
-                    nmea_data.add_sentence_data()
-                    nmea_data.add_coordinates()
-                    logging.info(nmea_data)
-
-                elif nmea_sentence.startswith('$G'):
-                    logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                    msg = pynmea2.parse(nmea_sentence)
-
-                    if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                        raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence", msg)
-
-                    nmea_data.sentence_type = msg.sentence_type
-                    nmea_data.data = msg
-                    nmea_data.add_sentence_data()
-                    nmea_data.add_coordinates()
-                    logging.info(nmea_data)
-
-                else:
-                    logging.info(f"Received Unknown Message: {nmea_sentence}")
-
-            except pynmea2.ParseError as e:
-                logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-
-    except Exception as e:
-        logging.error(f"Failed to read or process file: {file_path}. Error: {e}")
-
-    logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-    return parsed_sentences, nmea_data
-# noinspection PyCompatibility
-def process_nmea_log(file_path, timestamp, reference_point=None):
-    """
-    Process pre-collected NMEA log file and calculate CEP.
-
-    Args:
-        file_path (str): Path to the NMEA log file.
-        reference_point (tuple, optional): Custom reference point (latitude, longitude). Defaults to None.
-        :param file_path:
-        :param reference_point:
-        :param timestamp:
-    """
-    logging.info(f"Starting log processing for file: {file_path}")
-
-    # Check if the file exists
-    if not os.path.exists(file_path):
-        logging.error(f"File does not exist: {file_path}")
-        return
-
-    # Process the file to get parsed sentences
+        args.sentence_filter = sentence_filter_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+def fix_filter_from_args(args):
+    """Collect the fix filter options that were given into FixQuery.mask keyword arguments."""
+    options = {"start": args.start, "end": args.end, "skip_first_s": args.skip_first_s, "gps_qual": args.gps_qual,
+               "min_sats": args.min_sats, "hdop": args.hdop}
+    return {key: value for key, value in options.items() if value is not None}
+
+def sentence_filter_from_args(args):
+    """SentenceFilter of --include-types/--exclude-types; without either, GNSS_INCLUDE_TYPES/GNSS_EXCLUDE_TYPES."""
+    if args.include_types or args.exclude_types:
+        return SentenceFilter(args.include_types, args.exclude_types)
+    return sentence_filter_from_environment()
+
+def rolling_window_from_args(args):
+    """Rolling CEP window options as analyze_rolling_cep expects them."""
+    if args.rolling_epochs:
+        return {"window_epochs": args.rolling_epochs}
+    return {"window_s": args.rolling_window} if args.rolling_window else None
+
+def run_dynamic_live_cli(args, timestamp):
+    """Run the headless dynamic live mode of a config file and return the process exit code."""
     try:
-        parsed_sentences, nmea_data = parse_nmea_from_log(file_path)
-    except Exception as e:
-        logging.error(f"Error during parsing NMEA log file: {file_path}. Exception: {e}")
-        return
-
-    if not parsed_sentences:
-        logging.error(f"No valid NMEA sentences found in log file: {file_path}")
-        return
-
-    logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-
-    # Determine or calculate the reference point
-    if reference_point is None:
-        try:
-            logging.info("Calculating the mean point from log data for CEP Analysis.")
-            reference_point = nmea_data.calculate_mean_point()
-        except Exception as e:
-            logging.error(f"Error calculating mean point: {e}")
-            return
-    else:
-        logging.info(f"Using provided reference point: {reference_point}")
-
-    # Calculate CEP values
-    try:
-        cep_value = nmea_data.calculate_cep(reference_point)
-        if cep_value is not None:
-            logging.info(f"Mode 2: CEP statistics for logfile {file_path}:")
-            logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-            logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-            logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-            logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-            logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-        else:
-            logging.info(f"No coordinates available for CEP calculation for log {file_path}.")
-    except Exception as e:
-        logging.error(f"Error calculating CEP values: {e}")
-        return
+        config = load_live_config(args.live_config)
+    except (OSError, ValueError) as e:
+        logging.error(f"Invalid live config {args.live_config}: {e}")
+        return 1
+    if args.sentence_filter is not None:  # Command line filters take precedence over those of the config
+        config["sentence_filter"] = args.sentence_filter
+
+    log_folder = f"logs/NMEA_{timestamp}"
+    profiling = {"enabled": True, "capture": args.profile if args.profile in CAPTURES else None} if args.profile else {}
+    with profile_run(log_folder, timestamp, **profiling):
+        results = run_dynamic_live(config, log_folder, timestamp)
+    return 0 if results else 1
+
+def run_batch_cli(argv, timestamp):
+    """Run the batch mode and return the process exit code."""
+    args = parse_args(argv)
+    if args.live_config:
+        return run_dynamic_live_cli(args, timestamp)
+
+    files = collect_log_files(args.paths)
+    if not files:
+        logging.error("No supported log files found. Supported formats: .txt, .log, .nmea, .csv, .xlsx "
+                      "(optionally compressed as .gz, .zst, .xz or .bz2)")
+        return 1
+
+    reference_point = tuple(args.reference) if args.reference else None
+    # Without --profile, GNSS_PROFILE decides (see gnss_engine.profiling)
+    profiling = {"enabled": True, "capture": args.profile if args.profile in CAPTURES else None} if args.profile else {}
+    with profile_run(f"logs/NMEA_{timestamp}", timestamp, **profiling):
+        df_summary = run_batch(files, timestamp, reference_point, args.reference_log, args.format, args.workers,
+                               args.export_each, args.latency_correction, fix_filter_from_args(args),
+                               rolling_window_from_args(args), sentence_filter=args.sentence_filter)
+    return 0 if df_summary is not None else 1
 
-    logging.info(f"Finished log processing for file: {file_path}")
+if __name__ == "__main__":
+    # Setup timestamp and log folder
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S%f')
+    log_folder = f"logs/NMEA_{timestamp}"
 
-    # Write results to an Excel file
-    try:
-        nmea_data.write_to_excel_mode_2(timestamp, cep_value)
-    except Exception as e:
-        logging.error(f"Error writing to Excel file: {e}")
+    # Any command line arguments select the non-interactive batch (or --live-config) mode
+    if len(sys.argv) > 1:
+        setup_logging(log_folder, timestamp)
+        sys.exit(run_batch_cli(sys.argv[1:], timestamp))
 
-if __name__ == "__main__":
     try:
-        # Setup timestamp and log folder
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S%f')
-        log_folder = f"logs/NMEA_{timestamp}"
         setup_logging(log_folder, timestamp)
 
         active_program = True
@@ -385,25 +228,33 @@ if __name__ == "__main__":
 
                     threads = []
 
-                    # Start a thread for each configured device
-                    for device_name, config in devices.items():
-                        try:
-                            thread = threading.Thread(
-                                target=read_nmea_data,
-                                args=(config["port"], config["baudrate"], config["timeout"], config["duration"],
-                                      log_folder, timestamp, reference_point)
-                            )
-                            threads.append(thread)
-                            thread.start()
-                        except Exception as e:
-                            logging.error(f"Failed to start thread for {device_name}: {e}")
-
-                    # Wait for all threads to finish
-                    for thread in threads:
-                        try:
-                            thread.join()
-                        except Exception as e:
-                            logging.error(f"Error while waiting for thread to finish: {e}")
+                    # Timing report of the run if GNSS_PROFILE is set (see gnss_engine.profiling)
+                    with profile_run(log_folder, timestamp):
+                        # Start a thread for each configured device
+                        for device_name, config in devices.items():
+                            try:
+                                thread = threading.Thread(
+                                    target=run_live_capture,
+                                    args=(config["port"], config["baudrate"], config["timeout"], config["duration"],
+                                          log_folder, timestamp, reference_point),
+                                    # Live metrics if GNSS_METRICS_PORT / GNSS_METRICS_FILE is set, the sentence
+                                    # filter of GNSS_INCLUDE_TYPES / GNSS_EXCLUDE_TYPES and the capture rotation and
+                                    # compression of GNSS_CAPTURE_ROTATE_MB / _ROTATE_MINUTES / _COMPRESSION
+                                    kwargs={"capture": capture_from_environment(),
+                                            "metrics": metrics_from_environment(),
+                                            "sentence_filter": sentence_filter_from_environment()}
+                                )
+                                threads.append(thread)
+                                thread.start()
+                            except Exception as e:
+                                logging.error(f"Failed to start thread for {device_name}: {e}")
+
+                        # Wait for all threads to finish
+                        for thread in threads:
+                            try:
+                                thread.join()
+                            except Exception as e:
+                                logging.error(f"Error while waiting for thread to finish: {e}")
 
                 except Exception as e:
                     logging.error(f"An unexpected error occurred in mode 1: {e}")
@@ -436,8 +287,10 @@ if __name__ == "__main__":
                     else:
                         reference_point = None
 
-                    # Process the log file and calculate CEP
-                    process_nmea_log(file_path, timestamp, reference_point)
+                    # Process the log file and calculate CEP (with a timing report if GNSS_PROFILE is set)
+                    with profile_run(log_folder, timestamp):
+                        process_nmea_log(file_path, timestamp, reference_point,
+                                         sentence_filter=sentence_filter_from_environment())
 
                 except Exception as e:
                     logging.error(f"An error occurred while processing the log file in mode 2: {e}")
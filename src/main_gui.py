@@ -7,14 +7,10 @@ import os
 import threading
 from time import sleep
 import sys
-from time import time
-from gui_class import NMEAData
-import pynmea2
-import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from gnss_engine import (EpochClock, FixStore, MotionStore, analyze_dynamic, capture_from_environment, load_nmea_log,
+                         notify, process_nmea_log, metrics_from_environment, profile_run, read_serial_nmea,
+                         report_satellite_statistics, run_live_capture, sentence_filter_from_environment)
 import datetime
-from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 
 class GNSSTestTool:
 
@@ -22,7 +18,8 @@ class GNSSTestTool:
     def __init__(self, root):
         # Initialize a list to store individual device port configurations
         self.running_threads = []
-        self.dynamic_reference_points = []
+        self.dynamic_reference_points = FixStore()
+        self.dynamic_reference_motion = MotionStore()  # Speed/course/heading of the dynamic reference device
         self.mode = None
         self.file_config_frame_holder = None
         self.results_frame_content = None
@@ -40,7 +37,8 @@ class GNSSTestTool:
         self.accuracy_summary_table = None
         self.accuracy_summary_frame = None
         self.accuracy_graph_frame = None
-        self.fig, self.ax = plt.subplots(figsize=(6, 4))  # Create a Matplotlib figure
+        self.fig = None  # Matplotlib figure, created with the first plot (see load_matplotlib)
+        self.ax = None
         self.accuracy_table_data = {}  # To store summary table rows for all devices
         self.duration_vars = None
         self.timeout_vars = None
@@ -209,11 +207,6 @@ class GNSSTestTool:
                                                     text="Accuracy graph will be displayed here after completion of all active tests.")
         self.accuracy_graph_placeholder.pack(padx=20, pady=20)
 
-        # Initialize the canvas
-        self.canvas = FigureCanvasTkAgg(self.fig, self.accuracy_graph_frame)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(fill="both", expand=True)
-
         # Accuracy Summary (CEP Table)
         accuracy_summary_frame = ttk.LabelFrame(self.accuracy_tab, text="CEP Summary")
         accuracy_summary_frame.pack(fill="x", padx=10, pady=10)
@@ -279,6 +272,7 @@ class GNSSTestTool:
                 ("Log Files", "*.log"),
                 ("Text Files", "*.txt"),
                 ("CSV Files", "*.csv"),
+                ("Compressed Logs", "*.gz *.zst *.xz *.bz2"),
                 ("JSON Files", "*.json"),
                 ("XML Files", "*.xml"),
                 ("All Files", "*.*")
@@ -286,7 +280,7 @@ class GNSSTestTool:
         )
         if file_path:
             # Ensure the file has a recognized extension, default to .txt if not
-            extensions = [".log", ".txt", ".csv", ".json", ".xml"]
+            extensions = [".log", ".txt", ".csv", ".json", ".xml", ".gz", ".zst", ".xz", ".bz2"]
             file_name, ext = os.path.splitext(file_path)
             if ext not in extensions:
                 file_path = f"{file_name}.txt"
@@ -795,7 +789,7 @@ class GNSSTestTool:
 
         # Initialize Serial Configuration Frames
         self.update_file_config_dynamic_frames()
-    def update_accuracy_plot(self, distances, valid_coords, device_name):
+    def update_accuracy_plot(self, distances, valid_coords, device_name, epoch_ns=None, rolling_cep=None):
         """
         Updates the accuracy plot data for a specific device.
 
@@ -803,6 +797,10 @@ class GNSSTestTool:
             distances (list[float]): List of distances from the reference point.
             valid_coords (list[tuple]): List of tuples containing latitude, longitude, and fix_time.
             device_name (str): Name of the device (used in the legend).
+            epoch_ns (np.ndarray, optional): Epoch of each fix (cep_value['epoch_ns']). Keeps the time axis
+                monotonic across midnight; without it fix times are placed on today's date.
+            rolling_cep (dict, optional): Rolling CEP series of each fix (cep_value['rolling_cep']), drawn
+                as a dashed line per device.
         """
         # Ensure device_plot_data is initialized and is a dictionary
         if not hasattr(self, "device_plot_data") or not isinstance(self.device_plot_data, dict):
@@ -814,9 +812,13 @@ class GNSSTestTool:
         else:
             self.device_plot_data[device_name]['fix_times'].clear()
             self.device_plot_data[device_name]['distances'].clear()
+        self.device_plot_data[device_name]['rolling_cep95'] = rolling_cep.get('CEP95') if rolling_cep else None
 
         # Extract fix_times and ensure they are datetime objects
-        fix_times = [fix_time for _, _, fix_time in valid_coords]
+        if epoch_ns is not None:
+            fix_times = EpochClock.to_datetimes(epoch_ns)
+        else:
+            fix_times = [fix_time for _, _, fix_time in valid_coords]
         if isinstance(fix_times[0], datetime.time):  # If fix_time is a datetime.time object
             # Use the current date as a reference
             reference_date = datetime.datetime.now().date()
@@ -825,7 +827,7 @@ class GNSSTestTool:
         # Update the device's data
         self.device_plot_data[device_name]['fix_times'].extend(fix_times)
         self.device_plot_data[device_name]['distances'].extend(distances)
-    def update_dynamic_accuracy_plot(self, distances, valid_coords, device_name):
+    def update_dynamic_accuracy_plot(self, distances, valid_coords, device_name, epoch_ns=None, rolling_cep=None):
         """
         Updates the accuracy plot data for a specific device.
 
@@ -833,6 +835,10 @@ class GNSSTestTool:
             distances (list[float]): List of distances from the reference point.
             valid_coords (list[tuple]): List of tuples containing latitude, longitude, and fix_time.
             device_name (str): Name of the device (used in the legend).
+            epoch_ns (np.ndarray, optional): Epoch of each fix (cep_value['epoch_ns']). Keeps the time axis
+                monotonic across midnight; without it fix times are placed on today's date.
+            rolling_cep (dict, optional): Rolling CEP series of each fix (cep_value['rolling_cep']), drawn
+                as a dashed line per device.
         """
         # Ensure device_plot_data is initialized and is a dictionary
         if not hasattr(self, "device_plot_data") or not isinstance(self.device_plot_data, dict):
@@ -844,9 +850,13 @@ class GNSSTestTool:
         else:
             self.device_plot_data[device_name]['fix_times'].clear()
             self.device_plot_data[device_name]['distances'].clear()
+        self.device_plot_data[device_name]['rolling_cep95'] = rolling_cep.get('CEP95') if rolling_cep else None
 
         # Extract fix_times and ensure they are datetime objects
-        fix_times = [fix_time for _, _, fix_time in valid_coords]
+        if epoch_ns is not None:
+            fix_times = EpochClock.to_datetimes(epoch_ns)
+        else:
+            fix_times = [fix_time for _, _, fix_time in valid_coords]
         if isinstance(fix_times[0], datetime.time):  # If fix_time is a datetime.time object
             # Use the current date as a reference
             reference_date = datetime.datetime.now().date()
@@ -975,10 +985,25 @@ class GNSSTestTool:
         # Insert the updated or new row
         self.accuracy_summary_table.insert("", "end", values=row)
         self.accuracy_table_data[device_name] = row  # Save the row in the dictionary
+    @staticmethod
+    def load_matplotlib():
+        """
+        Import Matplotlib and its Tk backend on first use.
+
+        Matplotlib is the slowest import of the application, so it is deferred until the first plot
+        instead of delaying the appearance of the main window.
+
+        Returns:
+            tuple: (pyplot, FigureCanvasTkAgg, NavigationToolbar2Tk)
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        return plt, FigureCanvasTkAgg, NavigationToolbar2Tk
     def enable_zoom_pan(self):
         """
         Enable zoom and pan functionality using Matplotlib toolbar.
         """
+        _, _, NavigationToolbar2Tk = self.load_matplotlib()
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.accuracy_graph_frame)
         self.toolbar.update()
         self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -994,9 +1019,10 @@ class GNSSTestTool:
         Finalizes and displays the accuracy plot after all threads have completed.
         Ensures no duplicate toolbar buttons are created.
         """
+        plt, FigureCanvasTkAgg, NavigationToolbar2Tk = self.load_matplotlib()
 
         # Clear existing canvas if it exists
-        if hasattr(self, "canvas_widget") and self.canvas_widget.winfo_exists():
+        if self.canvas_widget is not None and self.canvas_widget.winfo_exists():
             self.canvas_widget.destroy()
 
         # Clear existing toolbar if it exists
@@ -1004,7 +1030,7 @@ class GNSSTestTool:
             self.toolbar.destroy()
 
         # Initialize the plot if not already done
-        if not hasattr(self, "fig"):
+        if self.fig is None:
             self.fig, self.ax = plt.subplots(figsize=(8, 6))
         else:
             self.ax.clear()  # Clear existing axes
@@ -1019,6 +1045,10 @@ class GNSSTestTool:
                 linestyle='-',
                 picker=5  # Enable picking for click events
             )
+            # Rolling CEP95 shows where along the run the accuracy degrades
+            if device_data.get('rolling_cep95') is not None:
+                self.ax.plot(device_data['fix_times'], device_data['rolling_cep95'],
+                             label=f"{device_name} rolling CEP95", linestyle='--')
 
         # Set plot titles and labels
         self.ax.set_title("Accuracy Plot")
@@ -1045,9 +1075,10 @@ class GNSSTestTool:
         Finalizes and displays the accuracy plot after all threads have completed.
         Ensures no duplicate toolbar buttons are created.
         """
+        plt, FigureCanvasTkAgg, NavigationToolbar2Tk = self.load_matplotlib()
 
         # Clear existing canvas if it exists
-        if hasattr(self, "canvas_widget") and self.canvas_widget.winfo_exists():
+        if self.canvas_widget is not None and self.canvas_widget.winfo_exists():
             self.canvas_widget.destroy()
 
         # Clear existing toolbar if it exists
@@ -1055,7 +1086,7 @@ class GNSSTestTool:
             self.toolbar.destroy()
 
         # Initialize the plot if not already done
-        if not hasattr(self, "fig"):
+        if self.fig is None:
             self.fig, self.ax = plt.subplots(figsize=(8, 6))
         else:
             self.ax.clear()  # Clear existing axes
@@ -1070,6 +1101,10 @@ class GNSSTestTool:
                 linestyle='-',
                 picker=5  # Enable picking for click events
             )
+            # Rolling CEP95 shows where along the run the accuracy degrades
+            if device_data.get('rolling_cep95') is not None:
+                self.ax.plot(device_data['fix_times'], device_data['rolling_cep95'],
+                             label=f"{device_name} rolling CEP95", linestyle='--')
 
         # Set plot titles and labels
         self.ax.set_title("Accuracy Plot")
@@ -1245,7 +1280,8 @@ class GNSSTestTool:
 
             # Run the test in a separate thread
             test_thread = threading.Thread(
-                target=self.run_live_test, args=(devices, log_folder, timestamp, reference_point), daemon=True
+                target=self.run_profiled, args=(self.run_live_test, devices, log_folder, timestamp, reference_point),
+                daemon=True
             )
             self.running_threads.append(test_thread)
             test_thread.start()
@@ -1295,7 +1331,7 @@ class GNSSTestTool:
             messagebox.showerror("Error", f"An error occurred during the test: {e}")
     def read_nmea_data(self, port, baudrate, timeout, duration, log_folder, timestamp, reference_point=None, stop_event=None, console_widget=None):
         """
-        Reads live NMEA data from a serial port and processes it.
+        Reads live NMEA data from a serial port through the core engine and shows the results.
 
         Args:
             port (str): Serial port to read from (e.g., "COM3").
@@ -1306,178 +1342,46 @@ class GNSSTestTool:
             timestamp (str): Timestamp to append to file names.
             reference_point (tuple, optional): Custom reference point for CEP calculation.
             stop_event (threading.Event, optional): Event to signal the function to stop.
-            :param stop_event:
-            :param reference_point:
-            :param timestamp:
-            :param log_folder:
-            :param duration:
-            :param timeout:
-            :param port:
-            :param baudrate:
-            :param console_widget:
+            console_widget (tk.Text, optional): Console tab of the device.
         """
-        parsed_sentences = []
-        start_time = time()
-        nmea_data = NMEAData(None, None, parsed_sentences)
-
-        # Ensure log folder exists
-        os.makedirs(log_folder, exist_ok=True)
+        result = run_live_capture(port, baudrate, timeout, duration, log_folder, timestamp, reference_point,
+                                  stop_event, self.console_callback(console_widget),
+                                  capture=capture_from_environment(), metrics=metrics_from_environment(),
+                                  sentence_filter=sentence_filter_from_environment())
+        if result:
+            self.show_device_results(f"Device-{port}", result['cep_value'], result['satellite_stats'])
 
-        safe_port = port.replace("/", "_")
-
-        # Open raw NMEA log file
-        raw_nmea_log_path = os.path.join(log_folder, f"nmea_raw_log_mode_1_{safe_port}_{baudrate}_{timestamp}.txt")
-        try:
-            raw_nmea_log = open(raw_nmea_log_path, "a", encoding="utf-8")
-        except Exception as e:
-            logging.error(f"Error opening log file {raw_nmea_log_path}: {e}")
-            return
+    @staticmethod
+    def run_profiled(run, devices, log_folder, timestamp, *args):
+        """
+        Run a test with the opt-in timing instrumentation around it.
 
-        try:
-            # Attempt to configure and open the serial port
-            try:
-                ser = serial.Serial(
-                    port=port,
-                    baudrate=baudrate,
-                    bytesize=serial.EIGHTBITS,
-                    parity=serial.PARITY_NONE,
-                    stopbits=serial.STOPBITS_ONE,
-                    timeout=timeout
-                )
-                logging.info(f"Connected to serial port {port} with baudrate {baudrate}.")
-            except serial.SerialException as e:
-                logging.error(f"Error opening serial port {port}: {e}")
-                self.append_to_console_specific(console_widget, f"Error opening serial port {port}: {e}")
-                return  # Exit function if serial port cannot be opened
-
-            # Continuously read from serial port until duration expires or stop_event is set
-            while time() - start_time < duration:
-                if stop_event and stop_event.is_set():  # Check if stop_event is set
-                    logging.info(f"Stop signal received. Ending data collection on {port}.")
-                    if console_widget:
-                        self.append_to_console_specific(console_widget, f"Stop signal received for {port}.")
-                        ser.close()
-                    break
-                try:
-                    nmea_sentence = ser.readline().decode('ascii', errors='replace').strip()
-
-                    try:
-                        raw_nmea_log.write(nmea_sentence + "\n")
-                    except Exception as e:
-                        logging.error(f"Error writing NMEA sentence to log file: {e}")
-
-                    # Handle proprietary NMEA sentences
-                    if nmea_sentence.startswith('$PQTM'):
-                        logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                        if console_widget:
-                            self.append_to_console_specific(console_widget, f"Proprietary NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                        continue
-
-                    # Handle standard NMEA sentences
-                    if nmea_sentence.startswith('$G'):
-                        logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Standard NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                            self.append_to_console_specific(console_widget, nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                    else:
-                        logging.info(f"Unknown Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Unknown Message: {nmea_sentence}")
-
-                except serial.SerialException as e:
-                    logging.error(f"Error reading from serial port: {e}")
-                    self.append_to_console_specific(console_widget, f"Error reading from serial port: {e}")
-                    break
-            ser.close()
-        except Exception as e:
-            logging.error(f"Unexpected error during serial read: {e}")
-            self.append_to_console_specific(console_widget, f"Unexpected error during serial read: {e}")
+        With the GNSS_PROFILE environment variable set (see gnss_engine.profiling), the time spent in parsing,
+        logging, console updates, CEP and the Excel export is written to the run's log folder when it ends.
+        """
+        with profile_run(log_folder, timestamp):
+            run(devices, log_folder, timestamp, *args)
 
-        finally:
-            # Ensure the log file is closed properly
-            raw_nmea_log.close()
-            logging.info(f"Log file {raw_nmea_log_path} closed.")
-            self.append_to_console_specific(console_widget, f"Log file {raw_nmea_log_path} closed.")
+    def console_callback(self, console_widget):
+        """Return an engine message callback writing to the given console tab (or None without a tab)."""
+        if console_widget is None:
+            return None
+        return lambda message: self.append_to_console_specific(console_widget, message)
 
-        # Calculate CEP and log the results
-        cep_value = nmea_data.calculate_cep(reference_point)
+    def show_device_results(self, device_name, cep_value, satellite_stats, dynamic=False):
+        """Push the CEP and satellite results of one device to the plot and summary tables."""
         if cep_value:
-            self.update_accuracy_plot(cep_value['distances'], cep_value['coordinates'], f"Device-{port}")
-            self.update_accuracy_summary_table(f"Device-{port}", cep_value)
-            logging.info(f"Mode 1: CEP statistics for port {port}:")
-            self.append_to_console_specific(console_widget, f"Mode 1: CEP statistics for port {port}:")
-            logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP50: {cep_value['CEP50']:.2f} meters")
-            logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP68: {cep_value['CEP68']:.2f} meters")
-            logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP90: {cep_value['CEP90']:.2f} meters")
-            logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP95: {cep_value['CEP95']:.2f} meters")
-            logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP99: {cep_value['CEP99']:.2f} meters")
-        else:
-            logging.info(f"No coordinates available for CEP calculation for port {port}.")
-            self.append_to_console_specific(console_widget, f"No coordinates available for CEP calculation for port {port}).")
-
-        # Calculate sats summary and log the results
-        gsv_sats_summary_stats = nmea_data.calculate_satellite_statistics()
-
-        # GSV Satellite Statistics
-        if not gsv_sats_summary_stats.empty:
-            self.update_satellites_summary_table(f"Device-{port}", gsv_sats_summary_stats)
-
-            # Extract statistics for logging
-            gsv_avg_cnr = gsv_sats_summary_stats["Average CNR (SNR) (dB)"].iloc[0]
-            gsv_min_cnr = gsv_sats_summary_stats["Min CNR (SNR) (dB)"].iloc[0]
-            gsv_max_cnr = gsv_sats_summary_stats["Max CNR (SNR) (dB)"].iloc[0]
-            gsv_total_tracked = gsv_sats_summary_stats["Total Satellites Tracked"].iloc[0]
-
-            # Log and append to console
-            logging.info(f"GSV Satellite Statistics for port {port}:")
-            self.append_to_console_specific(console_widget, f"GSV Satellite Statistics for port {port}:")
-            logging.info(f"Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-            logging.info(f"Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-            logging.info(f"Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-            logging.info(f"Total Satellites Tracked: {gsv_total_tracked}")
-            self.append_to_console_specific(console_widget, f"Total Satellites Tracked: {gsv_total_tracked}")
-        else:
-            logging.info(f"No GSV satellite information available for statistics calculation for port {port}.")
-            self.append_to_console_specific(console_widget,
-                                            f"No GSV satellite information available for statistics calculation for port {port}.")
-
+            if dynamic:
+                self.update_dynamic_accuracy_plot(cep_value['distances'], cep_value['coordinates'], device_name,
+                                                  cep_value.get('epoch_ns'), cep_value.get('rolling_cep'))
+                self.update_dynamic_accuracy_summary_table(device_name, cep_value)
+            else:
+                self.update_accuracy_plot(cep_value['distances'], cep_value['coordinates'], device_name,
+                                          cep_value.get('epoch_ns'), cep_value.get('rolling_cep'))
+                self.update_accuracy_summary_table(device_name, cep_value)
 
-            # Save parsed data to Excel
-        nmea_data.write_to_excel_mode_1(port, baudrate, timestamp, cep_value)
+        if satellite_stats is not None and not satellite_stats.empty:
+            self.update_satellites_summary_table(device_name, satellite_stats)
 
     # Static File Mode
     def update_file_config_static_frames(self, event=None):
@@ -1582,7 +1486,7 @@ class GNSSTestTool:
 
             # Run the test in a separate thread
             test_thread = threading.Thread(
-                target=self.run_file_test, args=(devices, log_folder, timestamp, reference_point)
+                target=self.run_profiled, args=(self.run_file_test, devices, log_folder, timestamp, reference_point)
             )
             self.running_threads.append(test_thread)
             test_thread.start()
@@ -1632,270 +1536,26 @@ class GNSSTestTool:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred during the log analysis: {e}")
             logging.error(f"An error occurred during the log analysis: {e}")
-    def parse_nmea_from_log(self,file_path, console_widget, stop_event):
-        """
-        Reads a log file in .txt, .log, .nmea, .csv, or Excel format and parses valid NMEA sentences.
-
-        Args:
-            file_path (str): Path to the log file to be parsed.
-
-        Returns:
-            tuple: A list of parsed sentences and an NMEAData object.
-            :param stop_event:
-            :param file_path:
-            :param console_widget:
-        """
-        parsed_sentences = []
-        nmea_data = NMEAData(None, None, parsed_sentences)
-        logging.info(f"Processing log file: {file_path}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Processing log file: {file_path}")
-
-        try:
-            # Handle different file types based on the file extension
-            if file_path.endswith(('.txt', '.log', '.nmea')):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                logging.info(f"Total lines read from file: {len(lines)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(lines)}")
-
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, header=None)
-                lines = df[0].astype(str).tolist()
-                logging.info(f"Total lines read from CSV: {len(df)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(df)}")
-
-            elif file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path, header=None)
-                lines = df[0].astype(str).tolist()
-                logging.info(f"Total lines read from Excel: {len(df)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(df)}")
-
-            else:
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Unsupported file type: {file_path}")
-                logging.error(f"Unsupported file type: {file_path}")
-                raise ValueError("Unsupported file type. Supported formats: .txt, .log, .nmea, .csv, .xlsx")
-
-            if stop_event and stop_event.is_set():  # Check if stop_event is set
-                logging.info(f"Stop signal received. Ending file processing for {file_path}.")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Stop signal received for {file_path}.")
-                    return
-
-            # Process each line in the file
-            for nmea_sentence in lines:
-                nmea_sentence = nmea_sentence.strip()
-                logging.info(f"Processing sentence: {nmea_sentence}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Processing sentence: {nmea_sentence}")
-
-                if stop_event and stop_event.is_set():  # Check if stop_event is set
-                    logging.info(f"Stop signal received. Ending file processing for {file_path}.")
-                    if console_widget:
-                        self.append_to_console_specific(console_widget, f"Stop signal received for {file_path}.")
-                        return
-                try:
-                    if nmea_sentence.startswith('$PQTM'):
-                        logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                        if console_widget:
-                            self.append_to_console_specific(console_widget, f"Proprietary NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                        continue
-
-                    elif nmea_sentence.startswith('$G'):
-                        logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Standard NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                            self.append_to_console_specific(console_widget, nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-
-                    else:
-                        logging.info(f"Received Unknown Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget,
-                                                        f"Received Unknown Message: {nmea_sentence}")
-
-                except pynmea2.ParseError as e:
-                    logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                    self.append_to_console_specific(console_widget,
-                                                    f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-        except Exception as e:
-            logging.error(f"Failed to read or process file: {file_path}. Error: {e}")
-            self.append_to_console_specific(console_widget,
-                                            f"Failed to read or process file: {file_path}. Error: {e}")
-
-        logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-        self.append_to_console_specific(console_widget,
-                                        f"Total parsed sentences: {len(parsed_sentences)}")
-        return parsed_sentences, nmea_data
     def process_nmea_log(self, file_path, log_folder, timestamp, reference_point=None, stop_event=None, console_widget=None):
         """
-        Process pre-collected NMEA log file and calculate CEP.
+        Process pre-collected NMEA log file through the core engine and show the results.
 
         Args:
             file_path (str): Path to the NMEA log file.
+            log_folder (str): Directory to save log files.
+            timestamp (str): Timestamp to append to file names.
             reference_point (tuple, optional): Custom reference point (latitude, longitude). Defaults to None.
-            :param console_widget:
-            :param stop_event:
-            :param log_folder:
-            :param file_path:
-            :param reference_point:
-            :param timestamp:
+            stop_event (threading.Event, optional): Event to signal the function to stop.
+            console_widget (tk.Text, optional): Console tab of the device.
         """
-
-        filename = os.path.splitext(os.path.basename(file_path))[0]
-
-        logging.info(f"Starting log processing for file: {filename} at {timestamp}")
-
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            logging.error(f"File does not exist: {file_path}")
-            return
-
         # Ensure log folder exists
         os.makedirs(log_folder, exist_ok=True)
 
-        if stop_event and stop_event.is_set():  # Check if stop_event is set
-            logging.info(f"Stop signal received. Ending file processing for {filename}.")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"Stop signal received for {filename}.")
-                return
-
-        # Process the file to get parsed sentences
-        try:
-            parsed_sentences, nmea_data = self.parse_nmea_from_log(file_path, console_widget, stop_event)
-        except Exception as e:
-            logging.error(f"Error during parsing NMEA log file or test stopped: {file_path}. Exception: {e}")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"Error during parsing NMEA log file or test stopped: {file_path}. Exception: {e}")
-            return
-
-        if not parsed_sentences:
-            logging.error(f"No valid NMEA sentences found in log file: {filename}")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"No valid NMEA sentences found in log file: {filename}")
-            return
-
-        logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Total parsed sentences: {len(parsed_sentences)}")
-
-        # Determine or calculate the reference point
-        if reference_point is None:
-            try:
-                logging.info("Calculating the mean point from log data for CEP Analysis.")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, "Calculating the mean point from log data for CEP Analysis.")
-                reference_point = nmea_data.calculate_mean_point()
-            except Exception as e:
-                logging.error(f"Error calculating mean point: {e}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Error calculating mean point: {e}")
-                return
-        else:
-            logging.info(f"Using provided reference point: {reference_point}")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"Using provided reference point: {reference_point}")
-
-        # Calculate CEP values
-        try:
-            cep_value = nmea_data.calculate_cep(reference_point)
-            if cep_value is not None:
-                self.update_accuracy_plot(cep_value['distances'], cep_value['coordinates'], f"Device-{filename}")
-                self.update_accuracy_summary_table(f"Device-{filename}", cep_value)
-                logging.info(f"Mode 2: CEP statistics for logfile {filename}:")
-                self.append_to_console_specific(console_widget, f"Mode 2: CEP statistics for logfile {filename}:")
-                logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP50: {cep_value['CEP50']:.2f} meters")
-                logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP68: {cep_value['CEP68']:.2f} meters")
-                logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP90: {cep_value['CEP90']:.2f} meters")
-                logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP95: {cep_value['CEP95']:.2f} meters")
-                logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP99: {cep_value['CEP99']:.2f} meters")
-            else:
-                logging.info(f"No coordinates available for CEP calculation for log {file_path}.")
-                self.append_to_console_specific(console_widget, f"No coordinates available for CEP calculation for log {file_path}.")
-        except Exception as e:
-            logging.error(f"Error calculating CEP values: {e}")
-            self.append_to_console_specific(console_widget, f"Error calculating CEP values: {e}")
-            return
-
-        # Calculate Satellite Summary
-        try:
-            # Calculate sats summary and log the results
-            gsv_sats_summary_stats = nmea_data.calculate_satellite_statistics()
-
-            # GSV Satellite Statistics
-            if not gsv_sats_summary_stats.empty:
-                self.update_satellites_summary_table(f"Device-{filename}", gsv_sats_summary_stats)
-
-                # Extract statistics for logging
-                gsv_avg_cnr = gsv_sats_summary_stats["Average CNR (SNR) (dB)"].iloc[0]
-                gsv_min_cnr = gsv_sats_summary_stats["Min CNR (SNR) (dB)"].iloc[0]
-                gsv_max_cnr = gsv_sats_summary_stats["Max CNR (SNR) (dB)"].iloc[0]
-                gsv_total_tracked = gsv_sats_summary_stats["Total Satellites Tracked"].iloc[0]
-
-                # Log and append to console
-                logging.info(f"GSV Satellite Statistics for file {filename}:")
-                self.append_to_console_specific(console_widget, f"GSV Satellite Statistics for file {filename}:")
-                logging.info(f"Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-                logging.info(f"Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-                logging.info(f"Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-                logging.info(f"Total Satellites Tracked: {gsv_total_tracked}")
-                self.append_to_console_specific(console_widget, f"Total Satellites Tracked: {gsv_total_tracked}")
-            else:
-                logging.info(f"No GSV satellite information available for statistics calculation for file {file_path}.")
-                self.append_to_console_specific(console_widget,
-                                                f"No GSV satellite information available for statistics calculation for file {file_path}.")
-
-        except Exception as e:
-            logging.error(f"Error calculating GSV Satellite Statistics: {e}")
-            self.append_to_console_specific(console_widget, f"Error calculating GSV Satellite Statistics: {e}")
-
-        logging.info(f"Finished log processing for file: {filename}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Finished log processing for file: {filename}")
-
-        # Write results to an Excel file
-        try:
-            nmea_data.write_to_excel_mode_2(timestamp, cep_value, filename)
-        except Exception as e:
-            logging.error(f"Error writing to Excel file: {e}")
-            self.append_to_console_specific(console_widget, f"Error writing to Excel file: {e}")
-
+        result = process_nmea_log(file_path, timestamp, reference_point, stop_event,
+                                  self.console_callback(console_widget),
+                                  sentence_filter=sentence_filter_from_environment())
+        if result:
+            self.show_device_results(f"Device-{result['name']}", result['cep_value'], result['satellite_stats'])
 
     # Dynamic Live Mode
     def update_serial_config_dynamic_frames(self, event=None):
@@ -2051,7 +1711,7 @@ class GNSSTestTool:
 
             # Run the test in a separate thread
             test_thread = threading.Thread(
-                target=self.run_dynamic_live_mode, args=(devices, log_folder, timestamp)
+                target=self.run_profiled, args=(self.run_dynamic_live_mode, devices, log_folder, timestamp)
             )
             self.running_threads.append(test_thread)
             test_thread.start()
@@ -2100,7 +1760,7 @@ class GNSSTestTool:
             messagebox.showerror("Error", f"An error occurred during the test: {e}")
     def read_dynamic_nmea_data(self, port, baudrate, timeout, duration, log_folder, timestamp, stop_event=None, console_widget=None, name=None):
         """
-        Reads live NMEA data from a serial port and processes it.
+        Reads live NMEA data from a serial port and scores it against the dynamic reference device.
 
         Args:
             port (str): Serial port to read from (e.g., "COM3").
@@ -2109,195 +1769,54 @@ class GNSSTestTool:
             duration (float): Duration to read data (in seconds).
             log_folder (str): Directory to save log files.
             timestamp (str): Timestamp to append to file names.
-            reference_point (tuple, optional): Custom reference point for CEP calculation.
             stop_event (threading.Event, optional): Event to signal the function to stop.
-            :param name:
-            :param stop_event:
-            :param timestamp:
-            :param log_folder:
-            :param duration:
-            :param timeout:
-            :param port:
-            :param baudrate:
-            :param console_widget:
+            console_widget (tk.Text, optional): Console tab of the device.
+            name (str): Index of the device, compared against the reference device index.
         """
-        parsed_sentences = []
-        dynamic_fix_points = []
-        start_time = time()
-        nmea_data = NMEAData(None, None, parsed_sentences)
-
-        # Ensure log folder exists
-        os.makedirs(log_folder, exist_ok=True)
-
-        safe_port = port.replace("/", "_")
-
-        # Open raw NMEA log file
-        raw_nmea_log_path = os.path.join(log_folder, f"nmea_raw_log_mode_1_{safe_port}_{baudrate}_{timestamp}.txt")
-        try:
-            raw_nmea_log = open(raw_nmea_log_path, "a", encoding="utf-8")
-        except Exception as e:
-            logging.error(f"Error opening log file {raw_nmea_log_path}: {e}")
+        on_message = self.console_callback(console_widget)
+        is_reference = int(name) == int(self.reference_device_index)
+        # The reference is always parsed in full: its fixes and motion are what every device is scored against
+        nmea_data = read_serial_nmea(port, baudrate, timeout, duration, log_folder, timestamp, stop_event, on_message,
+                                     capture=capture_from_environment(), metrics=metrics_from_environment(),
+                                     sentence_filter=None if is_reference else sentence_filter_from_environment())
+        if nmea_data is None:
             return
 
+        if is_reference:
+            self.dynamic_reference_motion = nmea_data.motion
+            self.dynamic_reference_points = nmea_data.fixes
 
-        if int(name) == int(self.reference_device_index):
-            dynamic_reference = True
-        else:
-            dynamic_reference = False
-
-        try:
-            # Attempt to configure and open the serial port
-            try:
-                ser = serial.Serial(
-                    port=port,
-                    baudrate=baudrate,
-                    bytesize=serial.EIGHTBITS,
-                    parity=serial.PARITY_NONE,
-                    stopbits=serial.STOPBITS_ONE,
-                    timeout=timeout
-                )
-                logging.info(f"Connected to serial port {port} with baudrate {baudrate}.")
-            except serial.SerialException as e:
-                logging.error(f"Error opening serial port {port}: {e}")
-                self.append_to_console_specific(console_widget, f"Error opening serial port {port}: {e}")
-                return  # Exit function if serial port cannot be opened
-
-            # Continuously read from serial port until duration expires or stop_event is set
-            while time() - start_time < duration:
-                if stop_event and stop_event.is_set():  # Check if stop_event is set
-                    logging.info(f"Stop signal received. Ending data collection on {port}.")
-                    if console_widget:
-                        self.append_to_console_specific(console_widget, f"Stop signal received for {port}.")
-                    break
-                try:
-                    nmea_sentence = ser.readline().decode('ascii', errors='replace').strip()
-
-                    try:
-                        raw_nmea_log.write(nmea_sentence + "\n")
-                    except Exception as e:
-                        logging.error(f"Error writing NMEA sentence to log file: {e}")
-
-                    # Handle proprietary NMEA sentences
-                    if nmea_sentence.startswith('$PQTM'):
-                        logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                        if console_widget:
-                            self.append_to_console_specific(console_widget, f"Proprietary NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                        continue
-                    # Handle standard NMEA sentences
-                    elif nmea_sentence.startswith('$G'):
-                        logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Standard NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            dynamic_fix_points = nmea_data.coordinates
-                            logging.info(nmea_data)
-                            self.append_to_console_specific(console_widget, nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                    else:
-                        logging.info(f"Unknown Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Unknown Message: {nmea_sentence}")
-
-                except serial.SerialException as e:
-                    logging.error(f"Error reading from serial port: {e}")
-                    self.append_to_console_specific(console_widget, f"Error reading from serial port: {e}")
-                    break
+        # Calculate CEP once the reference device has finished
+        if not self.wait_for_dynamic_reference(10, on_message):
+            return
+        cep_value = analyze_dynamic(nmea_data, self.dynamic_reference_points,
+                                    f"Mode 1: CEP statistics for port {port}:", f"port {port}", on_message,
+                                    self.dynamic_reference_motion)
+        satellite_stats = report_satellite_statistics(nmea_data, f"port {port}", on_message)
+        self.show_device_results(f"Device-{port}", cep_value, satellite_stats, dynamic=True)
 
-        except Exception as e:
-            logging.error(f"Unexpected error during serial read: {e}")
-            self.append_to_console_specific(console_widget, f"Unexpected error during serial read: {e}")
+        # Save parsed data to Excel
+        nmea_data.write_to_excel_mode_1_dynamic(port, baudrate, timestamp, cep_value)
 
-        finally:
-            # Ensure the log file is closed properly
-            raw_nmea_log.close()
-            logging.info(f"Log file {raw_nmea_log_path} closed.")
-            self.append_to_console_specific(console_widget, f"Log file {raw_nmea_log_path} closed.")
+    def wait_for_dynamic_reference(self, poll_interval, on_message=None):
+        """
+        Block until the reference device has published its fixes.
 
-        if dynamic_reference:
-            self.dynamic_reference_points = dynamic_fix_points
+        Args:
+            poll_interval (float): Seconds between checks.
+            on_message (callable, optional): Callback receiving the waiting messages.
 
-        # Calculate CEP and log the results
+        Returns:
+            bool: True once reference fixes are available, False if the test was stopped first.
+        """
         for _ in range(2880):
             if len(self.dynamic_reference_points) > 0:
-                break
-            sleep(10)
-            logging.info("Waiting for dynamic_reference_points to be populated...")
-        cep_value = nmea_data.calculate_dynamic_cep(self.dynamic_reference_points, dynamic_fix_points)
-        if cep_value:
-            self.update_dynamic_accuracy_plot(cep_value['distances'], cep_value['coordinates'], f"Device-{port}")
-            self.update_dynamic_accuracy_summary_table(f"Device-{port}", cep_value)
-            logging.info(f"Mode 1: CEP statistics for port {port}:")
-            self.append_to_console_specific(console_widget, f"Mode 1: CEP statistics for port {port}:")
-            logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP50: {cep_value['CEP50']:.2f} meters")
-            logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP68: {cep_value['CEP68']:.2f} meters")
-            logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP90: {cep_value['CEP90']:.2f} meters")
-            logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP95: {cep_value['CEP95']:.2f} meters")
-            logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-            self.append_to_console_specific(console_widget, f"CEP99: {cep_value['CEP99']:.2f} meters")
-        else:
-            logging.info(f"No coordinates available for CEP calculation for port {port}.")
-            self.append_to_console_specific(console_widget, f"No coordinates available for CEP calculation for port {port}.")
-
-        # Calculate sats summary and log the results
-        gsv_sats_summary_stats = nmea_data.calculate_satellite_statistics()
-
-        # GSV Satellite Statistics
-        if not gsv_sats_summary_stats.empty:
-            self.update_satellites_summary_table(f"Device-{port}", gsv_sats_summary_stats)
-
-            # Extract statistics for logging
-            gsv_avg_cnr = gsv_sats_summary_stats["Average CNR (SNR) (dB)"].iloc[0]
-            gsv_min_cnr = gsv_sats_summary_stats["Min CNR (SNR) (dB)"].iloc[0]
-            gsv_max_cnr = gsv_sats_summary_stats["Max CNR (SNR) (dB)"].iloc[0]
-            gsv_total_tracked = gsv_sats_summary_stats["Total Satellites Tracked"].iloc[0]
-
-            # Log and append to console
-            logging.info(f"GSV Satellite Statistics for port {port}:")
-            self.append_to_console_specific(console_widget, f"GSV Satellite Statistics for port {port}:")
-            logging.info(f"Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-            logging.info(f"Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-            logging.info(f"Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-            self.append_to_console_specific(console_widget, f"GSV Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-            logging.info(f"Total Satellites Tracked: {gsv_total_tracked}")
-            self.append_to_console_specific(console_widget, f"Total Satellites Tracked: {gsv_total_tracked}")
-        else:
-            logging.info(f"No GSV satellite information available for statistics calculation for port {port}.")
-            self.append_to_console_specific(console_widget,
-                                            f"No GSV satellite information available for statistics calculation for port {port}.")
-
-
-            # Save parsed data to Excel
-
-        nmea_data.write_to_excel_mode_1_dynamic(port, baudrate, timestamp, cep_value)
+                return True
+            if self.stop_event.is_set():
+                return False
+            sleep(poll_interval)
+            notify("Waiting for dynamic_reference_points to be populated...", on_message)
+        return len(self.dynamic_reference_points) > 0
 
     # Dynamic File Mode
     def update_file_config_dynamic_frames(self, event=None):
@@ -2407,7 +1926,7 @@ class GNSSTestTool:
 
             # Run the test in a separate thread
             test_thread = threading.Thread(
-                target=self.run_dynamic_file_test, args=(devices, log_folder, timestamp)
+                target=self.run_profiled, args=(self.run_dynamic_file_test, devices, log_folder, timestamp)
             )
             self.running_threads.append(test_thread)
             test_thread.start()
@@ -2457,268 +1976,58 @@ class GNSSTestTool:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred during the log analysis: {e}")
             logging.error(f"An error occurred during the log analysis: {e}")
-    def parse_dynamic_nmea_from_log(self,file_path, console_widget, stop_event):
-        """
-        Reads a log file in .txt, .log, .nmea, .csv, or Excel format and parses valid NMEA sentences.
-
-        Args:
-            file_path (str): Path to the log file to be parsed.
-
-        Returns:
-            tuple: A list of parsed sentences and an NMEAData object.
-            :param stop_event:
-            :param file_path:
-            :param console_widget:
-        """
-        parsed_sentences = []
-        dynamic_fix_points = []
-        nmea_data = NMEAData(None, None, parsed_sentences)
-        logging.info(f"Processing log file: {file_path}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Processing log file: {file_path}")
-
-        try:
-            # Handle different file types based on the file extension
-            if file_path.endswith(('.txt', '.log', '.nmea')):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                logging.info(f"Total lines read from file: {len(lines)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(lines)}")
-
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, header=None)
-                lines = df[0].astype(str).tolist()
-                logging.info(f"Total lines read from CSV: {len(df)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(df)}")
-
-            elif file_path.endswith('.xlsx'):
-                df = pd.read_excel(file_path, header=None)
-                lines = df[0].astype(str).tolist()
-                logging.info(f"Total lines read from Excel: {len(df)}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Total lines read from file: {len(df)}")
-
-            else:
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Unsupported file type: {file_path}")
-                logging.error(f"Unsupported file type: {file_path}")
-                raise ValueError("Unsupported file type. Supported formats: .txt, .log, .nmea, .csv, .xlsx")
-
-            if stop_event and stop_event.is_set():  # Check if stop_event is set
-                logging.info(f"Stop signal received. Ending file processing for {file_path}.")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Stop signal received for {file_path}.")
-                    return
-
-            # Process each line in the file
-            for nmea_sentence in lines:
-                nmea_sentence = nmea_sentence.strip()
-                logging.info(f"Processing sentence: {nmea_sentence}")
-                if console_widget:
-                    self.append_to_console_specific(console_widget, f"Processing sentence: {nmea_sentence}")
-
-                if stop_event and stop_event.is_set():  # Check if stop_event is set
-                    logging.info(f"Stop signal received. Ending file processing for {file_path}.")
-                    if console_widget:
-                        self.append_to_console_specific(console_widget, f"Stop signal received for {file_path}.")
-                        return
-                try:
-                    if nmea_sentence.startswith('$PQTM'):
-                        logging.info(f"Proprietary NMEA Message: {nmea_sentence}")
-                        if console_widget:
-                            self.append_to_console_specific(console_widget, f"Proprietary NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            logging.info(nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse proprietary NMEA sentence: {nmea_sentence} - {e}")
-                        continue
-
-                    elif nmea_sentence.startswith('$G'):
-                        logging.info(f"Standard NMEA Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget, f"Standard NMEA Message: {nmea_sentence}")
-                        try:
-                            msg = pynmea2.parse(nmea_sentence)
-                            if not hasattr(msg, 'sentence_type') or not msg.sentence_type:
-                                raise pynmea2.ParseError("Invalid or missing sentence_type in parsed NMEA sentence",
-                                                         msg)
-                            nmea_data.sentence_type = msg.sentence_type
-                            nmea_data.data = msg
-                            nmea_data.add_sentence_data()
-                            nmea_data.add_coordinates()
-                            dynamic_fix_points = nmea_data.coordinates
-                            logging.info(nmea_data)
-                            self.append_to_console_specific(console_widget, nmea_data)
-                        except pynmea2.ParseError as e:
-                            logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                            self.append_to_console_specific(console_widget, f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-
-                    else:
-                        logging.info(f"Received Unknown Message: {nmea_sentence}")
-                        self.append_to_console_specific(console_widget,
-                                                        f"Received Unknown Message: {nmea_sentence}")
-
-                except pynmea2.ParseError as e:
-                    logging.warning(f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-                    self.append_to_console_specific(console_widget,
-                                                    f"Failed to parse NMEA sentence: {nmea_sentence} - {e}")
-        except Exception as e:
-            logging.error(f"Failed to read or process file: {file_path}. Error: {e}")
-            self.append_to_console_specific(console_widget,
-                                            f"Failed to read or process file: {file_path}. Error: {e}")
-
-        logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-        self.append_to_console_specific(console_widget,
-                                        f"Total parsed sentences: {len(parsed_sentences)}")
-        return parsed_sentences, nmea_data, dynamic_fix_points
     def process_dynamic_nmea_log(self, file_path, log_folder, timestamp, stop_event=None, console_widget=None, name=None):
         """
-        Process pre-collected NMEA log file and calculate CEP.
+        Process pre-collected NMEA log file and score it against the dynamic reference log.
 
         Args:
             file_path (str): Path to the NMEA log file.
-            reference_point (tuple, optional): Custom reference point (latitude, longitude). Defaults to None.
-            :param name:
-            :param console_widget:
-            :param stop_event:
-            :param log_folder:
-            :param file_path:
-            :param timestamp:
+            log_folder (str): Directory to save log files.
+            timestamp (str): Timestamp to append to file names.
+            stop_event (threading.Event, optional): Event to signal the function to stop.
+            console_widget (tk.Text, optional): Console tab of the device.
+            name (str): Index of the device, compared against the reference device index.
         """
-
+        on_message = self.console_callback(console_widget)
         filename = os.path.splitext(os.path.basename(file_path))[0]
-
-        logging.info(f"Starting log processing for file: {filename} at {timestamp}")
-
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            logging.error(f"File does not exist: {file_path}")
-            return
+        notify(f"Starting log processing for file: {filename} at {timestamp}", on_message)
 
         # Ensure log folder exists
         os.makedirs(log_folder, exist_ok=True)
 
-        if stop_event and stop_event.is_set():  # Check if stop_event is set
-            logging.info(f"Stop signal received. Ending file processing for {filename}.")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"Stop signal received for {filename}.")
-                return
-
-        if int(name) == int(self.reference_device_index):
-            dynamic_reference = True
-        else:
-            dynamic_reference = False
-
-        # Process the file to get parsed sentences
-        try:
-            parsed_sentences, nmea_data, dynamic_fix_points = self.parse_dynamic_nmea_from_log(file_path, console_widget, stop_event)
-        except Exception as e:
-            logging.error(f"Error during parsing NMEA log file or test stopped: {file_path}. Exception: {e}")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"Error during parsing NMEA log file or test stopped: {file_path}. Exception: {e}")
-            return
-
-        if not parsed_sentences:
-            logging.error(f"No valid NMEA sentences found in log file: {filename}")
-            if console_widget:
-                self.append_to_console_specific(console_widget, f"No valid NMEA sentences found in log file: {filename}")
+        is_reference = int(name) == int(self.reference_device_index)
+        # The reference log is always parsed in full: its fixes and motion are what every log is scored against
+        nmea_data = load_nmea_log(file_path, stop_event, on_message,
+                                  sentence_filter=None if is_reference else sentence_filter_from_environment())
+        if nmea_data is None:
             return
 
-        logging.info(f"Total parsed sentences: {len(parsed_sentences)}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Total parsed sentences: {len(parsed_sentences)}")
+        if is_reference:
+            self.dynamic_reference_motion = nmea_data.motion
+            self.dynamic_reference_points = nmea_data.fixes
 
-        if dynamic_reference:
-            self.dynamic_reference_points = dynamic_fix_points
-
-        # Calculate CEP values
-        for _ in range(2880):
-            if len(self.dynamic_reference_points) > 0:
-                break
-            sleep(30)
-            logging.info("Waiting for dynamic_reference_points to be populated...")
-            self.append_to_console_specific(console_widget, "Waiting for dynamic_reference_points to be populated...")
+        # Calculate CEP values once the reference log has been parsed
+        if not self.wait_for_dynamic_reference(30, on_message):
+            return
         try:
-            cep_value = nmea_data.calculate_dynamic_cep(self.dynamic_reference_points, dynamic_fix_points)
-            if cep_value is not None:
-                self.update_dynamic_accuracy_plot(cep_value['distances'], cep_value['coordinates'], f"Device-{filename}")
-                self.update_dynamic_accuracy_summary_table(f"Device-{filename}", cep_value)
-                logging.info(f"Mode 2: CEP statistics for logfile {filename}:")
-                self.append_to_console_specific(console_widget, f"Mode 2: CEP statistics for logfile {filename}:")
-                logging.info(f"CEP50: {cep_value['CEP50']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP50: {cep_value['CEP50']:.2f} meters")
-                logging.info(f"CEP68: {cep_value['CEP68']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP68: {cep_value['CEP68']:.2f} meters")
-                logging.info(f"CEP90: {cep_value['CEP90']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP90: {cep_value['CEP90']:.2f} meters")
-                logging.info(f"CEP95: {cep_value['CEP95']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP95: {cep_value['CEP95']:.2f} meters")
-                logging.info(f"CEP99: {cep_value['CEP99']:.2f} meters")
-                self.append_to_console_specific(console_widget, f"CEP99: {cep_value['CEP99']:.2f} meters")
-            else:
-                logging.info(f"No coordinates available for CEP calculation for log {file_path}.")
-                self.append_to_console_specific(console_widget, f"No coordinates available for CEP calculation for log {file_path}.")
+            cep_value = analyze_dynamic(nmea_data, self.dynamic_reference_points,
+                                        f"Mode 2: CEP statistics for logfile {filename}:", f"log {file_path}",
+                                        on_message, self.dynamic_reference_motion)
         except Exception as e:
-            logging.error(f"Error calculating CEP values: {e}")
-            self.append_to_console_specific(console_widget, f"Error calculating CEP values: {e}")
+            notify(f"Error calculating CEP values: {e}", on_message, logging.ERROR)
             return
 
-        # Calculate Satellite Summary
         try:
-            # Calculate sats summary and log the results
-            gsv_sats_summary_stats = nmea_data.calculate_satellite_statistics()
-
-            # GSV Satellite Statistics
-            if not gsv_sats_summary_stats.empty:
-                self.update_satellites_summary_table(f"Device-{filename}", gsv_sats_summary_stats)
-
-                # Extract statistics for logging
-                gsv_avg_cnr = gsv_sats_summary_stats["Average CNR (SNR) (dB)"].iloc[0]
-                gsv_min_cnr = gsv_sats_summary_stats["Min CNR (SNR) (dB)"].iloc[0]
-                gsv_max_cnr = gsv_sats_summary_stats["Max CNR (SNR) (dB)"].iloc[0]
-                gsv_total_tracked = gsv_sats_summary_stats["Total Satellites Tracked"].iloc[0]
-
-                # Log and append to console
-                logging.info(f"GSV Satellite Statistics for file {filename}:")
-                self.append_to_console_specific(console_widget, f"GSV Satellite Statistics for file {filename}:")
-                logging.info(f"Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Average CNR (SNR) (dB): {gsv_avg_cnr:.2f}")
-                logging.info(f"Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Minimum CNR (SNR) (dB): {gsv_min_cnr:.2f}")
-                logging.info(f"Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-                self.append_to_console_specific(console_widget, f"GSV Maximum CNR (SNR) (dB): {gsv_max_cnr:.2f}")
-                logging.info(f"Total Satellites Tracked: {gsv_total_tracked}")
-                self.append_to_console_specific(console_widget, f"Total Satellites Tracked: {gsv_total_tracked}")
-            else:
-                logging.info(f"No GSV satellite information available for statistics calculation for file {file_path}.")
-                self.append_to_console_specific(console_widget,
-                                                f"No GSV satellite information available for statistics calculation for file {file_path}.")
-
+            satellite_stats = report_satellite_statistics(nmea_data, f"file {filename}", on_message)
         except Exception as e:
-            logging.error(f"Error calculating GSV Satellite Statistics: {e}")
-            self.append_to_console_specific(console_widget, f"Error calculating GSV Satellite Statistics: {e}")
+            notify(f"Error calculating GSV Satellite Statistics: {e}", on_message, logging.ERROR)
+            satellite_stats = None
 
-        logging.info(f"Finished log processing for file: {filename}")
-        if console_widget:
-            self.append_to_console_specific(console_widget, f"Finished log processing for file: {filename}")
+        self.show_device_results(f"Device-{filename}", cep_value, satellite_stats, dynamic=True)
+        notify(f"Finished log processing for file: {filename}", on_message)
 
         # Write results to an Excel file
-        try:
-            nmea_data.write_to_excel_mode_2_dynamic(timestamp, cep_value, filename)
-        except Exception as e:
-            logging.error(f"Error writing to Excel file: {e}")
-            self.append_to_console_specific(console_widget, f"Error writing to Excel file: {e}")
+        nmea_data.write_to_excel_mode_2_dynamic(timestamp, cep_value, filename)
 
     # Cleaners
     def clear_accuracy_summary_table(self):
@@ -2780,10 +2089,12 @@ class GNSSTestTool:
             self.satellite_table_data = {}
     def clear_dynamic_reference_points(self):
         """
-        Clears the content of self.dynamic_reference_points if it is a list.
+        Clears the fixes and motion data of the dynamic reference device.
         """
         if hasattr(self, 'dynamic_reference_points'):
             self.dynamic_reference_points.clear()
+        if hasattr(self, 'dynamic_reference_motion'):
+            self.dynamic_reference_motion.clear()
 
 if __name__ == "__main__":
 
@@ -0,0 +1,140 @@
+# Standard Library Imports
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, time
+
+# Local Application Imports
+from gnss_engine import (NMEAData, extract_file, extract_files, get_log_index, profile_run, scan_sentences,
+                         sentence_pattern)
+from gnss_engine.batch import BATCH_OUTPUT_FORMATS, collect_log_files, run_batch
+from gnss_engine.ingest import split_compression
+from gnss_engine.log_index import DEFAULT_INDEX_EVERY
+from main import positive_number
+
+# Headless counterpart of gga_gsv_extractor_gui.py: the extraction itself is done by gnss_engine.extract
+TEXT_LOG_EXTENSIONS = ('.txt', '.log', '.nmea')
+
+def parse_args(argv):
+    """
+    Parse the command line of the extractor.
+
+    Args:
+        argv (list[str]): Command line arguments, without the program name.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Extract NMEA sentence types from raw logs, to files, to stdout, or straight into the CEP "
+                    "analysis (one pass over each log, no intermediate files).",
+        epilog="Filters: GGA (any talker), GNGGA (talker and type), PQTMEPE (proprietary), PQTM* (prefix), "
+               "* (every sentence).")
+    parser.add_argument("paths", nargs="+", help="Log files, directories (searched recursively) or glob patterns")
+    parser.add_argument("--types", nargs="+", metavar="TYPE", help="Sentence filters to keep")
+    parser.add_argument("--start", type=time.fromisoformat, metavar="HH:MM:SS",
+                        help="UTC time of day of the first epoch to keep")
+    parser.add_argument("--end", type=time.fromisoformat, metavar="HH:MM:SS",
+                        help="UTC time of day where the extraction ends (may wrap past midnight)")
+    parser.add_argument("--decimate", type=int, default=1, metavar="N", help="Keep every N-th epoch only")
+    parser.add_argument("--workers", type=positive_number(int), default=None,
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--build-index", action="store_true",
+                        help="Build (or refresh) the sidecar index <log>.idx.json of every uncompressed log, so time "
+                             "windows only read the part of the log around them. Without --types, only indexes.")
+    parser.add_argument("--index-every", type=int, default=DEFAULT_INDEX_EVERY, metavar="N",
+                        help=f"Index every N-th epoch (default: {DEFAULT_INDEX_EVERY})")
+
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output-folder", metavar="DIR",
+                        help="Folder of the extracted files (default: logs/NMEA_<timestamp>)")
+    output.add_argument("--stdout", action="store_true",
+                        help="Write the extracted sentences to stdout, for piping into other tools")
+    output.add_argument("--cep", action="store_true",
+                        help="Parse the extracted sentences and run the batch CEP analysis instead of writing them")
+
+    analysis = parser.add_argument_group("CEP analysis (with --cep)")
+    analysis.add_argument("--reference", nargs=2, type=float, metavar=("LAT", "LON"),
+                          help="Static reference point. Defaults to the mean point of each log.")
+    analysis.add_argument("--format", choices=BATCH_OUTPUT_FORMATS, default="xlsx",
+                          help="Format of the consolidated summary table (default: xlsx)")
+    analysis.add_argument("--export-each", action="store_true",
+                          help="Also write the full Excel workbook of every log file")
+    args = parser.parse_args(argv)
+    if not args.types and not args.build_index:
+        parser.error("--types is required (unless only building indexes with --build-index)")
+    return args
+
+def extract_options_from_args(args):
+    """Collect the extraction options into extract.scan_sentences keyword arguments."""
+    options = {"types": args.types, "start": args.start, "end": args.end, "decimate": args.decimate}
+    return {key: value for key, value in options.items() if value is not None}
+
+def write_to_stdout(files, extract):
+    """Stream the extracted sentences of every log to stdout, in file order."""
+    out = sys.stdout.buffer
+    try:
+        for path in files:
+            for line in scan_sentences(path, **extract):
+                out.write(line)
+        out.flush()
+    except BrokenPipeError:
+        # The reading end (e.g. "head") closed early; that is not an error of the extraction
+        sys.stderr.close()
+
+def run_extract_cli(argv, timestamp):
+    """Run the extractor and return the process exit code."""
+    args = parse_args(argv)
+    extract = extract_options_from_args(args)
+    log_folder = f"logs/NMEA_{timestamp}"
+
+    if args.stdout:  # stdout carries the sentences, so the log goes to stderr only
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s', stream=sys.stderr)
+    else:
+        NMEAData.setup_logging(log_folder, timestamp)
+
+    try:
+        if args.types:
+            sentence_pattern(args.types)
+    except ValueError as e:
+        logging.error(e)
+        return 1
+
+    files = [path for path in collect_log_files(args.paths)
+             if split_compression(path)[0].lower().endswith(TEXT_LOG_EXTENSIONS)]
+    if not files:
+        logging.error("No raw log files found. Supported formats: .txt, .log, .nmea "
+                      "(optionally compressed as .gz, .zst, .xz or .bz2)")
+        return 1
+
+    if args.build_index:
+        for path in files:
+            if split_compression(path)[1] is None:
+                get_log_index(path, args.index_every)
+            else:
+                logging.warning(f"Not indexing compressed log {path}: a compressed stream cannot be seeked into.")
+        if not args.types:
+            return 0
+
+    if args.stdout:
+        write_to_stdout(files, extract)
+        return 0
+
+    if args.cep:
+        reference_point = tuple(args.reference) if args.reference else None
+        with profile_run(log_folder, timestamp):  # Timing report if GNSS_PROFILE is set (see gnss_engine.profiling)
+            df_summary = run_batch(files, timestamp, reference_point, output_format=args.format,
+                                   workers=args.workers, export_each=args.export_each, extract=extract)
+        return 0 if df_summary is not None else 1
+
+    output_folder = args.output_folder or log_folder
+    os.makedirs(output_folder, exist_ok=True)
+    if len(files) == 1:
+        extract_file(files[0], output_folder, **extract)
+        return 0
+    results = extract_files(files, output_folder, workers=args.workers, **extract)
+    return 0 if all(results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(run_extract_cli(sys.argv[1:], datetime.now().strftime('%Y%m%d_%H%M%S%f')))
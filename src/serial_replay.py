@@ -0,0 +1,110 @@
+# Standard Library Imports
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import sys
+from datetime import datetime
+
+# Local Application Imports
+from gnss_engine import NMEAData, find_max_rate, run_replay
+
+# Load test of the live capture path: recorded logs are replayed into pseudo-terminals (one per simulated device)
+# and read by the same read_serial_nmea threads as a live run. Linux and macOS only.
+DEFAULT_RATES = (1, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+def parse_args(argv):
+    """
+    Parse the command line of the replay benchmark.
+
+    Args:
+        argv (list[str]): Command line arguments, without the program name.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Replay recorded NMEA logs into simulated serial devices and measure the sentence rate, "
+                    "losses and latency of the live capture path.",
+        epilog='Example: python serial_replay.py "../example/Dynamic Log Example/GGA only/*.txt" '
+               '--devices 1 4 16 32 --find-max-rate')
+    parser.add_argument("logs", nargs="+", help="Uncompressed raw logs or glob patterns to replay")
+    parser.add_argument("--devices", type=int, nargs="+", default=[1], metavar="N",
+                        help="Device counts to run, e.g. 1 4 16 32 (default: 1)")
+    parser.add_argument("--baudrate", type=int, default=115200, help="Link speed of every device (default: 115200)")
+    pacing = parser.add_mutually_exclusive_group()
+    pacing.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed relative to the log's timing; 0 = as fast as the baud rate allows")
+    pacing.add_argument("--epoch-rate", type=float, metavar="HZ", help="Fixed epoch rate instead of the log's timing")
+    pacing.add_argument("--find-max-rate", action="store_true",
+                        help="Raise the epoch rate through --rates until the devices fall behind")
+    parser.add_argument("--rates", type=float, nargs="+", default=list(DEFAULT_RATES), metavar="HZ",
+                        help="Epoch rates tried by --find-max-rate")
+    parser.add_argument("--max-latency-ms", type=float, default=100.0,
+                        help="P95 latency above which a rate is not sustained (default: 100)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Replay time of every run in seconds (default: 10)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the per-sentence console log of the consumers")
+    return parser.parse_args(argv)
+
+def print_report(report):
+    """Print one line per device and a total line for a replay run."""
+    pacing = f"{report['epoch_rate']:g} Hz" if report['epoch_rate'] else f"speed {report['speed']:g}x"
+    print(f"{report['device_count']} device(s), {report['baudrate']} baud, {pacing}:")
+    rows = [dict(row, lost_lines=row['dropped_lines'] + row['truncated_lines']) for row in report['devices']]
+    for row in rows + [dict(report['totals'], device="all", port="")]:
+        print(f"  {row['device']:>4} {row['port']:<14} {row['sent_rate']:9.1f} lines/s  lost {row['lost_lines']:6d}  "
+              f"corrupt {row['corrupt_lines']:6d}  latency P50 {row['latency_p50_ms']:8.2f}  "
+              f"P95 {row['latency_p95_ms']:8.2f}  max {row['latency_max_ms']:8.2f} ms")
+
+def json_safe(value):
+    """Replace NaN (no latency measured) with None, so the report stays valid JSON."""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [json_safe(item) for item in value]
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+def run_replay_cli(argv, timestamp):
+    """Run the replay benchmark and return the process exit code."""
+    args = parse_args(argv)
+    log_folder = f"logs/NMEA_{timestamp}"
+    NMEAData.setup_logging(log_folder, timestamp)
+    if not args.verbose:  # Every consumer logs each sentence at INFO, which would swamp the console
+        logging.getLogger().setLevel(logging.WARNING)
+
+    logs = sorted({path for pattern in args.logs for path in (glob.glob(pattern) or [pattern]) if os.path.isfile(path)})
+    if not logs:
+        logging.error("No log files found.")
+        return 1
+
+    options = {'log_folder': os.path.join(log_folder, "replay"), 'timestamp': timestamp}
+    results = []
+    try:
+        for devices in args.devices:
+            if args.find_max_rate:
+                sustained, reports = find_max_rate(logs, devices, args.baudrate, args.rates, args.duration,
+                                                   args.max_latency_ms, **options)
+                for report in reports:
+                    print_report(report)
+                print(f"Highest sustained epoch rate with {devices} device(s): "
+                      f"{f'{sustained:g} Hz' if sustained else 'none of the rates tried'}")
+                results.append({'device_count': devices, 'max_sustained_epoch_rate': sustained, 'runs': reports})
+            else:
+                report = run_replay(logs, devices, args.baudrate, args.speed, args.epoch_rate, args.duration,
+                                    **options)
+                print_report(report)
+                results.append(report)
+    except (OSError, ValueError) as e:  # No pseudo-terminals on this platform, or none left
+        logging.error(f"Serial replay failed: {e}")
+        return 1
+
+    json_path = os.path.join(log_folder, f"replay_benchmark_{timestamp}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(json_safe({'logs': logs, 'results': results}), f, indent=2)
+    print(f"Results written to {json_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_replay_cli(sys.argv[1:], datetime.now().strftime('%Y%m%d_%H%M%S%f')))
@@ -0,0 +1,53 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# The engine and the front-ends live in src/ and are run from there, not installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gnss_engine import nmea_checksum  # noqa: E402
+
+
+def sentence(body):
+    """Complete NMEA line ("$<body>*hh\\r\\n") with a correct checksum."""
+    return f"${body}*{nmea_checksum(body.encode('ascii')):02X}\r\n"
+
+
+def utc_field(seconds):
+    """hhmmss.ss field of a time of day in seconds (wrapped past midnight)."""
+    seconds %= 86400
+    return f"{int(seconds // 3600):02d}{int(seconds % 3600 // 60):02d}{seconds % 60:05.2f}"
+
+
+def write_log(path, epoch_seconds):
+    """
+    Write a log with a GGA, a GSV and a proprietary sentence per epoch.
+
+    Args:
+        path: Log to write.
+        epoch_seconds (iterable[float]): Time of day of every epoch in seconds; values of 86400 and more
+            fall on the next days, so a log can cross midnight.
+
+    Returns:
+        list[str]: The lines written, in order.
+    """
+    lines = []
+    for number, seconds in enumerate(epoch_seconds):
+        lines.append(sentence(f"GNGGA,{utc_field(seconds)},3723.2475,N,12158.3416,W,1,{8 + number % 10},0.9,"
+                              f"10.0,M,0.0,M,,"))
+        lines.append(sentence(f"GPGSV,1,1,01,{1 + number % 32:02d},40,083,46"))
+        lines.append(sentence(f"PQTMEPE,2,{number % 7 / 10:.3f},0.500,1.000,0.700,1.200"))
+    with open(path, 'w', encoding='ascii', newline='') as f:
+        f.writelines(lines)
+    return lines
+
+
+@pytest.fixture
+def make_log(tmp_path):
+    """Factory writing a log (see write_log) into the test's temporary folder. Returns (path, lines)."""
+    def make(epoch_seconds, name='log.txt'):
+        path = str(tmp_path / name)
+        return path, write_log(path, epoch_seconds)
+    return make
@@ -0,0 +1,34 @@
+# test_capture.py
+import time
+
+from gnss_engine import RawCaptureWriter
+
+
+def test_quiet_port_flushes_on_read_timeouts(tmp_path):
+    path = str(tmp_path / 'capture.txt')
+    writer = RawCaptureWriter(path, flush_interval_s=0.05)
+    try:
+        writer.write(b'$GPTXT,01,01,02,first*00\r\n')
+        with open(path, 'rb') as f:
+            assert f.read() == b''  # Buffered until the interval has passed
+
+        time.sleep(0.1)
+        writer.write(b'')  # Read timeout: no data, but the buffer is due
+        with open(path, 'rb') as f:
+            assert f.read() == b'$GPTXT,01,01,02,first*00\r\n'
+        with open(str(tmp_path / 'capture_rx_times.tsv'), 'rb') as f:
+            assert f.read().startswith(b'0\t')
+    finally:
+        writer.close()
+
+
+def test_empty_reads_do_not_flush_early(tmp_path):
+    path = str(tmp_path / 'capture.txt')
+    with RawCaptureWriter(path, flush_interval_s=60) as writer:
+        writer.write(b'$GPTXT,01,01,02,first*00\r\n')
+        writer.write(b'')
+        with open(path, 'rb') as f:
+            assert f.read() == b''
+        assert writer.lines_written == 1
+    with open(path, 'rb') as f:
+        assert f.read() == b'$GPTXT,01,01,02,first*00\r\n'
@@ -0,0 +1,63 @@
+# test_dynamic.py
+import datetime
+
+import numpy as np
+
+from gnss_engine import FixStore, NMEAData
+from gnss_engine.dynamic import calculate_track_errors, reference_track_tangent
+
+LATITUDE, LONGITUDE = 37.0, -122.0
+METERS_PER_DEGREE = 111_320.0
+
+
+def fix_time(second):
+    return datetime.time(12, 0, second)
+
+
+def straight_track(seconds, north_offset_m=0.0, dropouts=()):
+    # Eastbound track at 5 m/s; dropouts are GGA without a position (stored as 0, 0)
+    store = FixStore()
+    for second in seconds:
+        if second in dropouts:
+            store.append(fix_time(second), 0.0, 0.0)
+            continue
+        east_m = 5.0 * second
+        store.append(fix_time(second), LATITUDE + north_offset_m / METERS_PER_DEGREE,
+                     LONGITUDE + east_m / (METERS_PER_DEGREE * np.cos(np.radians(LATITUDE))))
+    return store
+
+
+def test_tangent_skips_reference_dropouts():
+    reference = straight_track(range(20), dropouts={10})
+    tangent_east, tangent_north = reference_track_tangent(reference)
+
+    assert np.isnan(tangent_east[10]) and np.isnan(tangent_north[10])
+    usable = np.arange(20) != 10
+    np.testing.assert_allclose(tangent_east[usable], 1.0, atol=1e-4)
+    np.testing.assert_allclose(tangent_north[usable], 0.0, atol=1e-4)
+
+
+def test_tangent_follows_time_order():
+    # The same track logged out of order, with a row without a time
+    order = [0, 1, 2, 5, 3, 4, 6, 7]
+    reference = straight_track(order)
+    reference.append(None, LATITUDE, LONGITUDE)
+    tangent_east, tangent_north = reference_track_tangent(reference)
+
+    np.testing.assert_allclose(tangent_east[:-1], 1.0, atol=1e-4)
+    np.testing.assert_allclose(tangent_north[:-1], 0.0, atol=1e-4)
+    assert np.isnan(tangent_east[-1])
+
+
+def test_track_errors_with_reference_dropout():
+    # The device runs 1 m left (north) of an eastbound reference: cross-track -1 m, along-track 0 (within the
+    # few mm of the flat-earth offsets above)
+    reference = straight_track(range(20), dropouts={10})
+    device = straight_track(range(20), north_offset_m=1.0)
+    cep_value = NMEAData(None, None, []).calculate_dynamic_cep(reference, device)
+
+    errors = calculate_track_errors(cep_value, reference)['errors']
+    scored = ~np.isnan(errors["Cross-Track Error (m)"])
+    assert np.count_nonzero(scored) == 19  # Every epoch but the dropout
+    np.testing.assert_allclose(errors["Cross-Track Error (m)"][scored], -1.0, atol=0.01)
+    np.testing.assert_allclose(errors["Along-Track Error (m)"][scored], 0.0, atol=0.01)
@@ -0,0 +1,63 @@
+# test_fix_store.py
+import datetime
+
+import numpy as np
+
+from gnss_engine import DAY_NS, EpochClock, FixStore
+
+
+def seconds_ns(hours, minutes, seconds):
+    return int((hours * 3600 + minutes * 60 + seconds) * 1e9)
+
+
+def test_midnight_rollover_advances_the_day():
+    store = FixStore()
+    times = [datetime.time(23, 59, 58), datetime.time(23, 59, 59), datetime.time(0, 0, 0),
+             datetime.time(0, 0, 1)]
+    for fix_time in times:
+        store.append(fix_time, 37.0, -122.0)
+
+    epochs = store.epoch_ns
+    assert list(epochs) == [seconds_ns(23, 59, 58), seconds_ns(23, 59, 59), DAY_NS, DAY_NS + seconds_ns(0, 0, 1)]
+    assert np.all(np.diff(epochs) == 1_000_000_000)
+    assert store.clock.day == 1
+
+
+def test_multi_day_soak_is_monotonic():
+    store = FixStore()
+    # 3 days at one fix every 7 minutes: the time of day wraps twice
+    for minute in range(0, 3 * 24 * 60, 7):
+        store.append(datetime.time((minute // 60) % 24, minute % 60), 37.0, -122.0)
+
+    epochs = store.epoch_ns
+    assert np.all(np.diff(epochs) == 7 * 60 * 1_000_000_000)
+    assert store.clock.day == 2
+
+
+def test_small_backward_jump_is_not_a_rollover():
+    clock = EpochClock()
+    assert clock.day_of(seconds_ns(12, 0, 0)) == 0
+    assert clock.day_of(seconds_ns(11, 59, 0)) == 0  # A receiver reset or out-of-order sentence
+    assert clock.day_of(seconds_ns(23, 59, 59)) == 0
+    assert clock.day_of(seconds_ns(0, 0, 0)) == 1
+
+
+def test_unknown_times_do_not_move_the_clock():
+    clock = EpochClock()
+    clock.day_of(seconds_ns(23, 59, 59))
+    assert clock.day_of(-1) == 0
+    assert clock.epoch_of(-1) == -1
+    assert clock.day_of(seconds_ns(0, 0, 1)) == 1
+
+
+def test_date_anchors_the_timeline():
+    store = FixStore()
+    store.append(datetime.time(23, 59, 59), 37.0, -122.0)
+    store.append(datetime.time(0, 0, 0), 37.0, -122.0)
+    # An RMC of the second day dates the clock; day 0 is the day before
+    store.clock.set_date(datetime.date(2024, 3, 1), seconds_ns(0, 0, 0))
+    assert store.clock.base_date == datetime.date(2024, 2, 29)
+
+    midnight = int(datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc).timestamp()) * 1_000_000_000
+    assert list(store.epoch_ns) == [midnight - 1_000_000_000, midnight]
+    assert list(store.timeline_ns(absolute=False)) == [seconds_ns(23, 59, 59), DAY_NS]
@@ -0,0 +1,147 @@
+# test_log_index.py
+import datetime
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from conftest import write_log
+from gnss_engine import FixQuery, LogIndex, get_log_index, load_nmea_log, scan_sentences
+from gnss_engine.log_index import index_path
+
+MIDNIGHT = 86400
+
+
+def naive_window(lines, types, start=None, end=None):
+    # Lines of the selected types in epochs whose time of day is in [start, end) (wrapping past midnight)
+    def seconds(value):
+        return value.hour * 3600 + value.minute * 60 + value.second
+
+    def in_window(time_of_day):
+        if start is not None and end is not None and seconds(end) < seconds(start):
+            return time_of_day >= seconds(start) or time_of_day < seconds(end)
+        return (start is None or time_of_day >= seconds(start)) and (end is None or time_of_day < seconds(end))
+
+    selected, keep = [], False
+    for line in lines:
+        address, fields = line[1:6], line.split(',')
+        if address.endswith('GGA'):
+            field = fields[1]
+            keep = in_window(int(field[0:2]) * 3600 + int(field[2:4]) * 60 + float(field[4:]))
+        if keep and any(kind == '*' or address.endswith(kind) or line[1:].startswith(kind) for kind in types):
+            selected.append(line.encode('ascii'))
+    return selected
+
+
+def indexed_scan(path, types, start, end, every=3):
+    # Scan through a fresh index of the log (every 3rd epoch, so slices rarely start on a window bound)
+    LogIndex.build(path, every).save()
+    return list(scan_sentences(path, types, start, end))
+
+
+# Windows on a log from 23:00 on day 0 to 01:00 on day 2 (one epoch every 5 s)
+WINDOWS = [
+    (datetime.time(23, 59, 30), datetime.time(0, 0, 30)),  # Across both midnights
+    (datetime.time(0, 0, 0), datetime.time(0, 1, 0)),  # Starting on a midnight
+    (datetime.time(23, 0, 0), datetime.time(23, 0, 20)),  # At the very start of the log
+    (datetime.time(0, 59, 40), datetime.time(1, 0, 0)),  # At the very end of the log
+    (datetime.time(12, 0, 2), datetime.time(12, 0, 13)),  # Bounds between epochs, day 1 only
+    (datetime.time(23, 30, 0), None),  # Open ends
+    (None, datetime.time(0, 30, 0)),
+    (datetime.time(5, 0, 0), datetime.time(5, 0, 0)),  # Empty
+]
+
+
+@pytest.fixture
+def two_day_log(make_log):
+    return make_log(range(23 * 3600, 2 * MIDNIGHT + 3600, 5))
+
+
+@pytest.mark.parametrize('start, end', WINDOWS)
+@pytest.mark.parametrize('types', [['GGA'], ['GSV', 'PQTMEPE'], ['*']])
+def test_indexed_extraction_matches_full_scan(two_day_log, types, start, end):
+    path, lines = two_day_log
+    full = list(scan_sentences(path, types, start, end))  # No index yet: the whole log is scanned
+    assert full == naive_window(lines, types, start, end)
+    assert indexed_scan(path, types, start, end) == full
+
+
+def test_index_reads_only_the_window(two_day_log):
+    path, _ = two_day_log
+    index = LogIndex.build(path, every=3)
+    ranges = index.time_of_day_ranges(datetime.time(23, 59, 30), datetime.time(0, 0, 30))
+    # Around both midnights the log crosses (plus the last indexed epochs, which may precede a window on day 2)
+    assert [epoch for _, _, epoch in ranges[:2]] == [714, 714 + MIDNIGHT // 5]  # 23:59:30 is an indexed epoch
+    assert sum(last - first for first, last, _ in ranges) < os.path.getsize(path) / 100
+
+
+def test_indexed_extraction_with_time_jumping_back(make_log):
+    # Two recordings appended to each other: 10:00-10:10, then 09:55-10:05 again
+    path, lines = make_log(list(range(36000, 36600)) + list(range(35700, 36300)))
+    start, end = datetime.time(10, 0, 0), datetime.time(10, 2, 0)
+    full = list(scan_sentences(path, ['GGA'], start, end))
+    assert full == naive_window(lines, ['GGA'], start, end)
+    assert len(full) == 240  # Both recordings
+    assert indexed_scan(path, ['GGA'], start, end) == full
+
+
+def test_decimated_indexed_extraction_matches_full_scan(two_day_log):
+    path, _ = two_day_log
+    start, end = datetime.time(23, 58, 0), datetime.time(0, 2, 0)
+    full = list(scan_sentences(path, ['GGA'], start, end, decimate=4))
+    LogIndex.build(path, every=3).save()
+    assert list(scan_sentences(path, ['GGA'], start, end, decimate=4)) == full
+
+
+def test_stale_or_old_index_is_ignored(two_day_log):
+    path, _ = two_day_log
+    get_log_index(path)
+    assert LogIndex.load(path) is not None
+
+    with open(index_path(path), encoding='utf-8') as f:
+        content = f.read()
+    with open(index_path(path), 'w', encoding='utf-8') as f:
+        f.write(content.replace('"version":', '"old_version":'))
+    assert LogIndex.load(path) is None
+
+    get_log_index(path)
+    with open(path, 'a', encoding='ascii') as f:
+        f.write("$GPTXT,01,01,02,appended*00\r\n")
+    assert LogIndex.load(path) is None
+
+
+# Fix filter windows on a log from 23:30 on day 0 to 23:30 on day 2 (one epoch a minute)
+FIX_WINDOWS = [
+    (datetime.time(23, 55, 0), datetime.time(0, 5, 0)),
+    (datetime.time(0, 10, 0), None),  # First occurrence is on day 1
+    (None, datetime.time(23, 40, 0)),
+    (datetime.time(23, 0, 0), datetime.time(23, 10, 0)),  # First occurrence is late on day 1
+    (datetime.time(10, 0, 0), datetime.time(10, 30, 0)),
+]
+
+
+@pytest.fixture(scope='module')
+def fix_log(tmp_path_factory):
+    # An indexed log and the full parse of an unindexed copy, shared by the windows
+    folder = tmp_path_factory.mktemp('fix_log')
+    path, unindexed = str(folder / 'log.txt'), str(folder / 'unindexed.txt')
+    write_log(path, range(23 * 3600 + 1800, 2 * MIDNIGHT + 23 * 3600 + 1800, 60))
+    shutil.copy(path, unindexed)
+    get_log_index(path)
+    return path, load_nmea_log(unindexed)
+
+
+@pytest.mark.parametrize('start, end', FIX_WINDOWS)
+def test_indexed_fix_window_matches_full_parse(fix_log, start, end):
+    path, full = fix_log
+    bounds = {name: value for name, value in (('start', start), ('end', end)) if value is not None}
+
+    windowed = load_nmea_log(path, window=(start, end))
+    assert len(windowed.parsed_sentences) < len(full.parsed_sentences)
+    windowed, full = FixQuery(windowed).select(**bounds), FixQuery(full).select(**bounds)
+
+    assert len(full.fixes) > 0
+    np.testing.assert_array_equal(windowed.fixes.epoch_ns, full.fixes.epoch_ns)
+    np.testing.assert_array_equal(windowed.fixes.num_sats, full.fixes.num_sats)
+    assert windowed.gsv_epoch_ns == full.gsv_epoch_ns
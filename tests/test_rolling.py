@@ -0,0 +1,63 @@
+# test_rolling.py
+import numpy as np
+import pytest
+
+from gnss_engine import rolling_cep
+from gnss_engine.rolling import MIN_ROLLING_POINTS
+
+
+def naive_rolling_cep(distances, epoch_ns, window_s=None, window_epochs=None, percentiles=(50, 95),
+                      min_points=MIN_ROLLING_POINTS):
+    # Re-select the window and take np.percentile at every fix
+    series = {f'CEP{p}': np.full(len(distances), np.nan) for p in percentiles}
+    usable = [i for i in range(len(distances))
+              if not np.isnan(distances[i]) and (window_epochs is not None or epoch_ns[i] >= 0)]
+    for position, index in enumerate(usable):
+        if window_epochs is not None:
+            members = usable[max(position + 1 - window_epochs, 0):position + 1]
+            needed = window_epochs
+        else:
+            members = [i for i in usable[:position + 1] if epoch_ns[i] > epoch_ns[index] - int(window_s * 1e9)]
+            needed = min_points
+        if len(members) >= needed:
+            for p in percentiles:
+                series[f'CEP{p}'][index] = np.percentile(distances[members], p)
+    return series
+
+
+@pytest.fixture
+def fixes():
+    rng = np.random.default_rng(7)
+    count = 600
+    distances = rng.gamma(2.0, 0.8, count)
+    distances[rng.choice(count, 20, replace=False)] = np.nan  # Fixes without a position
+    distances[100:110] = 1.25  # Ties
+    # 1 Hz with gaps (outages) and a few fixes without a time
+    epoch_ns = np.cumsum(rng.choice([1, 1, 1, 2, 30], count)) * 1_000_000_000
+    epoch_ns[rng.choice(count, 10, replace=False)] = -1
+    return distances, epoch_ns
+
+
+@pytest.mark.parametrize('window_s', [5.0, 30.0, 60.0, 0.5])
+def test_time_window_matches_naive(fixes, window_s):
+    distances, epoch_ns = fixes
+    result = rolling_cep(distances, epoch_ns, window_s=window_s)
+    expected = naive_rolling_cep(distances, epoch_ns, window_s=window_s)
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name], equal_nan=True)
+
+
+@pytest.mark.parametrize('window_epochs', [1, 2, 10, 100])
+def test_epoch_window_matches_naive(fixes, window_epochs):
+    distances, epoch_ns = fixes
+    result = rolling_cep(distances, epoch_ns, window_epochs=window_epochs, percentiles=(50, 68, 95))
+    expected = naive_rolling_cep(distances, epoch_ns, window_epochs=window_epochs, percentiles=(50, 68, 95))
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name], equal_nan=True)
+
+
+@pytest.mark.parametrize('options', [{'window_s': 0}, {'window_s': -5.0}, {'window_s': float('nan')},
+                                     {'window_epochs': 0}, {'window_epochs': -1}])
+def test_non_positive_windows_are_rejected(fixes, options):
+    with pytest.raises(ValueError):
+        rolling_cep(*fixes, **options)
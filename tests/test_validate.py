@@ -0,0 +1,66 @@
+# test_validate.py
+import random
+from functools import reduce
+
+import pytest
+
+from conftest import sentence
+from gnss_engine import check_sentence, nmea_checksum
+from gnss_engine.validate import (BAD_CHECKSUM, EMPTY, FRAMING, MAX_SENTENCE_LENGTH, MISSING_CHECKSUM,
+                                  NON_PRINTABLE)
+
+
+def naive_checksum(body):
+    return reduce(lambda checksum, byte: checksum ^ byte, body, 0)
+
+
+@pytest.mark.parametrize('length', [0, 1, 2, 3, 7, 8, 9, 63, 64, 65, 82, 255, 511])
+def test_checksum_matches_naive_xor(length):
+    rng = random.Random(length)
+    for _ in range(50):
+        body = bytes(rng.randrange(0x20, 0x7f) for _ in range(length))
+        assert nmea_checksum(body) == naive_checksum(body)
+
+
+def test_checksum_of_known_sentence():
+    assert nmea_checksum(b'GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,') == 0x47
+
+
+@pytest.mark.parametrize('line', [
+    sentence("GNGGA,120000.00,3723.2475,N,12158.3416,W,1,10,0.9,10.0,M,0.0,M,,"),
+    sentence("GNGGA,120000.00,3723.2475,N,12158.3416,W,1,10,0.9,10.0,M,0.0,M,,").rstrip(),
+    sentence("PQTMEPE,2,0.100,0.500,1.000,0.700,1.200").encode('ascii'),
+    "$GNGGA,120000.00,3723.2475,N,12158.3416,W,1,10,0.9,10.0,M,0.0,M,,*" + sentence(
+        "GNGGA,120000.00,3723.2475,N,12158.3416,W,1,10,0.9,10.0,M,0.0,M,,")[-4:-2].lower(),
+])
+def test_well_formed_sentences_pass(line):
+    assert check_sentence(line) is None
+
+
+@pytest.mark.parametrize('line, reason', [
+    ("", EMPTY),
+    ("\r\n", EMPTY),
+    ("GNGGA,120000.00,,,,,0,00,,,M,,M,,*4A", FRAMING),  # No '$'
+    ("$GNGGA,120000.00$GNGGA,120001.00,,,,,0,00,,,M,,M,,*4A", FRAMING),  # Two sentences glued together
+    ("$" + "A" * MAX_SENTENCE_LENGTH + "*00", FRAMING),
+    ("$GNGGA,120000.00,,,,,0,00,,,M,,M,,*4", FRAMING),  # One checksum digit
+    ("$GNGGA,120000.00,,,,,0,00,,,M,,M,,*ZZ", FRAMING),
+    ("$GNGGA,120000.00,\x00\x7f,,,,0,00,,,M,,M,,*4A", NON_PRINTABLE),
+    (b"$GNGGA,120000.00,\xff,,,,0,00,,,M,,M,,*4A", NON_PRINTABLE),
+    ("$GNGGA,120000.00,,,,,0,00,,,M,,M,,", MISSING_CHECKSUM),
+])
+def test_rejection_reasons(line, reason):
+    assert check_sentence(line) == reason
+
+
+def test_bad_checksum_is_rejected():
+    line = sentence("GNGGA,120000.00,3723.2475,N,12158.3416,W,1,10,0.9,10.0,M,0.0,M,,")
+    good = int(line[-4:-2], 16)
+    for wrong in (good ^ 1, good ^ 0x80, (good + 1) % 256):
+        assert check_sentence(f"{line[:-4]}{wrong:02X}\r\n") == BAD_CHECKSUM
+    # A flipped payload character with the original checksum
+    assert check_sentence(line.replace("3723", "3724")) == BAD_CHECKSUM
+
+
+def test_missing_checksum_allowed_when_not_required():
+    assert check_sentence("$GNGGA,120000.00,,,,,0,00,,,M,,M,,", require_checksum=False) is None